@@ -0,0 +1,72 @@
+"""
+Окружение Alembic: схема берется из моделей app.models, подключение - из DATABASE_URL.
+
+Каждая миграция выполняется в своей транзакции (transaction_per_migration), поэтому
+миграция может выйти из нее через op.get_context().autocommit_block() для
+CREATE INDEX CONCURRENTLY и пакетного заполнения данных (см. app/migrations.py).
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlalchemy.types import TypeDecorator
+
+from app.config import settings
+from app.database import Base
+import app.models  # noqa: F401 - регистрируем все модели в метаданных
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def render_item(type_, obj, autogen_context):
+    """Собственные типы (LowerCaseEnum) записываются в миграции как их базовый тип"""
+    if type_ == "type" and isinstance(obj, TypeDecorator):
+        return f"sa.{obj.impl!r}"
+    return False
+
+
+def run_migrations_offline() -> None:
+    """Сгенерировать SQL без подключения к базе (alembic upgrade head --sql)"""
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Применить миграции к базе"""
+    connectable = config.attributes.get("connection")
+    if connectable is None:
+        connectable = create_engine(settings.database_url, poolclass=pool.NullPool)
+
+    with connectable.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            # DDL ждет блокировку таблицы ограниченное время, а не встает в очередь
+            # перед всеми запросами приложения; миграцию можно просто перезапустить
+            connection.exec_driver_sql(f"SET lock_timeout = {int(settings.migration_lock_timeout_ms)}")
+            connection.commit()
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+            compare_type=True,
+            render_item=render_item,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
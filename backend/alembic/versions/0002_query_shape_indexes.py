@@ -0,0 +1,71 @@
+"""query shape indexes
+
+Составные индексы (фильтр, created_at) под списки CRUD и частичные индексы для
+непрочитанных сообщений и ожидающих предложений. Индексы строятся CONCURRENTLY,
+одноколоночные индексы из старого init_db.sql, покрытые составными, удаляются.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 12:42:51.339364
+"""
+from app.migrations import create_index_concurrently, drop_index_concurrently
+
+
+# Идентификаторы ревизии; scripts/migrate.py читает их без импорта модуля
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# (имя, таблица, колонки, условие частичного индекса)
+INDEXES = [
+    ("ix_boards_creator_active", "boards", ["creator_id", "is_active"], None),
+    ("ix_boards_public_active", "boards", ["is_public", "is_active"], None),
+    ("ix_columns_board_order", "columns", ["board_id", "order_index"], None),
+    ("ix_tasks_board_column", "tasks", ["board_id", "column_id"], None),
+    ("ix_tasks_column_id", "tasks", ["column_id"], None),
+    ("ix_tasks_creator_id", "tasks", ["creator_id"], None),
+    ("ix_tasks_assignee_id", "tasks", ["assignee_id"], None),
+    ("ix_orders_status_created_at", "orders", ["status", "created_at"], None),
+    ("ix_orders_creator_created_at", "orders", ["creator_id", "created_at"], None),
+    ("ix_orders_executor_created_at", "orders", ["assigned_executor_id", "created_at"], None),
+    ("ix_orders_created_at", "orders", ["created_at"], None),
+    ("ix_proposals_order_created_at", "proposals", ["order_id", "created_at"], None),
+    ("ix_proposals_user_created_at", "proposals", ["user_id", "created_at"], None),
+    ("ix_proposals_created_at", "proposals", ["created_at"], None),
+    ("ix_proposals_pending_created_at", "proposals", ["created_at"], "status = 'pending'"),
+    ("ix_messages_order_created_at", "messages", ["order_id", "created_at"], None),
+    ("ix_messages_sender_created_at", "messages", ["sender_id", "created_at"], None),
+    ("ix_messages_receiver_created_at", "messages", ["receiver_id", "created_at"], None),
+    ("ix_messages_created_at", "messages", ["created_at"], None),
+    ("ix_messages_receiver_unread", "messages", ["receiver_id", "order_id"], "NOT is_read"),
+]
+
+# Индексы старого init_db.sql, которые являются префиксами новых составных;
+# при откате создаются заново, чтобы внешние ключи не остались без индекса
+SUPERSEDED = [
+    ("ix_boards_creator_id", "boards", ["creator_id"]),
+    ("ix_columns_board_id", "columns", ["board_id"]),
+    ("ix_tasks_board_id", "tasks", ["board_id"]),
+    ("ix_orders_creator_id", "orders", ["creator_id"]),
+    ("ix_orders_assigned_executor_id", "orders", ["assigned_executor_id"]),
+    ("ix_proposals_order_id", "proposals", ["order_id"]),
+    ("ix_proposals_user_id", "proposals", ["user_id"]),
+    ("ix_messages_sender_id", "messages", ["sender_id"]),
+    ("ix_messages_receiver_id", "messages", ["receiver_id"]),
+    ("ix_messages_order_id", "messages", ["order_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns, where in INDEXES:
+        create_index_concurrently(name, table, columns, where=where)
+    for name, table, _ in SUPERSEDED:
+        drop_index_concurrently(name, table)
+
+
+def downgrade() -> None:
+    for name, table, columns in SUPERSEDED:
+        create_index_concurrently(name, table, columns)
+    for name, table, _, _ in reversed(INDEXES):
+        drop_index_concurrently(name, table)
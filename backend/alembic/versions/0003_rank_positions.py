@@ -0,0 +1,54 @@
+"""rank positions
+
+Дробные ранги порядка задач в колонке и колонок на доске (app/crud/rank.py).
+Существующие задачи получают ранги в порядке id (порядок создания), колонки -
+в порядке order_index. Ранг из 8 шестнадцатеричных цифр и "i" - допустимый
+ранг base36, между соседними остается место для вставок.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 14:05:12.418207
+"""
+from alembic import op
+
+from app.migrations import backfill_in_batches, create_index_concurrently, drop_index_concurrently
+
+
+# Идентификаторы ревизии; scripts/migrate.py читает их без импорта модуля
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Колонки без значения по умолчанию добавляются без перезаписи таблицы.
+    # IF NOT EXISTS: заполнение ниже идет вне транзакции миграции, и после сбоя
+    # миграция перезапускается с начала
+    op.execute('ALTER TABLE tasks ADD COLUMN IF NOT EXISTS position VARCHAR COLLATE "C"')
+    op.execute('ALTER TABLE columns ADD COLUMN IF NOT EXISTS position VARCHAR COLLATE "C"')
+
+    backfill_in_batches('tasks', "position = lpad(to_hex(id), 8, '0') || 'i'", "position IS NULL")
+    # Колонок на доске единицы, заполняем одним запросом
+    op.execute("""
+        UPDATE columns SET position = ranked.position
+        FROM (
+            SELECT id, lpad(to_hex(row_number() OVER (PARTITION BY board_id ORDER BY order_index, id)), 8, '0') || 'i' AS position
+            FROM columns
+        ) AS ranked
+        WHERE columns.id = ranked.id AND columns.position IS NULL
+    """)
+
+    create_index_concurrently('ix_tasks_board_column_position', 'tasks', ['board_id', 'column_id', 'position'])
+    create_index_concurrently('ix_columns_board_position', 'columns', ['board_id', 'position'])
+    drop_index_concurrently('ix_tasks_board_column', 'tasks')
+    drop_index_concurrently('ix_columns_board_order', 'columns')
+
+
+def downgrade() -> None:
+    create_index_concurrently('ix_columns_board_order', 'columns', ['board_id', 'order_index'])
+    create_index_concurrently('ix_tasks_board_column', 'tasks', ['board_id', 'column_id'])
+    drop_index_concurrently('ix_columns_board_position', 'columns')
+    drop_index_concurrently('ix_tasks_board_column_position', 'tasks')
+    op.drop_column('columns', 'position')
+    op.drop_column('tasks', 'position')
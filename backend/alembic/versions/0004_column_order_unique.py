@@ -0,0 +1,49 @@
+"""column order unique
+
+Уникальный (board_id, order_index) с проверкой при commit (DEFERRABLE INITIALLY
+DEFERRED): перестановка колонок одним UPDATE обменивает номера, не нарушая
+ограничение посреди запроса. Повторяющиеся номера сначала перенумеровываются
+в текущем порядке доски.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 15:31:07.902114
+"""
+from alembic import op
+
+from app.migrations import create_index_concurrently
+
+
+# Идентификаторы ревизии; scripts/migrate.py читает их без импорта модуля
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Колонок на доске единицы, перенумеровываем одним запросом только доски с повторами
+    op.execute("""
+        UPDATE columns SET order_index = ranked.order_index
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY board_id ORDER BY order_index NULLS LAST, position, id) AS order_index
+            FROM columns
+            WHERE board_id IN (
+                SELECT board_id FROM columns GROUP BY board_id
+                HAVING count(order_index) < count(*) OR count(DISTINCT order_index) < count(order_index)
+            )
+        ) AS ranked
+        WHERE columns.id = ranked.id AND columns.order_index IS DISTINCT FROM ranked.order_index
+    """)
+
+    # Индекс строится без блокировки записи, ограничение только привязывается к нему
+    create_index_concurrently('uq_column_order_per_board', 'columns', ['board_id', 'order_index'], unique=True)
+    op.execute(
+        "ALTER TABLE columns ADD CONSTRAINT uq_column_order_per_board "
+        "UNIQUE USING INDEX uq_column_order_per_board DEFERRABLE INITIALLY DEFERRED"
+    )
+
+
+def downgrade() -> None:
+    # Вместе с ограничением удаляется и его индекс
+    op.drop_constraint('uq_column_order_per_board', 'columns', type_='unique')
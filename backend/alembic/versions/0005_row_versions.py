@@ -0,0 +1,29 @@
+"""row versions
+
+Счетчик version для оптимистичной блокировки задач и заказов
+(app/crud/versioning.py). Колонка с константным значением по умолчанию
+добавляется без перезаписи таблицы: существующие строки получают версию 1.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 16:12:40.551873
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# Идентификаторы ревизии; scripts/migrate.py читает их без импорта модуля
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('orders', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('orders', 'version')
+    op.drop_column('tasks', 'version')
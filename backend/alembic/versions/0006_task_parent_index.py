@@ -0,0 +1,26 @@
+"""task parent index
+
+Частичный индекс по parent_id для рекурсивного обхода дерева подзадач
+(TaskCRUD.get_tree): каждый шаг CTE ищет детей уже найденных задач.
+Задачи без родителя в индекс не попадают.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 17:03:26.215390
+"""
+from app.migrations import create_index_concurrently, drop_index_concurrently
+
+
+# Идентификаторы ревизии; scripts/migrate.py читает их без импорта модуля
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_index_concurrently('ix_tasks_parent_id', 'tasks', ['parent_id'], where='parent_id IS NOT NULL')
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_tasks_parent_id', 'tasks')
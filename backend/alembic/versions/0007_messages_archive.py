@@ -0,0 +1,50 @@
+"""messages archive
+
+Архивная таблица для сообщений закрытых заказов (MessageCRUD.archive_old).
+Таблица новая и пустая, поэтому индексы создаются вместе с ней, без CONCURRENTLY.
+Сообщения переносит фоновая задача, миграция данные не трогает.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 19:40:12.304118
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# Идентификаторы ревизии; scripts/migrate.py читает их без импорта модуля
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('messages_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('sender_id', sa.Integer(), nullable=False),
+    sa.Column('receiver_id', sa.Integer(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_messages_archive_order_created_at', 'messages_archive', ['order_id', 'created_at'], unique=False)
+    op.create_index('ix_messages_archive_sender_created_at', 'messages_archive', ['sender_id', 'created_at'], unique=False)
+    op.create_index('ix_messages_archive_receiver_created_at', 'messages_archive', ['receiver_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    # Архивные сообщения возвращаются в горячую таблицу, чтобы откат не терял историю
+    op.execute(
+        "INSERT INTO messages (id, order_id, sender_id, receiver_id, content, is_read, created_at, updated_at) "
+        "SELECT id, order_id, sender_id, receiver_id, content, is_read, created_at, updated_at "
+        "FROM messages_archive ON CONFLICT (id) DO NOTHING"
+    )
+    op.drop_index('ix_messages_archive_receiver_created_at', table_name='messages_archive')
+    op.drop_index('ix_messages_archive_sender_created_at', table_name='messages_archive')
+    op.drop_index('ix_messages_archive_order_created_at', table_name='messages_archive')
+    op.drop_table('messages_archive')
@@ -1,7 +1,7 @@
 # API routes module
-from . import auth, users, boards, tasks, columns, admin, orders, proposals, messages, telegram
+from . import auth, users, boards, tasks, columns, admin, orders, proposals, messages, telegram, search, tags, metrics
 
 __all__ = [
     "auth", "users", "boards", "tasks", "columns", 
-    "admin", "orders", "proposals", "messages", "telegram"
+    "admin", "orders", "proposals", "messages", "telegram", "search", "tags", "metrics"
 ] 
\ No newline at end of file
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Literal
+from app.database import get_db, get_read_db, replicas
+from app.profiling import slow_query_log
+from app.config import settings
 from app.crud.user import user_crud
 from app.crud.board import board_crud
 from app.crud.task import task_crud
+from app.cache import invalidate_boards
+from app.export import ExportFormat, export_response
 from app.schemas.user import UserResponse, UserAdminUpdate, SystemStats
 from app.schemas.board import BoardResponse
 from app.auth.dependencies import get_current_superuser
@@ -17,7 +21,7 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 
 @router.get("/stats", response_model=SystemStats)
 def get_system_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_superuser)
 ):
     """Получить статистику системы"""
@@ -57,11 +61,37 @@ def get_system_stats(
     logger.info(f"System stats: {stats}")
     return stats
 
+@router.get("/replicas")
+def get_replicas_status(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Получить состояние реплик для чтения и их отставание"""
+    return {"replicas": replicas.get_status()}
+
+@router.get("/slow-queries")
+def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: User = Depends(get_current_superuser)
+):
+    """Получить последние медленные запросы к БД (с планами, если они сняты)"""
+    return {
+        "threshold_ms": settings.slow_query_ms,
+        "queries": slow_query_log.entries(limit)
+    }
+
+@router.delete("/slow-queries")
+def clear_slow_queries(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Очистить журнал медленных запросов"""
+    slow_query_log.clear()
+    return {"message": "Slow query log cleared"}
+
 @router.get("/users", response_model=List[UserResponse])
 def get_all_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_superuser)
 ):
     """Получить всех пользователей"""
@@ -72,7 +102,7 @@ def get_all_users(
 def get_active_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_superuser)
 ):
     """Получить активных пользователей"""
@@ -155,7 +185,7 @@ def delete_user_admin(
 def get_all_boards(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_superuser)
 ):
     """Получить все активные доски"""
@@ -166,7 +196,7 @@ def get_all_boards(
 def get_deleted_boards(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_superuser)
 ):
     """Получить все удаленные доски"""
@@ -177,7 +207,7 @@ def get_deleted_boards(
 def get_all_boards_including_deleted(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_superuser)
 ):
     """Получить все доски, включая удаленные"""
@@ -222,6 +252,7 @@ def activate_board(
     
     board.is_active = True
     db.commit()
+    invalidate_boards(board_id, public=board.is_public)
     return {"message": "Board activated successfully"}
 
 @router.put("/boards/{board_id}/deactivate")
@@ -237,6 +268,7 @@ def deactivate_board(
     
     board.is_active = False
     db.commit()
+    invalidate_boards(board_id, public=board.is_public)
     return {"message": "Board deactivated successfully"}
 
 @router.delete("/boards/{board_id}")
@@ -255,4 +287,14 @@ def delete_board_permanently(
     if not success:
         raise HTTPException(status_code=500, detail="Failed to delete board")
     
-    return {"message": "Board permanently deleted"} 
\ No newline at end of file
+    return {"message": "Board permanently deleted"} 
+
+@router.get("/export/{entity}")
+def export_all(
+    entity: Literal["boards", "tasks", "orders", "users"],
+    request: Request,
+    format: ExportFormat = "csv",
+    current_user: User = Depends(get_current_superuser)
+):
+    """Выгрузить все записи сущности в CSV или NDJSON (потоком, вместо постраничного обхода)"""
+    return export_response(request, entity, format, f"all-{entity}")
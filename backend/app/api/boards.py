@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.database import get_db, get_read_db
 from app.crud.board import board_crud
 from app.crud.task import task_crud
 from app.schemas.board import BoardCreate, BoardUpdate, BoardResponse, BoardWithTasks
 from app.auth.dependencies import get_current_active_user
+from app.api.fields import sparse_fields
+from app.crud.fields import FieldSelection
+from app.responses import UTF8JSONResponse
+from app.cache import board_snapshots, public_boards
+from app.compression import PrecompressedJSON
 from app.models.user import User
 from app.crud.column import column_crud
 
+board_fields = sparse_fields(BoardResponse)
+public_board_list = TypeAdapter(List[BoardResponse])
+
 router = APIRouter(prefix="/boards", tags=["boards"])
 
 @router.post("/", response_model=BoardResponse)
@@ -25,25 +35,40 @@ def create_board(
 def read_boards(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    fields: Optional[FieldSelection] = Depends(board_fields),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить доски текущего пользователя"""
-    boards = board_crud.get_by_owner(db, owner_id=current_user.id, skip=skip, limit=limit)
+    boards = board_crud.get_by_owner(db, owner_id=current_user.id, skip=skip, limit=limit, fields=fields)
+    if fields:
+        return UTF8JSONResponse(fields.response(boards))
     return boards
 
 @router.get("/public", response_model=List[BoardResponse])
 def read_public_boards(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    fields: Optional[FieldSelection] = Depends(board_fields),
+    db: Session = Depends(get_read_db)
 ):
     """Получить публичные доски"""
-    return board_crud.get_public_boards(db, skip=skip, limit=limit)
+    def load() -> PrecompressedJSON:
+        boards = board_crud.get_public_boards(db, skip=skip, limit=limit, fields=fields)
+        if fields:
+            return PrecompressedJSON(orjson.dumps(fields.response(boards)))
+        return PrecompressedJSON(public_board_list.dump_json(boards))
+
+    # Страница списка хранится готовой до изменения любой публичной доски
+    variant = (skip, limit, fields.columns if fields else None)
+    snapshot = public_boards.get_or_load("public", load, variant=variant)
+    return snapshot.response(request.headers.get("accept-encoding"))
 
 @router.get("/{board_id}", response_model=BoardWithTasks)
 def read_board(
     board_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -68,12 +93,15 @@ def read_board(
             detail="Not enough permissions"
         )
     
-    board.columns = column_crud.get_by_board(db=db, board_id=board_id)
-    board.tasks = task_crud.get_by_board(db=db, board_id=board_id)
-    logger.info(f"Returning board {board_id} with {len(board.columns)} columns and {len(board.tasks)} tasks")
-    logger.info(f"Board data: id={board.id}, title='{board.title}'")
+    # Снимок доски сериализуется и сжимается один раз до следующего изменения доски
+    def load() -> PrecompressedJSON:
+        board.columns = column_crud.get_by_board(db=db, board_id=board_id)
+        board.tasks = task_crud.get_by_board(db=db, board_id=board_id)
+        logger.info(f"Returning board {board_id} with {len(board.columns)} columns and {len(board.tasks)} tasks")
+        return PrecompressedJSON(BoardWithTasks.model_validate(board).model_dump_json().encode())
 
-    return board
+    snapshot = board_snapshots.get_or_load(board_id, load)
+    return snapshot.response(request.headers.get("accept-encoding"))
 
 
 
@@ -2,14 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
-from app.schemas.column import ColumnCreate, ColumnUpdate, ColumnResponse, ColumnReorder
+from app.schemas.column import ColumnCreate, ColumnUpdate, ColumnResponse, ColumnReorder, ColumnMove
 from app.auth.dependencies import get_current_active_user
 from app.models.user import User
 from app.crud.column import column_crud
 
 router = APIRouter(prefix="/columns", tags=["columns"])
 
-@router.post("/", response_model=ColumnCreate)
+@router.post("/", response_model=ColumnResponse)
 def create_column(
     column: ColumnCreate,
     db: Session = Depends(get_db),
@@ -17,7 +17,7 @@ def create_column(
 ):
     """Создать новую колонку"""
     try:
-        result = column_crud.create(db=db, column=column)
+        result = column_crud.create(db=db, column=column, board_id=column.board_id)
         return result
     except ValueError as e:
         raise HTTPException(
@@ -34,7 +34,7 @@ def update_column(
 ):
     """Обновить колонку"""
     # Проверяем, является ли пользователь владельцем колонки
-    if not column_crud.check_owner(db, column_id=column_id, user_id=current_user.id):
+    if not column_crud.check_board_owner(db, column_id=column_id, user_id=current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
@@ -59,7 +59,7 @@ def delete_column(
 ):
     """Удалить колонку"""
     # Проверяем, является ли пользователь владельцем колонки
-    if not column_crud.check_owner(db, column_id=column_id, user_id=current_user.id):
+    if not column_crud.check_board_owner(db, column_id=column_id, user_id=current_user.id):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
@@ -79,12 +79,38 @@ def read_board_columns(
     return columns
 
 
+@router.patch("/{column_id}/move", response_model=ColumnResponse)
+def move_column(
+    column_id: int,
+    move: ColumnMove,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Переставить колонку (drag-and-drop): меняется только ранг самой колонки"""
+    if not column_crud.check_board_owner(db, column_id=column_id, user_id=current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    try:
+        return column_crud.move(db, column_id=column_id, after_id=move.after_id, before_id=move.before_id)
+    except LookupError:
+        raise HTTPException(status_code=400, detail="Neighbor column is not on the same board")
+
 @router.patch("/reorder", status_code=200)
 def reorder_columns(
     reordered_columns: List[ColumnReorder],
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user)
 ):
-    """Обновить порядок колонок"""
-    column_crud.reorder_columns(db=db, columns=[col.dict() for col in reordered_columns])
-    return {"message": "Column order updated"}
\ No newline at end of file
+    """Обновить порядок колонок одной доски (один UPDATE)"""
+    try:
+        column_crud.reorder(db, columns_data=[col.dict() for col in reordered_columns], owner_id=current_user.id)
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"message": "Column order updated"}
@@ -0,0 +1,20 @@
+"""Зависимость FastAPI для выборочных полей в списках (см. app/crud/fields.py)"""
+from typing import Optional, Tuple, Type
+
+from fastapi import Query
+from pydantic import BaseModel
+
+from app.crud.fields import FieldSelection
+
+
+def sparse_fields(schema: Type[BaseModel], relations: Tuple[str, ...] = ()):
+    """
+    Параметры ?fields= и ?include= для списка со схемой schema.
+    Возвращает FieldSelection или None (полный ответ); неизвестное поле - 400.
+    """
+    def dependency(
+        fields: Optional[str] = Query(None, description=f"Поля через запятую: {', '.join(n for n in schema.model_fields if n not in relations)}"),
+        include: Optional[str] = Query(None, description=f"Связи через запятую: {', '.join(relations) or 'нет'}")
+    ) -> Optional[FieldSelection]:
+        return FieldSelection.parse(schema, fields, include, relations)
+    return dependency
@@ -47,7 +47,7 @@ def get_order_messages(
         )
     
     # Отмечаем сообщения как прочитанные
-    message_crud.mark_order_messages_as_read(db, order_id, current_user.id)
+    message_crud.mark_order_as_read(db, order_id, current_user.id)
     
     return message_crud.get_conversation(db, order_id, current_user.id, skip, limit)
 
@@ -114,7 +114,7 @@ def mark_order_messages_as_read(
             detail="Not enough permissions"
         )
     
-    success = message_crud.mark_order_messages_as_read(db, order_id, current_user.id)
+    success = message_crud.mark_order_as_read(db, order_id, current_user.id)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to mark messages as read")
     
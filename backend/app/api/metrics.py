@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from typing import Dict, List
+from app.database import get_pool_stats
+from app.auth.dependencies import get_current_superuser
+from app.models.user import User
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/pool", response_model=List[Dict])
+def read_pool_metrics(
+    current_user: User = Depends(get_current_superuser)
+):
+    """Состояние пулов соединений БД: занятые соединения, overflow, ожидания и таймауты"""
+    return get_pool_stats()
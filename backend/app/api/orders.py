@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status, Query
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.database import get_db, get_read_db
 from app.crud.order import order_crud
 from app.crud.proposal import proposal_crud
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, OrderWithProposals, OrderStats
+from app.crud.matching import matching_crud
+from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, OrderWithProposals, OrderStats, ExecutorMatch
 from app.schemas.proposal import ProposalResponse
 from app.auth.dependencies import get_current_active_user
+from app.api.fields import sparse_fields
+from app.crud.fields import FieldSelection
+from app.responses import UTF8JSONResponse
+from app.export import ExportFormat, export_response
+from app.bulk_import import ImportFormat, import_orders
+from app.schemas.bulk_import import ImportResult
 from app.models.user import User, UserRole
-from app.models.order import OrderStatus
+from app.models.order import Order, OrderStatus
+
+# ?fields= и ?include=proposals для списков заказов; предложения без include не загружаются
+order_fields = sparse_fields(OrderWithProposals, relations=("proposals",))
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
@@ -34,11 +44,33 @@ def create_order(
             detail=f"Error creating order: {str(e)}"
         )
 
+@router.post("/import", response_model=ImportResult)
+def import_my_orders(
+    format: ImportFormat = "csv",
+    dry_run: bool = False,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Импортировать заказы из CSV или NDJSON (поля как в POST /orders/, для
+    заказчиков и администраторов). Ошибочные строки пропускаются и перечисляются в ответе.
+    """
+    if current_user.role not in [UserRole.CUSTOMER, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only customers and admins can create orders"
+        )
+    
+    return import_orders(db, file.file, format, creator_id=current_user.id, dry_run=dry_run)
+
 @router.get("/", response_model=List[OrderWithProposals])
 def read_orders(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    tags: Optional[List[str]] = Query(None),
+    fields: Optional[FieldSelection] = Depends(order_fields),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить все заказы (для администраторов и исполнителей)"""
@@ -48,7 +80,10 @@ def read_orders(
             detail="Not enough permissions"
         )
     
-    orders = order_crud.get_all(db, skip=skip, limit=limit)
+    orders = order_crud.get_all(db, skip=skip, limit=limit, tags=tags, fields=fields)
+    
+    if fields:
+        return UTF8JSONResponse(fields.response(orders))
     
     # Добавляем предложения для каждого заказа
     for order in orders:
@@ -60,7 +95,9 @@ def read_orders(
 def read_open_orders(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    tags: Optional[List[str]] = Query(None),
+    fields: Optional[FieldSelection] = Depends(order_fields),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить открытые заказы (для исполнителей)"""
@@ -70,7 +107,10 @@ def read_open_orders(
             detail="Only executors can view open orders"
         )
     
-    orders = order_crud.get_open_orders(db, skip=skip, limit=limit)
+    orders = order_crud.get_open_orders(db, skip=skip, limit=limit, tags=tags, fields=fields)
+    
+    if fields:
+        return UTF8JSONResponse(fields.response(orders))
     
     # Добавляем предложения для каждого заказа
     for order in orders:
@@ -82,31 +122,57 @@ def read_open_orders(
 def read_my_orders(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    tags: Optional[List[str]] = Query(None),
+    fields: Optional[FieldSelection] = Depends(order_fields),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить заказы текущего пользователя"""
     orders = []
     
     if current_user.role == UserRole.CUSTOMER:
-        orders = order_crud.get_by_customer(db, creator_id=current_user.id, skip=skip, limit=limit)
+        orders = order_crud.get_by_creator(db, creator_id=current_user.id, skip=skip, limit=limit, tags=tags, fields=fields)
     elif current_user.role == UserRole.EXECUTOR:
-        orders = order_crud.get_by_executor(db, executor_id=current_user.id, skip=skip, limit=limit)
+        orders = order_crud.get_by_executor(db, executor_id=current_user.id, skip=skip, limit=limit, tags=tags, fields=fields)
     elif current_user.role == UserRole.ADMIN:
         # Администраторы видят все заказы
-        orders = order_crud.get_all(db, skip=skip, limit=limit)
+        orders = order_crud.get_all(db, skip=skip, limit=limit, tags=tags, fields=fields)
     else:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Invalid user role: {current_user.role}"
         )
     
+    if fields:
+        return UTF8JSONResponse(fields.response(orders))
+    
     # Добавляем предложения для каждого заказа
     for order in orders:
         order.proposals = proposal_crud.get_by_order(db, order_id=order.id)
     
     return orders
 
+@router.get("/my/export")
+def export_my_orders(
+    request: Request,
+    format: ExportFormat = "csv",
+    current_user: User = Depends(get_current_active_user)
+):
+    """Выгрузить заказы текущего пользователя в CSV или NDJSON (потоком), как в /orders/my"""
+    if current_user.role == UserRole.CUSTOMER:
+        criteria = [Order.creator_id == current_user.id]
+    elif current_user.role == UserRole.EXECUTOR:
+        criteria = [Order.assigned_executor_id == current_user.id]
+    elif current_user.role == UserRole.ADMIN:
+        criteria = []
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Invalid user role: {current_user.role}"
+        )
+    
+    return export_response(request, "orders", format, f"user-{current_user.id}-orders", *criteria)
+
 @router.get("/{order_id}", response_model=OrderWithProposals)
 def read_order(
     order_id: int,
@@ -148,6 +214,31 @@ def read_order(
     
     return order_dict
 
+@router.get("/{order_id}/matches", response_model=List[ExecutorMatch])
+def read_order_matches(
+    order_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Подобрать исполнителей для заказа (владелец заказа или администратор)"""
+    order = order_crud.get_by_id(db, order_id=order_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    if order.creator_id != current_user.id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    # Подбор не уложился в таймаут - отвечаем пустым списком, как раньше
+    matches = matching_crud.top_executors(db, order, limit=limit) or []
+    return [
+        {"executor": executor, "overlap": overlap, "score": score}
+        for executor, overlap, score in matches
+    ]
+
 @router.put("/{order_id}", response_model=OrderResponse)
 def update_order(
     order_id: int,
@@ -267,7 +358,7 @@ def restore_order(
 
 @router.get("/stats/my", response_model=OrderStats)
 def get_my_order_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить статистику заказов пользователя"""
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.crud.proposal import proposal_crud
 from app.crud.order import order_crud
 from app.schemas.proposal import ProposalCreate, ProposalUpdate, ProposalResponse, ProposalStats
@@ -45,7 +45,7 @@ def create_proposal(
 def read_proposals(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить все предложения (для администраторов)"""
@@ -61,7 +61,7 @@ def read_proposals(
 def read_my_proposals(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить предложения текущего пользователя"""
@@ -77,7 +77,7 @@ def read_my_proposals(
 def read_pending_proposals(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить ожидающие предложения пользователя"""
@@ -94,7 +94,7 @@ def read_order_proposals(
     order_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить предложения по заказу (владелец заказа или администратор)"""
@@ -244,7 +244,7 @@ def withdraw_proposal(
 
 @router.get("/stats/my", response_model=ProposalStats)
 def get_my_proposal_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить статистику предложений пользователя"""
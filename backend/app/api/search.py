@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_read_db
+from app.crud.search import search_crud
+from app.schemas.search import SearchPage
+from app.auth.dependencies import get_current_active_user
+from app.models.user import User
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+def _run_search(db: Session, search, **params) -> SearchPage:
+    """Выполнить поиск, переведя ошибки курсора и таймаута в HTTP ответы"""
+    try:
+        items, next_cursor = search(db, **params)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except OperationalError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Search timed out, try a more specific query"
+        )
+    return SearchPage(items=items, next_cursor=next_cursor)
+
+@router.get("/tasks", response_model=SearchPage)
+def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    board_id: Optional[int] = None,
+    task_status: Optional[str] = Query(None, alias="status"),
+    tags: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Поиск задач на доступных пользователю досках"""
+    return _run_search(
+        db, search_crud.search_tasks, user=current_user, query=q, board_id=board_id,
+        status=task_status, tags=tags, limit=limit, cursor=cursor
+    )
+
+@router.get("/orders", response_model=SearchPage)
+def search_orders(
+    q: str = Query(..., min_length=1, max_length=200),
+    order_status: Optional[str] = Query(None, alias="status"),
+    tags: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Поиск заказов (заказчик видит только свои заказы)"""
+    return _run_search(
+        db, search_crud.search_orders, user=current_user, query=q,
+        status=order_status, tags=tags, limit=limit, cursor=cursor
+    )
+
+@router.get("/messages", response_model=SearchPage)
+def search_messages(
+    q: str = Query(..., min_length=1, max_length=200),
+    order_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Поиск по сообщениям заказов, в которых участвует пользователь"""
+    return _run_search(
+        db, search_crud.search_messages, user=current_user, query=q,
+        order_id=order_id, limit=limit, cursor=cursor
+    )
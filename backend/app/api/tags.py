@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_read_db
+from app.crud.tag import tag_crud
+from app.schemas.tag import TagFrequency
+from app.auth.dependencies import get_current_active_user
+from app.models.board import Board
+from app.models.order import Order
+from app.models.user import User, UserRole
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+@router.get("/frequencies", response_model=List[TagFrequency])
+def read_tag_frequencies(
+    kind: str = Query("tasks", pattern="^(tasks|orders)$"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Самые популярные теги задач или заказов среди тех, что видит пользователь:
+    задачи публичных и своих досок; заказы - как в списках /orders (исполнителям
+    все, заказчикам свои). Администратору - по всем задачам и заказам.
+    """
+    return [
+        {"name": name, "count": count}
+        for name, count in tag_crud.get_frequencies(db, kind=kind, limit=limit, criteria=_visible_criteria(kind, current_user))
+    ]
+
+def _visible_criteria(kind: str, user: User) -> Optional[list]:
+    """Условия видимости задач или заказов; None - видно все (счетчики тегов)"""
+    if user.role == UserRole.ADMIN:
+        return None
+    if kind == "tasks":
+        return [or_(Board.is_public == True, Board.creator_id == user.id)]
+    if user.role == UserRole.EXECUTOR:
+        return None
+    return [Order.creator_id == user.id]
@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Dict
-from app.database import get_db
+from typing import List, Dict, Optional
+from app.database import get_db, get_read_db
 from app.crud.task import task_crud
 from app.crud.board import board_crud
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskStatusUpdate, TaskWithRelations
+from app.crud.column import column_crud
+from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskStatusUpdate, TaskWithRelations, TaskBulkRequest, TaskBulkResponse, TaskMove, TaskTreeNode
 from app.auth.dependencies import get_current_active_user
+from app.api.fields import sparse_fields
+from app.crud.fields import FieldSelection
+from app.responses import UTF8JSONResponse
+from app.export import ExportFormat, export_response
+from app.bulk_import import ImportFormat, import_tasks
+from app.schemas.bulk_import import ImportResult
 from app.models.user import User
 from app.models.task import Task
 
+# ?fields= для списков задач: канбан обычно рисует только заголовки и сроки
+task_fields = sparse_fields(TaskResponse)
+
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 @router.post("/", response_model=TaskCreate)
@@ -31,37 +41,96 @@ def create_task(
     
     return task_crud.create(db=db, task=task, created_by_id=current_user.id)
 
+@router.post("/bulk", response_model=TaskBulkResponse)
+def bulk_update_tasks(
+    request: TaskBulkRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Массово перенести, назначить, перетегировать или удалить задачи в одной транзакции"""
+    task_ids = list({task_id for operation in request.operations for task_id in operation.task_ids})
+    board_by_task = task_crud.get_board_ids(db, task_ids)
+    
+    # Права проверяются один раз на доску, а не на каждую задачу
+    boards = board_crud.get_by_ids(db, list(set(board_by_task.values())))
+    allowed_board_ids = {
+        board.id for board in boards
+        if board.is_public or board.creator_id == current_user.id
+    }
+    
+    results = task_crud.apply_bulk(db, request.operations, board_by_task, allowed_board_ids)
+    succeeded = sum(1 for result in results if result["status"] == "ok")
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded}
+
+@router.post("/import", response_model=ImportResult)
+def import_board_tasks(
+    board_id: int,
+    format: ImportFormat = "csv",
+    dry_run: bool = False,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Импортировать задачи в доску из CSV или NDJSON (поля как в POST /tasks/,
+    колонка - column по названию или column_id). Ошибочные строки пропускаются
+    и перечисляются в ответе.
+    """
+    board = board_crud.get_by_id(db, board_id=board_id)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+    
+    if not board.is_public and board.creator_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return import_tasks(db, file.file, format, board_id=board_id, creator_id=current_user.id, dry_run=dry_run)
+
 @router.get("/", response_model=List[TaskResponse])
 def read_tasks(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    tags: Optional[List[str]] = Query(None),
+    fields: Optional[FieldSelection] = Depends(task_fields),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить все задачи (для суперпользователей)"""
-    tasks = task_crud.get_all(db, skip=skip, limit=limit)
+    tasks = task_crud.get_all(db, skip=skip, limit=limit, tags=tags, fields=fields)
+    if fields:
+        return UTF8JSONResponse(fields.response(tasks))
     return tasks
 
 @router.get("/my", response_model=List[TaskResponse])
 def read_my_tasks(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    tags: Optional[List[str]] = Query(None),
+    fields: Optional[FieldSelection] = Depends(task_fields),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить задачи, созданные текущим пользователем"""
-    tasks = task_crud.get_by_creator(db, user_id=current_user.id, skip=skip, limit=limit)
+    tasks = task_crud.get_by_creator(db, user_id=current_user.id, skip=skip, limit=limit, tags=tags, fields=fields)
+    if fields:
+        return UTF8JSONResponse(fields.response(tasks))
     return tasks
 
 @router.get("/assigned", response_model=List[TaskResponse])
 def read_assigned_tasks(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    tags: Optional[List[str]] = Query(None),
+    fields: Optional[FieldSelection] = Depends(task_fields),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить задачи, назначенные текущему пользователю"""
-    tasks = task_crud.get_by_assigned_user(db, user_id=current_user.id, skip=skip, limit=limit)
+    tasks = task_crud.get_by_assigned_user(db, user_id=current_user.id, skip=skip, limit=limit, tags=tags, fields=fields)
+    if fields:
+        return UTF8JSONResponse(fields.response(tasks))
     return tasks
 
 @router.get("/board/{board_id}", response_model=List[TaskResponse])
@@ -69,7 +138,9 @@ def read_board_tasks(
     board_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    tags: Optional[List[str]] = Query(None),
+    fields: Optional[FieldSelection] = Depends(task_fields),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить задачи конкретной доски"""
@@ -84,13 +155,37 @@ def read_board_tasks(
             detail="Not enough permissions"
         )
     
-    tasks = task_crud.get_by_board(db, board_id=board_id, skip=skip, limit=limit)
+    tasks = task_crud.get_by_board(db, board_id=board_id, skip=skip, limit=limit, tags=tags, fields=fields)
+    if fields:
+        return UTF8JSONResponse(fields.response(tasks))
     return tasks
 
+@router.get("/board/{board_id}/export")
+def export_board_tasks(
+    board_id: int,
+    request: Request,
+    format: ExportFormat = "csv",
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Выгрузить все задачи доски в CSV или NDJSON (потоком)"""
+    board = board_crud.get_by_id(db, board_id=board_id)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+    
+    if not board.is_public and board.creator_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return export_response(request, "tasks", format, f"board-{board_id}-tasks", Task.board_id == board_id)
+
 @router.get("/board/{board_id}/kanban", response_model=Dict[str, List[TaskResponse]])
 def read_board_kanban(
     board_id: int,
-    db: Session = Depends(get_db),
+    fields: Optional[FieldSelection] = Depends(task_fields),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить задачи доски, сгруппированные по статусам для канбан-доски"""
@@ -105,9 +200,51 @@ def read_board_kanban(
             detail="Not enough permissions"
         )
     
-    grouped_tasks = task_crud.get_tasks_by_board_and_columns(db, board_id=board_id)
+    grouped_tasks = task_crud.get_tasks_by_board_and_columns(db, board_id=board_id, fields=fields)
+    if fields:
+        return UTF8JSONResponse(fields.response(grouped_tasks))
     return grouped_tasks
 
+@router.get("/board/{board_id}/tree", response_model=List[TaskTreeNode])
+def read_board_task_tree(
+    board_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Все деревья подзадач доски одним запросом, с агрегатами по поддеревьям"""
+    board = board_crud.get_by_id(db, board_id=board_id)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+    
+    if not board.is_public and board.creator_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return task_crud.get_tree(db, board_id=board_id)
+
+@router.get("/{task_id}/tree", response_model=TaskTreeNode)
+def read_task_tree(
+    task_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Задача со всеми подзадачами одним запросом, с агрегатами по поддеревьям"""
+    task = task_crud.get_by_id(db, task_id=task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    board = board_crud.get_by_id(db, board_id=task.board_id)
+    if not board.is_public and board.creator_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    # Подзадачи с других досок не отдаются: права проверены только для доски корня
+    return task_crud.get_tree(db, board_id=task.board_id, root_id=task_id)[0]
+
 @router.get("/{task_id}", response_model=TaskWithRelations)
 def read_task(
     task_id: int,
@@ -177,9 +314,39 @@ def update_task_status(
     updated_task = task_crud.update_status(db, task_id=task_id, column_id=column_id.column_id)
     return updated_task
 
+@router.patch("/{task_id}/move", response_model=TaskResponse)
+def move_task(
+    task_id: int,
+    move: TaskMove,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Перенести карточку (drag-and-drop): меняется только ранг и колонка самой задачи"""
+    task = task_crud.get_by_id(db, task_id=task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    # Проверяем права доступа к доске
+    board = board_crud.get_by_id(db, board_id=task.board_id)
+    if not board.is_public and board.creator_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    if move.column_id is not None:
+        column = column_crud.get_by_id(db, column_id=move.column_id)
+        if not column or column.board_id != task.board_id:
+            raise HTTPException(status_code=400, detail="Column does not belong to the task board")
+    
+    try:
+        return task_crud.move(db, task_id=task_id, column_id=move.column_id, after_id=move.after_id, before_id=move.before_id)
+    except LookupError:
+        raise HTTPException(status_code=400, detail="Neighbor task is not in the target column")
+
 @router.get("/stats/user", response_model=dict)
 def get_user_task_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Получить статистику задач пользователя"""
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.auth.dependencies import get_current_active_user, get_current_superuser
 from app.models.user import User
 from app.crud.user import user_crud
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 def read_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_superuser)
 ):
     """Получить список всех пользователей (только для суперпользователей)"""
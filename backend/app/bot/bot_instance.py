@@ -29,6 +29,7 @@ BOT_COMMANDS = [
     BotCommand(command="profile", description="Мой профиль"),
     BotCommand(command="tasks", description="Мои задачи"),
     BotCommand(command="orders", description="Заказы"),
+    BotCommand(command="search", description="Поиск задач и заказов"),
     BotCommand(command="chat", description="Чаты"),
     BotCommand(command="admin", description="Админ-панель"),
 ]
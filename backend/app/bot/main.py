@@ -7,8 +7,13 @@ from aiogram.client.telegram import TelegramAPIServer
 
 from .bot_instance import bot, set_bot_commands
 from .routers import register_routers
-from .middlewares import register_middlewares
+from .middlewares import register_middlewares, register_request_middlewares
 from .services.scheduler_service import SchedulerService
+from .services.broadcast_service import BroadcastService
+from .utils.api_client import api_client
+from .utils.metrics_server import MetricsServer
+from app.config import settings
+from app.database import get_pool_stats
 
 # Настройка логирования
 logging.basicConfig(
@@ -24,6 +29,9 @@ async def main():
     """
     logger.info("Запуск бота...")
     
+    # Метрики исходящих запросов к Telegram
+    register_request_middlewares(bot)
+    
     # Устанавливаем команды бота для отображения подсказок
     try:
         await set_bot_commands()
@@ -40,13 +48,35 @@ async def main():
     # Регистрируем middleware
     register_middlewares(dp)
     
+    # Общий пул соединений для запросов к API
+    await api_client.start()
+    
+    # Сервер метрик Prometheus
+    metrics_server = MetricsServer(settings.bot_metrics_port) if settings.bot_metrics_port else None
+    if metrics_server:
+        await metrics_server.start()
+    
     # Инициализируем планировщик задач
     scheduler_service = SchedulerService()
     await scheduler_service.start()
     
+    # Возобновляем рассылки, прерванные предыдущей остановкой бота
+    await BroadcastService().resume_interrupted()
+    
     # Запускаем бота
     logger.info("Бот запущен и готов к работе!")
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        if metrics_server:
+            await metrics_server.stop()
+        api_client.log_latency_stats()
+        await api_client.close()
+        for stats in get_pool_stats():
+            logger.info(
+                f"Пул БД {stats['name']}: пик занятых соединений {stats['peak_checked_out']}, "
+                f"таймаутов {stats['timeouts']}, p99 ожидания ≤ {stats['wait_seconds']['p99']}s"
+            )
 
 
 if __name__ == '__main__':
@@ -1,11 +1,31 @@
-from aiogram import Dispatcher
+from aiogram import Bot, Dispatcher
 from .auth_middleware import AuthMiddleware
+from .profiling_middleware import SqlProfilingMiddleware
+from .metrics_middleware import HandlerMetricsMiddleware, TelegramRequestMetricsMiddleware
+from app.config import settings
+from app.profiling import install_sql_profiler
 
 
 def register_middlewares(dp: Dispatcher):
     """
     Регистрируем все middleware в диспетчере
     """
+    # Метрики: время обработки по обработчикам (снаружи, чтобы учитывать загрузку пользователя)
+    dp.message.middleware(HandlerMetricsMiddleware())
+    dp.callback_query.middleware(HandlerMetricsMiddleware())
+    
     # Регистрируем middleware для всех типов обновлений
     dp.message.middleware(AuthMiddleware())
-    dp.callback_query.middleware(AuthMiddleware()) 
\ No newline at end of file
+    dp.callback_query.middleware(AuthMiddleware())
+    
+    # Профилирование SQL за все обновление целиком (включая загрузку пользователя)
+    if settings.sql_profiling:
+        install_sql_profiler()
+        dp.update.outer_middleware(SqlProfilingMiddleware()) 
+
+
+def register_request_middlewares(bot: Bot):
+    """
+    Регистрируем middleware исходящих запросов к Telegram
+    """
+    bot.session.middleware(TelegramRequestMetricsMiddleware())
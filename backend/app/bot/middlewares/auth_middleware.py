@@ -4,6 +4,7 @@ from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
 
 from ..services.user_service import UserService
+from ..utils.user_context import user_scope
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,22 @@ class AuthMiddleware(BaseMiddleware):
         """
         Обработка события с проверкой аутентификации
         """
+        # Пользователь уже загружен middleware родительского роутера
+        if "user" in data:
+            return await handler(event, data)
+        
+        with user_scope():
+            return await self._handle(handler, event, data)
+    
+    async def _handle(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message | CallbackQuery,
+        data: Dict[str, Any]
+    ) -> Any:
+        """
+        Загрузить пользователя один раз на обновление и передать его обработчику
+        """
         try:
             # Получаем информацию о пользователе из Telegram
             if isinstance(event, Message):
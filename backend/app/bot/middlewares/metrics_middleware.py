@@ -0,0 +1,71 @@
+import time
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.types import TelegramObject
+
+from app.metrics import BOT_HANDLER_LATENCY, BOT_UPDATES, TELEGRAM_LATENCY, TELEGRAM_REQUESTS
+from app.profiling import operation_scope
+
+
+def _handler_name(data: Dict[str, Any]) -> str:
+    handler = data.get("handler")
+    callback = getattr(handler, "callback", None)
+    if callback is None:
+        return "unhandled"
+    module = getattr(callback, "__module__", "").rsplit(".", 1)[-1]
+    return f"{module}.{getattr(callback, '__name__', 'handler')}"
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Middleware для замера времени обработки обновления по обработчикам
+    """
+    
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        name = _handler_name(data)
+        started = time.perf_counter()
+        result = "ok"
+        try:
+            with operation_scope(f"bot {name}"):
+                return await handler(event, data)
+        except Exception:
+            result = "error"
+            raise
+        finally:
+            BOT_HANDLER_LATENCY.observe(time.perf_counter() - started, name, error=result == "error")
+            BOT_UPDATES.inc(name, result)
+
+
+class TelegramRequestMetricsMiddleware(BaseRequestMiddleware):
+    """
+    Middleware сессии бота: исходящие вызовы Telegram Bot API, их задержка и ответы 429
+    """
+    
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod
+    ) -> Response:
+        name = type(method).__name__
+        started = time.perf_counter()
+        result = "ok"
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter:
+            result = "retry_after"
+            raise
+        except Exception:
+            result = "error"
+            raise
+        finally:
+            TELEGRAM_LATENCY.observe(time.perf_counter() - started, name, error=result != "ok")
+            TELEGRAM_REQUESTS.inc(name, result)
@@ -0,0 +1,28 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+from app.profiling import profile_scope
+
+logger = logging.getLogger(__name__)
+
+
+class SqlProfilingMiddleware(BaseMiddleware):
+    """
+    Middleware для подсчета SQL-запросов за одно обновление и поиска N+1
+    """
+    
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        with profile_scope() as stats:
+            try:
+                return await handler(event, data)
+            finally:
+                where = f"обновлении {event.update_id} ({event.event_type})"
+                logger.debug(f"SQL в {where}: {stats.count} запросов, {stats.total * 1000:.1f} мс")
+                stats.warn_repeats(where)
@@ -10,6 +10,7 @@ from .chat_router import router as chat_router
 from .order_creation_router import router as order_creation_router
 from .task_creation_router import router as task_creation_router
 from .settings_router import router as settings_router
+from .search_router import router as search_router
 
 
 def register_routers(dp: Dispatcher):
@@ -26,4 +27,5 @@ def register_routers(dp: Dispatcher):
     dp.include_router(chat_router)
     dp.include_router(order_creation_router)
     dp.include_router(task_creation_router)
-    dp.include_router(settings_router) 
\ No newline at end of file
+    dp.include_router(settings_router)
+    dp.include_router(search_router) 
\ No newline at end of file
@@ -1,25 +1,23 @@
 import logging
 from aiogram import Router, F, types
-from aiogram.filters import Command
+from aiogram.filters import Command, CommandObject
 from aiogram.fsm.context import FSMContext
 
 from ..keyboards.admin_keyboards import get_admin_keyboard
 from ..services.admin_service import AdminService
-from ..services.user_service import UserService
-from app.models.user import UserRole
+from ..services.broadcast_service import BroadcastService
+from ..utils.message_utils import safe_edit_message
+from app.models.user import User, UserRole
 
 router = Router(name="admin_router")
 logger = logging.getLogger(__name__)
 
 
 @router.callback_query(F.data == "admin")
-async def admin_menu_handler(callback: types.CallbackQuery, state: FSMContext):
+async def admin_menu_handler(callback: types.CallbackQuery, state: FSMContext, user: User):
     """
     Обработчик админского меню
     """
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(callback.from_user.id)
-    
     if not user or not user.is_registered or user.role != UserRole.ADMIN.value:
         await callback.message.edit_text(
             "❌ Доступ запрещен.\n\n"
@@ -39,15 +37,12 @@ async def admin_menu_handler(callback: types.CallbackQuery, state: FSMContext):
 
 
 @router.callback_query(F.data == "admin_users")
-async def admin_users_handler(callback: types.CallbackQuery, state: FSMContext):
+async def admin_users_handler(callback: types.CallbackQuery, state: FSMContext, user: User):
     """
     Обработчик просмотра пользователей (админ)
     """
-    user_service = UserService()
     admin_service = AdminService()
     
-    user = await user_service.get_user_by_telegram_id(callback.from_user.id)
-    
     if not user or not user.is_registered or user.role != UserRole.ADMIN.value:
         await callback.message.edit_text(
             "❌ Доступ запрещен.\n\n"
@@ -83,15 +78,12 @@ async def admin_users_handler(callback: types.CallbackQuery, state: FSMContext):
 
 
 @router.callback_query(F.data == "admin_stats")
-async def admin_stats_handler(callback: types.CallbackQuery, state: FSMContext):
+async def admin_stats_handler(callback: types.CallbackQuery, state: FSMContext, user: User):
     """
     Обработчик статистики (админ)
     """
-    user_service = UserService()
     admin_service = AdminService()
     
-    user = await user_service.get_user_by_telegram_id(callback.from_user.id)
-    
     if not user or not user.is_registered or user.role != UserRole.ADMIN.value:
         await callback.message.edit_text(
             "❌ Доступ запрещен.\n\n"
@@ -124,13 +116,10 @@ async def admin_stats_handler(callback: types.CallbackQuery, state: FSMContext):
 
 
 @router.message(Command("admin"))
-async def admin_command_handler(message: types.Message):
+async def admin_command_handler(message: types.Message, user: User):
     """
     Обработчик команды /admin
     """
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered or user.role != 'admin':
         await message.answer(
             "❌ Доступ запрещен.\n\n"
@@ -143,7 +132,10 @@ async def admin_command_handler(message: types.Message):
         "Доступные команды:\n"
         "/admin_users - Список пользователей\n"
         "/admin_stats - Статистика системы\n"
-        "/admin_orders - Управление заказами\n\n"
+        "/admin_orders - Управление заказами\n"
+        "/broadcast - Рассылка по сегменту пользователей\n"
+        "/broadcast_status ID - Прогресс рассылки\n"
+        "/broadcast_resume ID - Продолжить рассылку\n\n"
         "🌐 <a href='http://localhost:3000/admin'>Админ-панель на сайте</a>",
         parse_mode="HTML",
         disable_web_page_preview=True
@@ -151,15 +143,12 @@ async def admin_command_handler(message: types.Message):
 
 
 @router.message(Command("admin_users"))
-async def admin_users_command_handler(message: types.Message):
+async def admin_users_command_handler(message: types.Message, user: User):
     """
     Обработчик команды /admin_users
     """
-    user_service = UserService()
     admin_service = AdminService()
     
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered or user.role != 'admin':
         await message.answer(
             "❌ Доступ запрещен.\n\n"
@@ -186,4 +175,174 @@ async def admin_users_command_handler(message: types.Message):
         users_text,
         parse_mode="HTML",
         disable_web_page_preview=True
-    ) 
\ No newline at end of file
+    ) 
+
+def _is_admin(user: User) -> bool:
+    """Проверка прав администратора"""
+    return bool(user and user.is_registered and user.role == UserRole.ADMIN)
+
+
+def _format_broadcast_progress(progress: dict) -> str:
+    """Текст с прогрессом рассылки"""
+    return (
+        f"📣 <b>Рассылка #{progress['id']}</b>\n\n"
+        f"Статус: {progress['status']}\n"
+        f"Получателей: {progress['total']}\n"
+        f"✅ Отправлено: {progress['sent']}\n"
+        f"❌ Ошибок: {progress['failed']}\n"
+        f"⏳ В очереди: {progress['pending']}"
+    )
+
+
+def _parse_broadcast_command(text: str):
+    """
+    Разбор команды рассылки.
+
+    Первая строка — команда и фильтры вида key=value
+    (role=executor, skills=python,django, active=30), остальные строки — текст.
+    """
+    header, _, body = text.partition("\n")
+    filters = {}
+    for token in header.split()[1:]:
+        key, sep, value = token.partition("=")
+        if not sep:
+            raise ValueError(f"Некорректный фильтр: {token}")
+        filters[key.lower()] = value
+
+    unknown = set(filters) - {"role", "skills", "active"}
+    if unknown:
+        raise ValueError(f"Неизвестные фильтры: {', '.join(sorted(unknown))}")
+
+    role = filters.get("role")
+    if role:
+        role = role.lower()
+        if role not in {r.value for r in UserRole}:
+            raise ValueError(f"Неизвестная роль: {filters['role']}")
+
+    skills = [s.strip() for s in filters.get("skills", "").split(",") if s.strip()] or None
+
+    active = filters.get("active")
+    if active:
+        if not active.isdigit() or int(active) < 1:
+            raise ValueError(f"active — число дней больше нуля, получено: {active}")
+        active = int(active)
+    else:
+        active = None
+
+    return role, skills, active, body.strip()
+
+
+def _progress_reporter(status_message: types.Message):
+    """Колбэк, обновляющий сообщение с прогрессом рассылки"""
+    async def report(progress: dict):
+        await safe_edit_message(status_message, _format_broadcast_progress(progress))
+    return report
+
+
+@router.message(Command("broadcast"))
+async def broadcast_command_handler(message: types.Message, user: User):
+    """
+    Обработчик команды /broadcast - массовая рассылка по сегменту пользователей
+    """
+    if not _is_admin(user):
+        await message.answer(
+            "❌ Доступ запрещен.\n\n"
+            "Эта функция доступна только администраторам."
+        )
+        return
+
+    try:
+        role, skills, active, text = _parse_broadcast_command(message.text or "")
+    except ValueError as e:
+        await message.answer(f"❌ {e}")
+        return
+
+    if not text:
+        await message.answer(
+            "📣 <b>Рассылка</b>\n\n"
+            "Формат:\n"
+            "<code>/broadcast role=executor skills=python,django active=30\n"
+            "Текст сообщения</code>\n\n"
+            "Все фильтры необязательны:\n"
+            "• role — роль (customer, executor, admin)\n"
+            "• skills — любой из навыков через запятую\n"
+            "• active — активность за последние N дней",
+            parse_mode="HTML"
+        )
+        return
+
+    broadcast_service = BroadcastService()
+    broadcast = await broadcast_service.create_broadcast(
+        creator_id=user.id,
+        text=text,
+        role=role,
+        skills=skills,
+        active_within_days=active
+    )
+    if not broadcast:
+        await message.answer("❌ Не удалось создать рассылку. Попробуйте позже.")
+        return
+
+    if not broadcast.total_recipients:
+        await message.answer(f"ℹ️ Рассылка #{broadcast.id}: нет получателей для выбранного сегмента.")
+        return
+
+    status_message = await message.answer(
+        f"⏳ Рассылка #{broadcast.id} запущена для {broadcast.total_recipients} получателей..."
+    )
+    broadcast_service.start(broadcast.id, _progress_reporter(status_message))
+
+
+@router.message(Command("broadcast_status"))
+async def broadcast_status_handler(message: types.Message, command: CommandObject, user: User):
+    """
+    Обработчик команды /broadcast_status <id>
+    """
+    if not _is_admin(user):
+        await message.answer(
+            "❌ Доступ запрещен.\n\n"
+            "Эта функция доступна только администраторам."
+        )
+        return
+
+    if not command.args or not command.args.strip().isdigit():
+        await message.answer("Использование: <code>/broadcast_status ID</code>", parse_mode="HTML")
+        return
+
+    progress = await BroadcastService().get_progress(int(command.args.strip()))
+    if not progress:
+        await message.answer("❌ Рассылка не найдена.")
+        return
+
+    await message.answer(_format_broadcast_progress(progress), parse_mode="HTML")
+
+
+@router.message(Command("broadcast_resume"))
+async def broadcast_resume_handler(message: types.Message, command: CommandObject, user: User):
+    """
+    Обработчик команды /broadcast_resume <id> - продолжить прерванную рассылку
+    """
+    if not _is_admin(user):
+        await message.answer(
+            "❌ Доступ запрещен.\n\n"
+            "Эта функция доступна только администраторам."
+        )
+        return
+
+    if not command.args or not command.args.strip().isdigit():
+        await message.answer("Использование: <code>/broadcast_resume ID</code>", parse_mode="HTML")
+        return
+
+    broadcast_service = BroadcastService()
+    progress = await broadcast_service.get_progress(int(command.args.strip()))
+    if not progress:
+        await message.answer("❌ Рассылка не найдена.")
+        return
+
+    if not progress['pending']:
+        await message.answer(_format_broadcast_progress(progress), parse_mode="HTML")
+        return
+
+    status_message = await message.answer(_format_broadcast_progress(progress), parse_mode="HTML")
+    if not broadcast_service.start(progress['id'], _progress_reporter(status_message)):
+        await message.answer("ℹ️ Рассылка уже отправляется.")
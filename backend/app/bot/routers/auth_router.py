@@ -7,7 +7,7 @@ from aiogram.fsm.state import State, StatesGroup
 
 from ..keyboards.auth_keyboards import get_auth_keyboard
 from ..services.user_service import UserService
-from app.config import settings
+from ..utils.api_client import api_client
 from app.models.user import UserRole
 
 def get_role_display_name(role):
@@ -146,7 +146,7 @@ async def handle_binding_code(message: types.Message, state: FSMContext):
     
     try:
         # Отправляем запрос к API для привязки аккаунта
-        url = f"{settings.api_base_url}/api/v1/telegram/bind/{code}"
+        url = f"/telegram/bind/{code}"
         data = {
             "telegram_id": message.from_user.id,
             "telegram_username": message.from_user.username or f"user_{message.from_user.id}"
@@ -155,84 +155,79 @@ async def handle_binding_code(message: types.Message, state: FSMContext):
         logger.info(f"Attempting to bind account with URL: {url}")
         logger.info(f"Data: {data}")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=data,
-                timeout=10.0
+        response = await api_client.post(url, endpoint="/telegram/bind/{code}", json=data)
+        
+        if response.status_code == 200:
+            data = response.json()
+            await message.answer(
+                "✅ <b>Аккаунт успешно привязан!</b>\n\n"
+                f"Ваш аккаунт на сайте теперь связан с Telegram.\n"
+                f"Вы будете получать уведомления о новых заказах и сообщениях.\n\n"
+                "🏠 <b>Используйте главное меню для навигации</b>",
+                parse_mode="HTML"
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                await message.answer(
-                    "✅ <b>Аккаунт успешно привязан!</b>\n\n"
-                    f"Ваш аккаунт на сайте теперь связан с Telegram.\n"
-                    f"Вы будете получать уведомления о новых заказах и сообщениях.\n\n"
-                    "🏠 <b>Используйте главное меню для навигации</b>",
-                    parse_mode="HTML"
-                )
-                
-                # Сбрасываем состояние
-                await state.clear()
-                
-                # Показываем главное меню
-                from ..keyboards.main_keyboards import get_main_menu_keyboard
-                await message.answer(
-                    "🎉 <b>Добро пожаловать в Deadline Task Board!</b>\n\n"
-                    "Теперь вы можете:\n"
-                    "• Просматривать заказы и задачи\n"
-                    "• Создавать новые проекты\n"
-                    "• Общаться с другими участниками\n"
-                    "• Управлять своим профилем\n\n"
-                    "Выберите действие:",
-                    reply_markup=get_main_menu_keyboard(user_role="executor", is_admin=False, is_linked=True),
-                    parse_mode="HTML"
-                )
-                
-            elif response.status_code == 400:
-                error_data = response.json()
-                error_message = error_data.get("detail", "Неизвестная ошибка")
-                
-                if "истек" in error_message.lower():
-                    await message.answer(
-                        "❌ <b>Код привязки истек</b>\n\n"
-                        "Код действителен только 10 минут.\n"
-                        "Пожалуйста, сгенерируйте новый код на сайте и попробуйте снова.\n\n"
-                        "🌐 <a href='http://localhost:3000/profile'>Сгенерировать новый код</a>",
-                        parse_mode="HTML",
-                        disable_web_page_preview=True
-                    )
-                elif "уже привязан" in error_message.lower():
-                    await message.answer(
-                        "❌ <b>Этот Telegram аккаунт уже привязан</b>\n\n"
-                        "Данный Telegram аккаунт уже связан с другим пользователем.\n"
-                        "Если это ваш аккаунт, обратитесь в поддержку.",
-                        parse_mode="HTML"
-                    )
-                else:
-                    await message.answer(
-                        f"❌ <b>Ошибка привязки:</b> {error_message}\n\n"
-                        "Попробуйте еще раз или обратитесь в поддержку.",
-                        parse_mode="HTML"
-                    )
-                    
-            elif response.status_code == 404:
+            # Сбрасываем состояние
+            await state.clear()
+            
+            # Показываем главное меню
+            from ..keyboards.main_keyboards import get_main_menu_keyboard
+            await message.answer(
+                "🎉 <b>Добро пожаловать в Deadline Task Board!</b>\n\n"
+                "Теперь вы можете:\n"
+                "• Просматривать заказы и задачи\n"
+                "• Создавать новые проекты\n"
+                "• Общаться с другими участниками\n"
+                "• Управлять своим профилем\n\n"
+                "Выберите действие:",
+                reply_markup=get_main_menu_keyboard(user_role="executor", is_admin=False, is_linked=True),
+                parse_mode="HTML"
+            )
+            
+        elif response.status_code == 400:
+            error_data = response.json()
+            error_message = error_data.get("detail", "Неизвестная ошибка")
+            
+            if "истек" in error_message.lower():
                 await message.answer(
-                    "❌ <b>Недействительный код</b>\n\n"
-                    "Код привязки не найден или уже использован.\n"
-                    "Пожалуйста, сгенерируйте новый код на сайте.\n\n"
+                    "❌ <b>Код привязки истек</b>\n\n"
+                    "Код действителен только 10 минут.\n"
+                    "Пожалуйста, сгенерируйте новый код на сайте и попробуйте снова.\n\n"
                     "🌐 <a href='http://localhost:3000/profile'>Сгенерировать новый код</a>",
                     parse_mode="HTML",
                     disable_web_page_preview=True
                 )
-                
+            elif "уже привязан" in error_message.lower():
+                await message.answer(
+                    "❌ <b>Этот Telegram аккаунт уже привязан</b>\n\n"
+                    "Данный Telegram аккаунт уже связан с другим пользователем.\n"
+                    "Если это ваш аккаунт, обратитесь в поддержку.",
+                    parse_mode="HTML"
+                )
             else:
                 await message.answer(
-                    "❌ <b>Ошибка сервера</b>\n\n"
-                    "Произошла ошибка при обработке запроса.\n"
-                    "Попробуйте позже или обратитесь в поддержку."
+                    f"❌ <b>Ошибка привязки:</b> {error_message}\n\n"
+                    "Попробуйте еще раз или обратитесь в поддержку.",
+                    parse_mode="HTML"
                 )
                 
+        elif response.status_code == 404:
+            await message.answer(
+                "❌ <b>Недействительный код</b>\n\n"
+                "Код привязки не найден или уже использован.\n"
+                "Пожалуйста, сгенерируйте новый код на сайте.\n\n"
+                "🌐 <a href='http://localhost:3000/profile'>Сгенерировать новый код</a>",
+                parse_mode="HTML",
+                disable_web_page_preview=True
+            )
+            
+        else:
+            await message.answer(
+                "❌ <b>Ошибка сервера</b>\n\n"
+                "Произошла ошибка при обработке запроса.\n"
+                "Попробуйте позже или обратитесь в поддержку."
+            )
+            
     except httpx.TimeoutException:
         await message.answer(
             "❌ <b>Превышено время ожидания</b>\n\n"
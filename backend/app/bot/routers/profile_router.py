@@ -24,13 +24,10 @@ logger = logging.getLogger(__name__)
 
 
 @router.callback_query(F.data == "profile")
-async def profile_menu_handler(callback: types.CallbackQuery, state: FSMContext):
+async def profile_menu_handler(callback: types.CallbackQuery, state: FSMContext, user: User):
     """
     Обработчик меню профиля
     """
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(callback.from_user.id)
-    
     if not user or not user.is_registered:
         await callback.message.edit_text(
             "❌ Вы не авторизованы.\n\n"
@@ -90,12 +87,11 @@ async def edit_profile_handler(callback: types.CallbackQuery, user: User):
 
 
 @router.callback_query(F.data == "statistics")
-async def statistics_handler(callback: types.CallbackQuery, state: FSMContext):
+async def statistics_handler(callback: types.CallbackQuery, state: FSMContext, user: User):
     """
     Обработчик статистики пользователя
     """
     user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(callback.from_user.id)
     
     if not user or not user.is_registered:
         await callback.message.edit_text(
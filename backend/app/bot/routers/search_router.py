@@ -0,0 +1,52 @@
+import logging
+from html import escape
+
+from aiogram import Router, types
+from aiogram.filters import Command, CommandObject
+
+from ..services.search_service import SearchService
+from app.models.user import User
+
+router = Router(name="search_router")
+logger = logging.getLogger(__name__)
+
+
+def _format_hits(title: str, hits) -> str:
+    """Блок результатов одного типа"""
+    text = f"<b>{title}</b>\n"
+    for hit in hits:
+        text += f"• #{hit['id']} <b>{escape(hit['title'])}</b>\n  {escape(hit['snippet'])}\n"
+    return text
+
+
+@router.message(Command("search"))
+async def search_handler(message: types.Message, command: CommandObject, user: User):
+    """Полнотекстовый поиск по задачам и заказам: /search текст"""
+    if not user or not user.is_registered:
+        await message.answer(
+            "❌ Вы должны быть зарегистрированы для поиска.\n"
+            "Используйте /register для регистрации."
+        )
+        return
+
+    query = (command.args or "").strip()
+    if not query:
+        await message.answer(
+            "🔍 Использование: <code>/search текст запроса</code>\n\n"
+            "Поддерживаются фразы в кавычках, <code>or</code> и исключение слов через <code>-</code>.",
+            parse_mode="HTML"
+        )
+        return
+
+    results = await SearchService().search(user, query[:200])
+    if not results["tasks"] and not results["orders"]:
+        await message.answer(f"🔍 По запросу «{escape(query)}» ничего не найдено.")
+        return
+
+    text = f"🔍 <b>Результаты поиска:</b> {escape(query)}\n\n"
+    if results["tasks"]:
+        text += _format_hits("📋 Задачи", results["tasks"]) + "\n"
+    if results["orders"]:
+        text += _format_hits("💼 Заказы", results["orders"])
+
+    await message.answer(text, parse_mode="HTML")
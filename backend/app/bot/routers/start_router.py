@@ -5,14 +5,11 @@ from aiogram.fsm.context import FSMContext
 from datetime import datetime
 
 from ..keyboards.main_keyboards import get_main_menu_keyboard, get_commands_menu_keyboard, get_rating_menu_keyboard, get_messages_menu_keyboard, get_settings_menu_keyboard
-from ..middlewares.auth_middleware import AuthMiddleware
 from ..services.user_service import UserService
 from ..bot_instance import set_bot_commands
 from app.models.user import User, UserRole
 
 router = Router(name="start_router")
-router.message.middleware(AuthMiddleware())
-router.callback_query.middleware(AuthMiddleware())
 
 logger = logging.getLogger(__name__)
 
@@ -101,13 +98,10 @@ async def start_handler(message: types.Message, state: FSMContext):
 
 
 @router.callback_query(F.data == "main_menu")
-async def main_menu_handler(callback: types.CallbackQuery, state: FSMContext):
+async def main_menu_handler(callback: types.CallbackQuery, state: FSMContext, user: User):
     """
     Обработчик возврата в главное меню
     """
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(callback.from_user.id)
-    
     # Проверяем, привязан ли аккаунт к сайту
     # is_linked = True если пользователь зарегистрирован на сайте (имеет email) и привязан к Telegram
     is_linked = user and user.email and user.telegram_id == callback.from_user.id
@@ -137,14 +131,10 @@ async def main_menu_handler(callback: types.CallbackQuery, state: FSMContext):
 
 
 @router.message(Command("help"))
-async def help_handler(message: types.Message):
+async def help_handler(message: types.Message, user: User):
     """
     Обработчик команды /help
     """
-    # Получаем пользователя для определения его статуса
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered:
         # Справка для незарегистрированных пользователей
         help_text = (
@@ -185,7 +175,8 @@ async def help_handler(message: types.Message):
             "• <code>/tasks</code> - управление задачами\n"
             "• <code>/newtask</code> - создать новую задачу\n"
             "• <code>/newhardtask</code> - создать гибкую задачу\n"
-            "• <code>/contracts</code> - мои задачи в работе\n\n"
+            "• <code>/contracts</code> - мои задачи в работе\n"
+            "• <code>/search</code> - поиск задач и заказов\n\n"
             "💼 <b>Заказы и предложения:</b>\n"
             "• <code>/orders</code> - работа с заказами\n"
             "• <code>/myusers</code> - список моих исполнителей\n"
@@ -217,14 +208,10 @@ async def help_handler(message: types.Message):
 
 
 @router.message(Command("guide"))
-async def guide_handler(message: types.Message):
+async def guide_handler(message: types.Message, user: User):
     """
     Обработчик команды /guide - подробное руководство
     """
-    # Получаем пользователя для определения его статуса
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered:
         # Руководство для незарегистрированных пользователей
         guide_text = (
@@ -383,14 +370,10 @@ async def guide_handler(message: types.Message):
 
 
 @router.message(Command("quickstart"))
-async def quickstart_handler(message: types.Message):
+async def quickstart_handler(message: types.Message, user: User):
     """
     Обработчик команды /quickstart - быстрый старт
     """
-    # Получаем пользователя для определения его статуса
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered:
         # Быстрый старт для незарегистрированных пользователей
         quickstart_text = (
@@ -463,14 +446,10 @@ async def quickstart_handler(message: types.Message):
 
 
 @router.message(Command("me"))
-async def me_handler(message: types.Message):
+async def me_handler(message: types.Message, user: User):
     """
     Обработчик команды /me - добавить резюме
     """
-    # Получаем пользователя для определения его статуса
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered:
         me_text = (
             "💪 <b>Добавить свое резюме</b>\n\n"
@@ -521,14 +500,10 @@ async def me_handler(message: types.Message):
 
 
 @router.message(Command("rating"))
-async def rating_handler(message: types.Message):
+async def rating_handler(message: types.Message, user: User):
     """
     Обработчик команды /rating - показать рейтинг
     """
-    # Получаем пользователя для определения его статуса
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered:
         # Сообщение для незарегистрированных пользователей
         rating_text = (
@@ -586,14 +561,10 @@ async def rating_handler(message: types.Message):
 
 
 @router.message(Command("contracts"))
-async def contracts_handler(message: types.Message):
+async def contracts_handler(message: types.Message, user: User):
     """
     Обработчик команды /contracts - мои задачи в работе
     """
-    # Получаем пользователя для определения его статуса
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered:
         # Сообщение для незарегистрированных пользователей
         contracts_text = (
@@ -649,14 +620,10 @@ async def contracts_handler(message: types.Message):
 
 
 @router.message(Command("sub"))
-async def sub_handler(message: types.Message):
+async def sub_handler(message: types.Message, user: User):
     """
     Обработчик команды /sub - создать подписку на задачи
     """
-    # Получаем пользователя для определения его статуса
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered:
         # Сообщение для незарегистрированных пользователей
         sub_text = (
@@ -722,14 +689,10 @@ async def sub_handler(message: types.Message):
 
 
 @router.message(Command("push"))
-async def push_handler(message: types.Message):
+async def push_handler(message: types.Message, user: User):
     """
     Обработчик команды /push - перенастроить подписки
     """
-    # Получаем пользователя для определения его статуса
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered:
         # Сообщение для незарегистрированных пользователей
         push_text = (
@@ -794,14 +757,10 @@ async def push_handler(message: types.Message):
 
 
 @router.message(Command("myusers"))
-async def myusers_handler(message: types.Message):
+async def myusers_handler(message: types.Message, user: User):
     """
     Обработчик команды /myusers - список моих исполнителей
     """
-    # Получаем пользователя для определения его статуса
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered:
         # Сообщение для незарегистрированных пользователей
         myusers_text = (
@@ -867,14 +826,10 @@ async def myusers_handler(message: types.Message):
 
 
 @router.message(Command("newtask"))
-async def newtask_handler(message: types.Message):
+async def newtask_handler(message: types.Message, user: User):
     """
     Обработчик команды /newtask - создать новую задачу
     """
-    # Получаем пользователя для определения его статуса
-    user_service = UserService()
-    user = await user_service.get_user_by_telegram_id(message.from_user.id)
-    
     if not user or not user.is_registered:
         # Сообщение для незарегистрированных пользователей
         newtask_text = (
@@ -0,0 +1,327 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_db
+from app.models.broadcast import Broadcast, BroadcastRecipient, BroadcastStatus, DeliveryStatus
+from app.models.user import User, UserRole
+from ..bot_instance import bot
+from ..utils.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Сколько раз повторять отправку одному получателю после ответа 429
+MAX_SEND_ATTEMPTS = 3
+
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Рассылки, которые сейчас отправляются в этом процессе
+_running: Dict[int, asyncio.Task] = {}
+
+
+class BroadcastService:
+    """
+    Сервис массовых рассылок для администраторов
+    """
+
+    def __init__(self):
+        self.batch_size = settings.broadcast_batch_size
+
+    def _get_db(self) -> Session:
+        """Получить подключение к базе данных"""
+        return next(get_db())
+
+    def _recipients_query(
+        self,
+        role: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        active_within_days: Optional[int] = None
+    ):
+        """
+        Запрос получателей сегмента: фильтрация целиком на стороне БД
+        """
+        stmt = select(User.id, User.telegram_id).where(
+            User.telegram_id.isnot(None),
+            User.is_active == True,
+            User.is_banned.isnot(True)
+        )
+
+        if role:
+            stmt = stmt.where(User.role == UserRole(role))
+
+        if skills:
+            # Навыки хранятся JSON строкой, ищем каждый навык как JSON-литерал
+            stmt = stmt.where(or_(*(
+                func.lower(User.skills).contains(json.dumps(skill.lower()), autoescape=True)
+                for skill in skills
+            )))
+
+        if active_within_days:
+            since = datetime.utcnow() - timedelta(days=active_within_days)
+            stmt = stmt.where(User.last_activity >= since)
+
+        return stmt.order_by(User.id)
+
+    async def create_broadcast(
+        self,
+        creator_id: int,
+        text: str,
+        role: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        active_within_days: Optional[int] = None
+    ) -> Optional[Broadcast]:
+        """
+        Создать рассылку и сформировать список получателей.
+
+        Пользователи читаются серверным курсором пачками по `batch_size`,
+        поэтому память не зависит от размера сегмента.
+        """
+        try:
+            db = self._get_db()
+            try:
+                broadcast = Broadcast(
+                    text=text,
+                    creator_id=creator_id,
+                    filter_role=role,
+                    filter_skills=json.dumps(skills) if skills else None,
+                    active_within_days=active_within_days,
+                    status=BroadcastStatus.PENDING.value
+                )
+                db.add(broadcast)
+                db.flush()
+
+                stmt = self._recipients_query(role, skills, active_within_days)
+                result = db.execute(stmt.execution_options(yield_per=self.batch_size))
+
+                total = 0
+                for partition in result.partitions():
+                    db.execute(insert(BroadcastRecipient), [
+                        {
+                            "broadcast_id": broadcast.id,
+                            "user_id": row.id,
+                            "telegram_id": row.telegram_id,
+                            "status": DeliveryStatus.PENDING.value
+                        }
+                        for row in partition
+                    ])
+                    total += len(partition)
+
+                broadcast.total_recipients = total
+                db.commit()
+                db.refresh(broadcast)
+
+                logger.info(f"Created broadcast {broadcast.id} for {total} recipients")
+                return broadcast
+
+            finally:
+                db.close()
+
+        except Exception as e:
+            logger.error(f"Error creating broadcast: {e}")
+            return None
+
+    async def get_progress(self, broadcast_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Получить прогресс рассылки
+        """
+        try:
+            db = self._get_db()
+            try:
+                broadcast = db.get(Broadcast, broadcast_id)
+                if not broadcast:
+                    return None
+                return _progress(broadcast)
+            finally:
+                db.close()
+
+        except Exception as e:
+            logger.error(f"Error getting progress of broadcast {broadcast_id}: {e}")
+            return None
+
+    def start(self, broadcast_id: int, progress_callback: Optional[ProgressCallback] = None) -> bool:
+        """
+        Запустить (или возобновить) отправку в фоне.
+        Возвращает False, если рассылка уже отправляется.
+        """
+        task = _running.get(broadcast_id)
+        if task and not task.done():
+            return False
+
+        task = asyncio.create_task(self.run(broadcast_id, progress_callback))
+        _running[broadcast_id] = task
+        task.add_done_callback(lambda _: _running.pop(broadcast_id, None))
+        return True
+
+    async def resume_interrupted(self) -> int:
+        """
+        Возобновить рассылки, прерванные остановкой процесса
+        """
+        try:
+            db = self._get_db()
+            try:
+                ids = db.execute(
+                    select(Broadcast.id).where(Broadcast.status == BroadcastStatus.RUNNING.value)
+                ).scalars().all()
+            finally:
+                db.close()
+
+            for broadcast_id in ids:
+                self.start(broadcast_id)
+
+            if ids:
+                logger.info(f"Resumed {len(ids)} interrupted broadcasts")
+            return len(ids)
+
+        except Exception as e:
+            logger.error(f"Error resuming broadcasts: {e}")
+            return 0
+
+    async def run(self, broadcast_id: int, progress_callback: Optional[ProgressCallback] = None):
+        """
+        Отправить рассылку всем получателям в статусе pending.
+
+        Получатели выбираются пачками по ключу (id > последнего обработанного),
+        статусы доставки фиксируются после каждой пачки одной транзакцией —
+        при перезапуске отправка продолжается с первого неотправленного.
+        """
+        limiter = RateLimiter(settings.broadcast_rate_limit, burst=max(int(settings.broadcast_rate_limit), 1))
+
+        try:
+            text = self._mark_running(broadcast_id)
+            if text is None:
+                return
+
+            last_id = 0
+            while True:
+                db = self._get_db()
+                try:
+                    batch = db.execute(
+                        select(BroadcastRecipient.id, BroadcastRecipient.telegram_id).where(
+                            BroadcastRecipient.broadcast_id == broadcast_id,
+                            BroadcastRecipient.status == DeliveryStatus.PENDING.value,
+                            BroadcastRecipient.id > last_id
+                        ).order_by(BroadcastRecipient.id).limit(self.batch_size)
+                    ).all()
+
+                    if not batch:
+                        break
+                    last_id = batch[-1].id
+
+                    results = await asyncio.gather(*(
+                        self._deliver(limiter, row.telegram_id, text) for row in batch
+                    ))
+
+                    now = datetime.utcnow()
+                    db.execute(update(BroadcastRecipient), [
+                        {
+                            "id": row.id,
+                            "status": status,
+                            "error": error,
+                            "sent_at": now if status == DeliveryStatus.SENT.value else None
+                        }
+                        for row, (status, error) in zip(batch, results)
+                    ])
+
+                    sent = sum(1 for status, _ in results if status == DeliveryStatus.SENT.value)
+                    db.execute(
+                        update(Broadcast).where(Broadcast.id == broadcast_id).values(
+                            sent_count=Broadcast.sent_count + sent,
+                            failed_count=Broadcast.failed_count + (len(results) - sent)
+                        )
+                    )
+                    db.commit()
+
+                    progress = _progress(db.get(Broadcast, broadcast_id))
+                finally:
+                    db.close()
+
+                if progress_callback:
+                    await progress_callback(progress)
+
+            progress = self._finish(broadcast_id, BroadcastStatus.COMPLETED)
+            logger.info(f"Broadcast {broadcast_id} completed: {progress}")
+            if progress_callback and progress:
+                await progress_callback(progress)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error running broadcast {broadcast_id}: {e}")
+            self._finish(broadcast_id, BroadcastStatus.FAILED)
+
+    async def _deliver(self, limiter: RateLimiter, telegram_id: int, text: str):
+        """
+        Отправить одно сообщение с учетом лимитов Telegram.
+        Возвращает пару (статус доставки, текст ошибки).
+        """
+        for _ in range(MAX_SEND_ATTEMPTS):
+            await limiter.acquire()
+            try:
+                await bot.send_message(chat_id=telegram_id, text=text)
+                return DeliveryStatus.SENT.value, None
+            except TelegramRetryAfter as e:
+                logger.warning(f"Flood control while broadcasting, retry after {e.retry_after}s")
+                await limiter.pause(e.retry_after)
+            except TelegramForbiddenError as e:
+                return DeliveryStatus.BLOCKED.value, str(e)[:255]
+            except TelegramBadRequest as e:
+                return DeliveryStatus.FAILED.value, str(e)[:255]
+            except Exception as e:
+                logger.error(f"Error sending broadcast message to {telegram_id}: {e}")
+                return DeliveryStatus.FAILED.value, str(e)[:255]
+
+        return DeliveryStatus.FAILED.value, "Flood control: retry limit exceeded"
+
+    def _mark_running(self, broadcast_id: int) -> Optional[str]:
+        """Перевести рассылку в статус running и вернуть ее текст"""
+        db = self._get_db()
+        try:
+            broadcast = db.get(Broadcast, broadcast_id)
+            if not broadcast or broadcast.status == BroadcastStatus.COMPLETED.value:
+                return None
+
+            broadcast.status = BroadcastStatus.RUNNING.value
+            if not broadcast.started_at:
+                broadcast.started_at = datetime.utcnow()
+            db.commit()
+            return broadcast.text
+        finally:
+            db.close()
+
+    def _finish(self, broadcast_id: int, status: BroadcastStatus) -> Optional[Dict[str, Any]]:
+        """Зафиксировать итоговый статус рассылки"""
+        db = self._get_db()
+        try:
+            broadcast = db.get(Broadcast, broadcast_id)
+            if not broadcast:
+                return None
+
+            broadcast.status = status.value
+            broadcast.finished_at = datetime.utcnow()
+            db.commit()
+            return _progress(broadcast)
+        finally:
+            db.close()
+
+
+def _progress(broadcast: Broadcast) -> Dict[str, Any]:
+    """Сводка по рассылке для отображения администратору"""
+    total = broadcast.total_recipients or 0
+    sent = broadcast.sent_count or 0
+    failed = broadcast.failed_count or 0
+    return {
+        'id': broadcast.id,
+        'status': broadcast.status,
+        'total': total,
+        'sent': sent,
+        'failed': failed,
+        'pending': max(total - sent - failed, 0)
+    }
+
@@ -0,0 +1,91 @@
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.matching import matching_crud
+from app.database import get_db
+from app.models.order import Order, OrderStatus
+from ..bot_instance import bot
+from ..utils.message_utils import safe_send_message
+
+logger = logging.getLogger(__name__)
+
+# Сколько новых заказов обрабатывать за один запуск задачи
+ORDERS_PER_RUN = 50
+
+
+class MatchingService:
+    """
+    Сервис рассылки новых заказов подходящим исполнителям
+    """
+
+    def __init__(self):
+        pass
+
+    def _get_db(self) -> Session:
+        """Получить подключение к базе данных"""
+        return next(get_db())
+
+    async def notify_new_orders(self) -> int:
+        """
+        Подобрать исполнителей для новых открытых заказов и уведомить top-K.
+
+        Заказ помечается matched_at до отправки, поэтому при сбое
+        исполнители не получат одно и то же уведомление повторно. Если подбор
+        не уложился в таймаут, matched_at не ставится: заказ подбирается снова
+        при следующем запуске, пока не выйдет из окна settings.matching_window_minutes.
+        """
+        try:
+            db = self._get_db()
+            try:
+                since = datetime.utcnow() - timedelta(minutes=settings.matching_window_minutes)
+                orders = db.execute(
+                    select(Order).where(
+                        Order.status == OrderStatus.OPEN.value,
+                        Order.matched_at.is_(None),
+                        Order.created_at >= since
+                    ).order_by(Order.id).limit(ORDERS_PER_RUN)
+                ).scalars().all()
+
+                notified = 0
+                for order in orders:
+                    order_id = order.id
+                    matches = matching_crud.top_executors(db, order)
+                    if matches is None:
+                        logger.info(f"Order {order_id}: matching timed out, will retry on the next run")
+                        continue
+                    recipients = [executor.telegram_id for executor, _, _ in matches if executor.telegram_id]
+                    text = self._format_order(order)
+
+                    order.matched_at = datetime.utcnow()
+                    db.commit()
+
+                    for telegram_id in recipients:
+                        if await safe_send_message(bot, telegram_id, text):
+                            notified += 1
+
+                    logger.info(f"Order {order.id}: notified {len(recipients)} matching executors")
+
+                return notified
+
+            finally:
+                db.close()
+
+        except Exception as e:
+            logger.error(f"Error notifying executors about new orders: {e}")
+            return 0
+
+    def _format_order(self, order: Order) -> str:
+        """Текст уведомления о новом заказе"""
+        deadline = order.deadline.strftime('%d.%m.%Y') if order.deadline else 'Не указан'
+        return (
+            f"🔔 <b>Новый заказ по вашим навыкам</b>\n\n"
+            f"📋 <b>{order.title}</b>\n"
+            f"💰 Бюджет: {order.budget:,.0f} ₽\n"
+            f"📅 Срок: {deadline}\n"
+            f"🏷️ Теги: {order.tags.replace(',', ', ') if order.tags else 'Не указаны'}\n\n"
+            f"🌐 <a href='http://localhost:3000/orders'>Открыть заказы на сайте</a>"
+        )
@@ -1,10 +1,18 @@
 import logging
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
+from app.config import settings
+from app.database import get_db
+from app.crud.message import message_crud
+from app.crud.tag import tag_crud
+from app.crud.task import task_crud
+from app.metrics import timed_job
 from ..bot_instance import bot
+from .matching_service import MatchingService
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +46,7 @@ class SchedulerService:
         try:
             # Задача для ежедневной очистки старых данных
             self.scheduler.add_job(
-                self.cleanup_old_data,
+                timed_job('cleanup_old_data', self.cleanup_old_data),
                 CronTrigger(hour=2, minute=0),  # Каждый день в 2:00
                 id='cleanup_old_data',
                 name='Cleanup old data'
@@ -46,12 +54,22 @@ class SchedulerService:
             
             # Задача для отправки уведомлений
             self.scheduler.add_job(
-                self.send_notifications,
+                timed_job('send_notifications', self.send_notifications),
                 CronTrigger(minute='*/5'),  # Каждые 5 минут
                 id='send_notifications',
                 name='Send notifications'
             )
             
+            # Задача для рассылки новых заказов подходящим исполнителям
+            self.scheduler.add_job(
+                timed_job('match_new_orders', MatchingService().notify_new_orders),
+                IntervalTrigger(seconds=settings.matching_interval_seconds),
+                id='match_new_orders',
+                name='Match new orders with executors',
+                max_instances=1,
+                coalesce=True
+            )
+            
             logger.info("Jobs added to scheduler")
             
         except Exception as e:
@@ -64,14 +82,38 @@ class SchedulerService:
         try:
             logger.info("Starting cleanup of old data")
             
-            # Здесь можно добавить логику очистки старых данных
-            # Например, удаление старых сообщений, неактивных пользователей и т.д.
+            # Счетчики тегов поддерживаются инкрементально, раз в сутки сверяем их с таблицами связей
+            db = next(get_db())
+            try:
+                tag_crud.refresh_counts(db)
+                db.commit()
+                # Ранги карточек удлиняются при вставках в одно место - выравниваем их
+                rebalanced = task_crud.rebalance_long_ranks(db, settings.rank_rebalance_length)
+                if rebalanced:
+                    logger.info(f"Rebalanced task ranks in {rebalanced} columns")
+            finally:
+                db.close()
+            
+            # Сообщения закрытых заказов уходят в архив небольшими транзакциями
+            # в отдельном потоке: первый перенос может быть долгим
+            if settings.message_archive_after_days > 0:
+                archived = await asyncio.to_thread(self._archive_messages)
+                if archived:
+                    logger.info(f"Archived {archived} messages of closed orders")
             
             logger.info("Cleanup of old data completed")
             
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
     
+    def _archive_messages(self) -> int:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.message_archive_after_days)
+        db = next(get_db())
+        try:
+            return message_crud.archive_old(db, cutoff, settings.message_archive_batch_size)
+        finally:
+            db.close()
+    
     async def send_notifications(self):
         """
         Отправка уведомлений
@@ -0,0 +1,40 @@
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.database import read_session
+from app.crud.search import search_crud
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class SearchService:
+    """
+    Сервис полнотекстового поиска для бота
+    """
+
+    def __init__(self, limit: int = 5):
+        self.limit = limit
+
+    def _get_db(self) -> Session:
+        """Получить подключение к базе данных (реплика для чтения, если настроена)"""
+        return read_session()
+
+    async def search(self, user: User, query: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Найти задачи и заказы, доступные пользователю
+        """
+        try:
+            db = self._get_db()
+            try:
+                tasks, _ = search_crud.search_tasks(db, user, query, limit=self.limit)
+                orders, _ = search_crud.search_orders(db, user, query, limit=self.limit)
+                return {"tasks": tasks, "orders": orders}
+            finally:
+                db.close()
+
+        except Exception as e:
+            logger.error(f"Error searching for '{query}': {e}")
+            return {"tasks": [], "orders": []}
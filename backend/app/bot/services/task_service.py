@@ -4,6 +4,7 @@ from typing import List, Optional, Dict
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import select
 
+from app.cache import invalidate_boards
 from app.database import get_db
 from app.models.task import Task
 from app.models.task_status import TaskStatus
@@ -11,6 +12,7 @@ from app.models.task_type import TaskType, TaskTypeEnum
 from app.models.board import Board
 from app.models.column import Column
 from app.crud.task import task_crud
+from app.crud.rank import evenly_spaced
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
@@ -197,6 +199,7 @@ class TaskService:
                 db.add(board)
                 db.commit()
                 db.refresh(board)
+                invalidate_boards(board.id, public=board.is_public)
                 
                 # Создаем стандартные колонки
                 await self._create_default_columns(board.id)
@@ -223,15 +226,17 @@ class TaskService:
                     {"title": "Готово", "order_index": 3}
                 ]
                 
-                for col_data in columns_data:
+                for col_data, position in zip(columns_data, evenly_spaced(len(columns_data))):
                     column = Column(
                         title=col_data["title"],
                         order_index=col_data["order_index"],
+                        position=position,
                         board_id=board_id
                     )
                     db.add(column)
                 
                 db.commit()
+                invalidate_boards(board_id)
                 
             finally:
                 db.close()
@@ -247,7 +252,7 @@ class TaskService:
         try:
             db = self._get_db()
             try:
-                stmt = select(Column).where(Column.board_id == board_id).order_by(Column.order_index)
+                stmt = select(Column).where(Column.board_id == board_id).order_by(Column.position, Column.id).limit(1)
                 result = db.execute(stmt)
                 column = result.scalar_one_or_none()
                 
@@ -277,6 +282,7 @@ class TaskService:
                 if task:
                     task.status = status
                     db.commit()
+                    invalidate_boards(task.board_id)
                     logger.info(f"Updated task {task_id} status to {status}")
                     return True
                 
@@ -304,6 +310,7 @@ class TaskService:
                     task.assignee_id = assignee_id
                     task.status = TaskStatus.IN_PROGRESS.value
                     db.commit()
+                    invalidate_boards(task.board_id)
                     logger.info(f"Assigned task {task_id} to user {assignee_id}")
                     return True
                 
@@ -4,10 +4,12 @@ from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import select, func
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, read_session
+from app.crud.tag import tag_crud
 from app.models.user import User, UserRole
 from app.models.order import Order
 from app.models.proposal import Proposal
+from ..utils.user_context import get_cached_user, remember_user, forget_user
 
 logger = logging.getLogger(__name__)
 
@@ -24,16 +26,26 @@ class UserService:
         """Получить подключение к базе данных"""
         return next(get_db())
     
+    def _get_read_db(self) -> Session:
+        """Получить подключение для тяжелых чтений (реплика, если настроена)"""
+        return read_session()
+    
     async def get_user_by_telegram_id(self, telegram_id: int) -> Optional[User]:
         """
-        Получить пользователя по Telegram ID
+        Получить пользователя по Telegram ID.
+        Внутри обработки обновления пользователь загружается из базы один раз.
         """
+        found, user = get_cached_user(telegram_id)
+        if found:
+            return user
+        
         try:
             db = self._get_db()
             try:
                 stmt = select(User).where(User.telegram_id == telegram_id)
                 result = db.execute(stmt)
                 user = result.scalar_one_or_none()
+                remember_user(telegram_id, user)
                 return user
             finally:
                 db.close()
@@ -68,24 +80,37 @@ class UserService:
         """
         Получить или создать пользователя
         """
+        found, user = get_cached_user(telegram_id)
+        if found and user:
+            return user
+        
         try:
             db = self._get_db()
+            # Пользователь используется после закрытия сессии, атрибуты не должны истекать при commit
+            db.expire_on_commit = False
             try:
-                # Проверяем, существует ли пользователь
-                user = await self.get_user_by_telegram_id(telegram_id)
+                # Проверяем, существует ли пользователь (в той же сессии, чтобы сохранить изменения)
+                user = db.execute(select(User).where(User.telegram_id == telegram_id)).scalar_one_or_none()
                 
                 if user:
                     # Обновляем только Telegram-информацию о пользователе
-                    if username:
+                    changed = False
+                    if username and user.telegram_username != username:
                         user.telegram_username = username  # Обновляем только telegram_username
+                        changed = True
                     if first_name and user.first_name != first_name:
                         user.first_name = first_name
+                        changed = True
                     if last_name and user.last_name != last_name:
                         user.last_name = last_name
+                        changed = True
                     
                     # НЕ обновляем основной username пользователя, чтобы сохранить его веб-аккаунт
                     
-                    db.commit()
+                    if changed:
+                        user.updated_at = datetime.utcnow()
+                        db.commit()
+                    remember_user(telegram_id, user)
                     return user
                 
                 # Создаем нового пользователя
@@ -121,7 +146,7 @@ class UserService:
                 
                 db.add(user)
                 db.commit()
-                db.refresh(user)
+                remember_user(telegram_id, user)
                 
                 logger.info(f"Created new user with telegram_id {telegram_id}")
                 return user
@@ -160,6 +185,9 @@ class UserService:
                 user = result.scalar_one_or_none()
                 
                 if user:
+                    forget_user(telegram_id)
+                    if user.telegram_id:
+                        forget_user(user.telegram_id)
                     user.telegram_id = telegram_id
                     db.commit()
                     logger.info(f"Updated telegram_id for user {user_id}")
@@ -253,6 +281,7 @@ class UserService:
                 skills = registration_data.get('skills', [])
                 if skills:
                     user.set_skills_list(skills)
+                    tag_crud.set_user_skills(db, user.id, skills)
                 
                 # Устанавливаем типы уведомлений
                 notification_types = registration_data.get('notification_types', [])
@@ -260,6 +289,7 @@ class UserService:
                     user.set_notification_types_list(notification_types)
                 
                 db.commit()
+                forget_user(telegram_id)
                 logger.info(f"Registration completed for user {telegram_id}")
                 return True
                 
@@ -275,7 +305,7 @@ class UserService:
         Получить топ исполнителей по рейтингу
         """
         try:
-            db = self._get_db()
+            db = self._get_read_db()
             try:
                 stmt = select(User).where(
                     User.role == UserRole.EXECUTOR.value,
@@ -298,7 +328,7 @@ class UserService:
         Получить топ заказчиков по количеству заказов
         """
         try:
-            db = self._get_db()
+            db = self._get_read_db()
             try:
                 # Подзапрос для подсчета заказов каждого заказчика
                 order_count = select(
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Общий HTTP-клиент для запросов бота к API.
+
+Один httpx.AsyncClient на весь процесс бота: пул соединений с keep-alive,
+таймауты, повторы с экспоненциальной задержкой и гистограммы задержек
+по эндпоинтам. Создается в bot/main.py и закрывается при остановке бота.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import settings
+from app.metrics import BOT_API_LATENCY
+
+logger = logging.getLogger(__name__)
+
+# Методы, которые безопасно повторять после отправки запроса
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Ответы, после которых идемпотентный запрос имеет смысл повторить
+RETRY_STATUSES = {502, 503, 504}
+
+# Ошибки, при которых запрос гарантированно не дошел до сервера
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class ApiClient:
+    """
+    Клиент бота к API с пулом соединений, повторами и метриками
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        """Создать пул соединений (повторный вызов ничего не делает)"""
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=f"{settings.api_base_url}/api/v1",
+            limits=httpx.Limits(
+                max_connections=settings.api_max_connections,
+                max_keepalive_connections=settings.api_max_keepalive_connections,
+                keepalive_expiry=settings.api_keepalive_expiry
+            ),
+            timeout=httpx.Timeout(settings.api_timeout, connect=settings.api_connect_timeout)
+        )
+        logger.info(f"HTTP-клиент API создан: {settings.api_base_url}")
+
+    async def close(self):
+        """Закрыть пул соединений"""
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+        logger.info("HTTP-клиент API закрыт")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("HTTP-клиент API не запущен: вызовите api_client.start()")
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        endpoint: Optional[str] = None,
+        retries: Optional[int] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Выполнить запрос к API.
+
+        path - путь относительно /api/v1; endpoint - метка для гистограммы
+        (шаблон пути без идентификаторов, например "/telegram/bind/{code}").
+        Неидемпотентные запросы повторяются только если не были отправлены.
+        """
+        method = method.upper()
+        label = f"{method} {endpoint or path}"
+        attempts = 1 + (settings.api_retries if retries is None else retries)
+        idempotent = method in IDEMPOTENT_METHODS
+
+        for attempt in range(1, attempts + 1):
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                self._observe(label, time.perf_counter() - started, error=True)
+                retryable = isinstance(e, NOT_SENT_ERRORS) or (idempotent and isinstance(e, httpx.TimeoutException))
+                if not retryable or attempt == attempts:
+                    raise
+                logger.warning(f"{label}: {type(e).__name__}, повтор {attempt}/{attempts - 1}")
+            else:
+                self._observe(label, time.perf_counter() - started, error=response.status_code >= 500)
+                if not (idempotent and response.status_code in RETRY_STATUSES) or attempt == attempts:
+                    return response
+                logger.warning(f"{label}: HTTP {response.status_code}, повтор {attempt}/{attempts - 1}")
+
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    def _backoff(self, attempt: int) -> float:
+        """Экспоненциальная задержка с джиттером"""
+        delay = settings.api_retry_backoff * (2 ** (attempt - 1))
+        return delay + random.uniform(0, delay / 2)
+
+    def _observe(self, label: str, seconds: float, error: bool = False):
+        BOT_API_LATENCY.observe(seconds, label, error=error)
+
+    def get_latency_stats(self) -> Dict[str, Dict]:
+        """Снимок гистограмм задержек по эндпоинтам"""
+        return {labels[0]: histogram.snapshot() for labels, histogram in BOT_API_LATENCY.children().items()}
+
+    def log_latency_stats(self):
+        """Вывести сводку задержек в лог"""
+        for label, stats in sorted(self.get_latency_stats().items()):
+            logger.info(
+                f"{label}: {stats['count']} запросов, ошибок {stats['errors']}, "
+                f"p50 ≤ {stats['p50']}s, p95 ≤ {stats['p95']}s, p99 ≤ {stats['p99']}s"
+            )
+
+
+api_client = ApiClient()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+HTTP-сервер метрик бота в формате Prometheus (GET /metrics).
+Работает в том же цикле событий, что и бот; включается настройкой BOT_METRICS_PORT.
+"""
+import logging
+from typing import Optional
+
+from aiohttp import web
+
+from app.config import settings
+from app.metrics import CONTENT_TYPE, metrics_authorized, registry
+
+logger = logging.getLogger(__name__)
+
+
+async def _metrics_handler(request: web.Request) -> web.Response:
+    if not metrics_authorized(request.headers.get("Authorization")):
+        return web.Response(status=401)
+    return web.Response(body=registry.render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+
+class MetricsServer:
+    """
+    Сервер метрик с явным запуском и остановкой
+    """
+
+    def __init__(self, port: int):
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", _metrics_handler)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, settings.host, self.port).start()
+        logger.info(f"Метрики бота доступны на порту {self.port}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Ограничитель частоты исходящих запросов к Telegram
+"""
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket: не более `rate` операций в секунду с допустимым всплеском `burst`
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Дождаться свободного слота
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def pause(self, seconds: float):
+        """
+        Приостановить выдачу слотов (например, после ответа 429 от Telegram)
+        """
+        async with self._lock:
+            await asyncio.sleep(seconds)
+            self._tokens = 0
+            self._updated_at = time.monotonic()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Контекст пользователя в рамках одного обновления Telegram.
+
+AuthMiddleware открывает область на время обработки обновления, а UserService
+складывает в нее загруженных пользователей (identity map по telegram_id).
+Повторные обращения к пользователю внутри обновления не ходят в базу.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from app.metrics import CACHE_REQUESTS
+from app.models.user import User
+
+_users: ContextVar[Optional[Dict[int, Optional[User]]]] = ContextVar("bot_users", default=None)
+
+
+@contextmanager
+def user_scope():
+    """
+    Область одного обновления: пользователи, загруженные внутри, переиспользуются
+    """
+    token = _users.set({})
+    try:
+        yield
+    finally:
+        _users.reset(token)
+
+
+def get_cached_user(telegram_id: int) -> Tuple[bool, Optional[User]]:
+    """
+    Вернуть (найден ли в текущей области, пользователь).
+    Вне области всегда (False, None).
+    """
+    users = _users.get()
+    if users is None:
+        return False, None
+    if telegram_id not in users:
+        CACHE_REQUESTS.inc("bot_user", "miss")
+        return False, None
+    CACHE_REQUESTS.inc("bot_user", "hit")
+    return True, users[telegram_id]
+
+
+def remember_user(telegram_id: int, user: Optional[User]):
+    """Запомнить результат загрузки (в том числе отсутствие пользователя)"""
+    users = _users.get()
+    if users is not None:
+        users[telegram_id] = user
+
+
+def forget_user(telegram_id: int):
+    """Сбросить пользователя после изменения, чтобы следующее обращение перечитало его"""
+    users = _users.get()
+    if users is not None:
+        users.pop(telegram_id, None)
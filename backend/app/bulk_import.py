@@ -0,0 +1,250 @@
+"""
+Массовый импорт задач и заказов из CSV и NDJSON.
+
+Файл читается и проверяется построчно, строки загружаются пачками по
+settings.import_batch_size: в PostgreSQL - через COPY (id пачки заранее берутся
+из последовательности, чтобы привязать теги), в остальных базах - одним
+executemany INSERT ... RETURNING. Теги пачки нормализуются одним вызовом
+TagCRUD, ранги задач в колонке выдаются подряд после последней задачи.
+
+Ошибочные строки (невалидные поля, неизвестная колонка или исполнитель)
+пропускаются и возвращаются в отчете с номером строки; остальные загружаются
+в одной транзакции. dry_run - полная проверка (включая загрузку) с откатом в конце.
+"""
+import codecs
+import csv
+import json
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.cache import invalidate_boards
+from app.crud.copy import copy_rows
+from app.crud.rank import ranks_between
+from app.crud.tag import tag_crud, split_tags
+from app.export import ExportFormat
+from app.models.column import Column
+from app.models.order import Order, OrderPriority, OrderStatus
+from app.models.task import Task
+from app.models.task_status import TaskStatusEnum
+from app.models.task_type import TaskTypeEnum
+from app.models.user import User
+from app.schemas.order import OrderCreate
+from app.schemas.task import TaskImportRow
+
+ImportFormat = ExportFormat
+
+
+class _Report:
+    """Счетчики импорта и первые settings.import_max_errors ошибок"""
+
+    def __init__(self):
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def error(self, row: int, detail: str):
+        self.failed += 1
+        if len(self.errors) < settings.import_max_errors:
+            self.errors.append({"row": row, "detail": detail})
+
+    def as_dict(self, dry_run: bool) -> dict:
+        errors = sorted(self.errors, key=lambda error: error["row"])
+        return {"imported": self.imported, "failed": self.failed, "errors": errors, "dry_run": dry_run}
+
+
+def read_rows(stream: BinaryIO, fmt: ImportFormat) -> Iterator[Tuple[int, Any]]:
+    """
+    Строки файла по одной: (номер строки данных, словарь) или (номер, текст ошибки).
+    Пустые ячейки CSV считаются отсутствующими полями.
+    """
+    text_stream = codecs.getreader("utf-8-sig")(stream)
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(text_stream), start=1):
+            if None in row:
+                yield number, "More values than columns in the header"
+                continue
+            yield number, {key.strip(): value for key, value in row.items() if key and value not in (None, "")}
+        return
+    number = 0
+    for line in text_stream:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(data, dict):
+            yield number, "Each line must be a JSON object"
+            continue
+        yield number, data
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, item['loc'])) or 'row'}: {item['msg']}" for item in error.errors())
+
+
+def _batches(rows: Iterator[Tuple[int, Any]], validate: Callable[[dict], Any], report: _Report) -> Iterator[List[Tuple[int, Any]]]:
+    """Проверенные строки пачками; ошибки проверки сразу попадают в отчет"""
+    batch = []
+    for number, data in rows:
+        if isinstance(data, str):
+            report.error(number, data)
+            continue
+        try:
+            batch.append((number, validate(data)))
+        except ValidationError as e:
+            report.error(number, _validation_detail(e))
+        except ValueError as e:
+            report.error(number, str(e))
+        if len(batch) >= settings.import_batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _reserve_ids(db: Session, table, count: int) -> List[int]:
+    """count значений последовательности первичного ключа одним запросом"""
+    return list(db.execute(
+        text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :count)"),
+        {"table": table.name, "count": count}
+    ).scalars())
+
+
+def _load(db: Session, table, rows: List[Dict[str, Any]]) -> List[int]:
+    """Загрузить строки таблицы; возвращает их id в порядке rows"""
+    if db.get_bind().dialect.name != "postgresql":
+        return list(db.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows).scalars())
+    ids = _reserve_ids(db, table, len(rows))
+    copy_rows(db, table, [{"id": item_id, **row} for item_id, row in zip(ids, rows)])
+    return ids
+
+
+def _finish(db: Session, report: _Report, dry_run: bool) -> dict:
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    return report.as_dict(dry_run)
+
+
+def _column_key(title: str) -> str:
+    return " ".join(title.lower().split())
+
+
+def _existing_users(db: Session, user_ids) -> set:
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return set()
+    return set(db.execute(select(User.id).where(User.id.in_(user_ids))).scalars())
+
+
+def import_tasks(db: Session, stream: BinaryIO, fmt: ImportFormat, board_id: int, creator_id: int, dry_run: bool = False) -> dict:
+    """
+    Импорт задач в доску board_id. Колонка строки - column (название, без учета
+    регистра) или column_id этой доски; без колонки задача попадает в задачи
+    без колонки, как при POST /tasks/. Права на доску проверяет вызывающий код.
+    """
+    report = _Report()
+    columns = db.execute(select(Column.id, Column.title).where(Column.board_id == board_id)).all()
+    column_by_title = {_column_key(title): column_id for column_id, title in columns}
+    column_ids = {column_id for column_id, _ in columns}
+    # Последний ранг в каждой колонке: импортированные задачи встают в конец
+    last_rank = dict(db.execute(
+        select(Task.column_id, func.max(Task.position)).where(Task.board_id == board_id).group_by(Task.column_id)
+    ).all())
+
+    def validate(data: dict) -> TaskImportRow:
+        row = TaskImportRow.model_validate(data)
+        if row.column is not None:
+            column_id = column_by_title.get(_column_key(row.column))
+            if column_id is None:
+                raise ValueError(f"Column '{row.column}' not found on the board")
+            row.column_id = column_id
+        elif row.column_id is not None and row.column_id not in column_ids:
+            raise ValueError(f"Column {row.column_id} not found on the board")
+        return row
+
+    try:
+        for batch in _batches(read_rows(stream, fmt), validate, report):
+            users = _existing_users(db, (row.assigned_to_id for _, row in batch))
+            valid = []
+            for number, row in batch:
+                if row.assigned_to_id is not None and row.assigned_to_id not in users:
+                    report.error(number, f"User {row.assigned_to_id} not found")
+                else:
+                    valid.append(row)
+            if not valid:
+                continue
+
+            ranks: Dict[Optional[int], Iterator[str]] = {}
+            for column_id in {row.column_id for row in valid}:
+                count = sum(1 for row in valid if row.column_id == column_id)
+                column_ranks = ranks_between(last_rank.get(column_id), None, count)
+                last_rank[column_id] = column_ranks[-1]
+                ranks[column_id] = iter(column_ranks)
+
+            ids = _load(db, Task.__table__, [
+                {
+                    "title": row.title,
+                    "description": row.description,
+                    "status": TaskStatusEnum.TODO.value,
+                    "type": TaskTypeEnum.TASK.value,
+                    "priority": row.priority,
+                    "budget": row.budget,
+                    "due_date": row.due_date,
+                    "tags": ','.join(row.tags) if row.tags else None,
+                    "board_id": board_id,
+                    "column_id": row.column_id,
+                    "assignee_id": row.assigned_to_id,
+                    "creator_id": creator_id,
+                    "position": next(ranks[row.column_id])
+                }
+                for row in valid
+            ])
+            tag_crud.set_task_tags_bulk(db, {task_id: row.tags for task_id, row in zip(ids, valid) if row.tags}, new_tasks=True)
+            report.imported += len(ids)
+    except DBAPIError as e:
+        db.rollback()
+        raise ValueError(f"Import failed: {e.orig}")
+
+    result = _finish(db, report, dry_run)
+    if report.imported and not dry_run:
+        invalidate_boards(board_id)
+    return result
+
+
+def import_orders(db: Session, stream: BinaryIO, fmt: ImportFormat, creator_id: int, dry_run: bool = False) -> dict:
+    """Импорт заказов от имени creator_id; поля и проверки - как у POST /orders/"""
+    report = _Report()
+    try:
+        for batch in _batches(read_rows(stream, fmt), OrderCreate.model_validate, report):
+            rows = [order for _, order in batch]
+            tags = [','.join(split_tags(order.tags)) or None for order in rows]
+            ids = _load(db, Order.__table__, [
+                {
+                    "title": order.title,
+                    "description": order.description,
+                    "budget": order.budget,
+                    "deadline": order.deadline,
+                    "priority": (order.priority or OrderPriority.MEDIUM).value,
+                    "status": OrderStatus.OPEN.value,
+                    "tags": order_tags,
+                    "creator_id": creator_id
+                }
+                for order, order_tags in zip(rows, tags)
+            ])
+            tag_crud.set_order_tags_bulk(db, {order_id: order_tags for order_id, order_tags in zip(ids, tags) if order_tags}, new_orders=True)
+            report.imported += len(ids)
+    except DBAPIError as e:
+        db.rollback()
+        raise ValueError(f"Import failed: {e.orig}")
+
+    return _finish(db, report, dry_run)
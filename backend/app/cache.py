@@ -0,0 +1,298 @@
+"""
+Кэш снимков для частых чтений с явной инвалидацией при записи.
+
+Снимок доски (GET /boards/{id}) и страницы списка публичных досок хранятся
+как PrecompressedJSON (app/compression.py): повторное чтение не обращается к
+базе за задачами и колонками, не сериализует и не сжимает ответ.
+
+Хранилище подключаемое (settings.cache_backend):
+- memory - LRU-словарь в памяти процесса. Каждый воркер и бот видят только свои
+  записи, поэтому запись из другого процесса видна после истечения TTL;
+- redis - общий кэш для всех воркеров API и бота (settings.redis_url).
+
+Инвалидация - через поколения: у каждой области (доска, список публичных досок)
+есть метка поколения, ключи записей включают ее. invalidate() меняет метку после
+commit, и прежние записи больше не читаются - в том числе снимок, который
+параллельный запрос собрал из данных до commit и сохранил уже после инвалидации.
+Метки хранятся без срока жизни; если метку вытеснили, область получает новую
+случайную метку, а не значение по умолчанию, и старые записи не воскресают.
+
+При промахе снимок собирает один запрос (single-flight): остальные ждут его
+результат, а не идут в базу одновременно, когда популярная доска истекает.
+"""
+import logging
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.config import settings
+from app.metrics import CACHE_REQUESTS
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - зависит от окружения
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Интервал опроса, пока снимок собирает запрос из другого процесса
+LOCK_POLL_SECONDS = 0.05
+
+
+def _expires_at(ttl: Optional[float]) -> float:
+    return time.monotonic() + ttl if ttl is not None else float("inf")
+
+
+class MemoryBackend:
+    """LRU-словарь с временем жизни записей, безопасный для потоков пула FastAPI"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float]):
+        """ttl None - без срока жизни (запись может только вытесниться)"""
+        with self._lock:
+            self._entries[key] = (_expires_at(ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add(self, key: str, value: Any, ttl: Optional[float]) -> bool:
+        """Записать, только если ключа нет (блокировка single-flight)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                return False
+            self._entries[key] = (_expires_at(ttl), value)
+            return True
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def release(self, key: str, value: Any):
+        """Удалить ключ, только если в нем value (снять свою блокировку, не чужую)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == value:
+                del self._entries[key]
+
+
+def _milliseconds(ttl: Optional[float]) -> Optional[int]:
+    return int(ttl * 1000) if ttl is not None else None
+
+
+# Удаление ключа, только если значение совпадает (атомарно на стороне Redis)
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisBackend:
+    """
+    Общий кэш в Redis. Ошибки Redis не ломают чтение: запись считается
+    отсутствующей, и ответ собирается из базы.
+    """
+
+    def __init__(self, url: str):
+        self._client = redis.Redis.from_url(url, socket_timeout=settings.cache_timeout, socket_connect_timeout=settings.cache_timeout)
+        self._release = self._client.register_script(RELEASE_SCRIPT)
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            data = self._client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Cache get failed for {key}: {e}")
+            return None
+        return pickle.loads(data) if data is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float]):
+        try:
+            self._client.set(key, pickle.dumps(value), px=_milliseconds(ttl))
+        except redis.RedisError as e:
+            logger.warning(f"Cache set failed for {key}: {e}")
+
+    def add(self, key: str, value: Any, ttl: Optional[float]) -> bool:
+        try:
+            return bool(self._client.set(key, pickle.dumps(value), px=_milliseconds(ttl), nx=True))
+        except redis.RedisError as e:
+            # Без Redis каждый процесс собирает снимок сам
+            logger.warning(f"Cache lock failed for {key}: {e}")
+            return True
+
+    def delete(self, key: str):
+        try:
+            self._client.delete(key)
+        except redis.RedisError as e:
+            logger.warning(f"Cache delete failed for {key}: {e}")
+
+    def release(self, key: str, value: Any):
+        try:
+            self._release(keys=[key], args=[pickle.dumps(value)])
+        except redis.RedisError as e:
+            # Блокировка истечет сама через settings.cache_lock_timeout
+            logger.warning(f"Cache lock release failed for {key}: {e}")
+
+
+def create_backend():
+    if settings.cache_backend == "redis":
+        if redis is None:
+            logger.warning("CACHE_BACKEND=redis, but redis is not installed; using in-process cache")
+        else:
+            return RedisBackend(settings.redis_url)
+    return MemoryBackend(settings.board_snapshot_max_entries)
+
+
+class _Flight:
+    """Сборка снимка, которую ждут остальные запросы того же ключа в процессе"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.ok = False
+        self.value = None
+
+
+class SnapshotCache:
+    """
+    Снимки, сгруппированные по областям инвалидации. scope - то, что меняется
+    записью (id доски), variant - вариант ответа внутри области (страница списка).
+    """
+
+    def __init__(self, name: str, backend, ttl: float):
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl
+        self._flights: Dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+
+    def _generation_key(self, scope: Hashable) -> str:
+        return f"{self.name}:{scope}:generation"
+
+    def _generation(self, scope: Hashable) -> str:
+        """
+        Метка поколения области. Отсутствующая метка (новая область или вытесненная
+        запись) заменяется новой случайной: записи прежних меток больше не читаются.
+        """
+        key = self._generation_key(scope)
+        generation = self.backend.get(key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not self.backend.add(key, generation, None):
+                generation = self.backend.get(key) or generation
+        return generation
+
+    def _key(self, scope: Hashable, variant: Hashable) -> str:
+        return f"{self.name}:{scope}:{self._generation(scope)}:{variant}"
+
+    def get_or_load(self, scope: Hashable, loader: Callable[[], Any], variant: Hashable = "") -> Any:
+        """Снимок из кэша; при промахе его собирает loader (один на ключ одновременно)"""
+        if self.ttl <= 0:
+            return loader()
+        key = self._key(scope, variant)
+        value = self.backend.get(key)
+        if value is not None:
+            CACHE_REQUESTS.inc(self.name, "hit")
+            return value
+
+        # Внутри процесса снимок собирает первый запрос, остальные ждут его результат
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait(settings.cache_lock_timeout)
+            if flight.ok:
+                CACHE_REQUESTS.inc(self.name, "wait")
+                return flight.value
+            # Первый запрос завершился ошибкой или слишком долго - собираем сами
+            return loader()
+
+        try:
+            flight.value = self._load(key, loader)
+            flight.ok = True
+            return flight.value
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Собрать снимок; между процессами (общий backend) - тоже один на ключ"""
+        lock_key = f"{key}:lock"
+        # Значение блокировки - метка владельца: снимается только своя блокировка
+        token = uuid.uuid4().hex
+        if not self.backend.add(lock_key, token, settings.cache_lock_timeout):
+            value = self._wait(key, lock_key, token)
+            if value is not None:
+                CACHE_REQUESTS.inc(self.name, "wait")
+                return value
+        try:
+            CACHE_REQUESTS.inc(self.name, "miss")
+            value = loader()
+            self.backend.set(key, value, self.ttl)
+        finally:
+            self.backend.release(lock_key, token)
+        return value
+
+    def _wait(self, key: str, lock_key: str, token: str) -> Optional[Any]:
+        """
+        Дождаться снимка, который собирает другой процесс; None - не дождались
+        (блокировка могла перейти к этому запросу с меткой token)
+        """
+        deadline = time.monotonic() + settings.cache_lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_SECONDS)
+            value = self.backend.get(key)
+            if value is not None:
+                return value
+            if self.backend.add(lock_key, token, settings.cache_lock_timeout):
+                # Собиравший запрос завершился без результата - собираем сами
+                return None
+        return None
+
+    def invalidate(self, *scopes: Hashable):
+        """
+        Сделать снимки областей недействительными. Вызывается после commit.
+        Метка поколения хранится без срока жизни: истекшая метка вернула бы
+        области прежнее поколение вместе с записями, сохраненными под ним.
+        """
+        if self.ttl <= 0:
+            return
+        for scope in scopes:
+            self.backend.set(self._generation_key(scope), uuid.uuid4().hex, None)
+
+
+_backend = create_backend()
+
+# Снимки GET /boards/{id}: задачи и колонки доски, уже сериализованные и сжатые
+board_snapshots = SnapshotCache("board_snapshot", _backend, settings.board_snapshot_ttl_seconds)
+
+# Страницы GET /boards/public; область одна - "public"
+public_boards = SnapshotCache("public_boards", _backend, settings.board_snapshot_ttl_seconds)
+
+
+def invalidate_boards(*board_ids: Optional[int], public: bool = False):
+    """Сбросить снимки досок (и список публичных досок) после изменения"""
+    board_snapshots.invalidate(*{board_id for board_id in board_ids if board_id is not None})
+    if public:
+        public_boards.invalidate("public")
@@ -0,0 +1,242 @@
+"""
+Сжатие HTTP-ответов (gzip, brotli, zstd) по заголовку Accept-Encoding.
+
+CompressionMiddleware сжимает текстовые ответы (JSON, NDJSON, CSV) от
+settings.compression_min_size байт: короткие ответы сжатие только замедляет.
+Потоковые ответы сжимаются по частям и сбрасываются клиенту блоками.
+
+Для снимков, которые отдаются многократно (доска целиком), PrecompressedJSON
+хранит сериализованное тело и сжатые варианты: каждый кодек применяется к
+снимку один раз, повторные ответы не сериализуются и не сжимаются заново.
+
+brotli и zstd - необязательные зависимости: без модуля кодек просто не предлагается.
+"""
+import gzip
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - зависит от окружения
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - зависит от окружения
+    zstandard = None
+
+# Уровни для ответов "на лету" - быстрые; снимки сжимаются один раз, поэтому сильнее
+STREAM_LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+SNAPSHOT_LEVELS = {"zstd": 12, "br": 9, "gzip": 9}
+
+# Сколько исходных байт потокового ответа копится в компрессоре до сброса клиенту
+STREAM_FLUSH_BYTES = 64 * 1024
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "text/", "image/svg+xml")
+
+_MODULES = {"zstd": zstandard, "br": brotli, "gzip": gzip}
+
+
+def supported_encodings() -> list:
+    """Кодеки из настроек в порядке предпочтения сервера, для которых установлен модуль"""
+    names = [name.strip() for name in settings.compression_encodings.split(",") if name.strip()]
+    return [name for name in names if _MODULES.get(name) is not None]
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Выбрать кодек по Accept-Encoding (с учетом q и "*"). При равных q побеждает
+    порядок сервера. None - клиент не принимает ни один поддерживаемый кодек.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, levels: Dict[str, int] = STREAM_LEVELS) -> bytes:
+    level = levels[encoding]
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+
+class _StreamCompressor:
+    """
+    Потоковое сжатие. Сжатые данные сбрасываются клиенту каждые STREAM_FLUSH_BYTES
+    исходных байт: мелкие части (строки экспорта) сжимаются вместе, а не по одной.
+    """
+
+    def __init__(self, encoding: str):
+        level = STREAM_LEVELS[encoding]
+        self.encoding = encoding
+        self._pending = 0
+        if encoding == "gzip":
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            out = self._compressor.process(data)
+        else:
+            out = self._compressor.compress(data)
+        self._pending += len(data)
+        if self._pending < STREAM_FLUSH_BYTES:
+            return out
+        self._pending = 0
+        if self.encoding == "gzip":
+            return out + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return out + self._compressor.flush()
+        return out + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    ASGI-middleware сжатия ответов. Ответы с уже заданным Content-Encoding
+    (PrecompressedJSON) пропускаются как есть.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        buffer = b""
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, buffer, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                passthrough = not _compressible(Headers(raw=message["headers"]))
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                # Тело может прийти частями (в том числе через BaseHTTPMiddleware):
+                # копим до порога, чтобы решить, стоит ли сжимать
+                buffer += message.get("body", b"")
+                if more_body and len(buffer) < settings.compression_min_size:
+                    return
+                headers = MutableHeaders(raw=start["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body:
+                    if len(buffer) >= settings.compression_min_size:
+                        buffer = compress(buffer, encoding)
+                        headers["Content-Encoding"] = encoding
+                        headers["Content-Length"] = str(len(buffer))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": buffer})
+                    return
+                # Длинный потоковый ответ: сжимаем по частям, длина заранее неизвестна
+                compressor = _StreamCompressor(encoding)
+                headers["Content-Encoding"] = encoding
+                del headers["Content-Length"]
+                await send(start)
+                body, buffer = buffer, b""
+            else:
+                body = message.get("body", b"")
+
+            data = compressor.chunk(body) if body else b""
+            if not more_body:
+                data += compressor.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class PrecompressedJSON:
+    """
+    Сериализованный JSON-снимок и его сжатые варианты (считаются лениво, по разу на кодек).
+    Хранится в кэше целиком, поэтому повторная отдача не требует ни сериализации, ни сжатия.
+    При сериализации (pickle для Redis) заранее сжимается всеми кодеками.
+    """
+
+    media_type = "application/json; charset=utf-8"
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compress(self.body, encoding, SNAPSHOT_LEVELS)
+        return self._encoded[encoding]
+
+    def encode_all(self) -> "PrecompressedJSON":
+        """Сжать всеми поддерживаемыми кодеками (тела короче порога не сжимаются)"""
+        if len(self.body) >= settings.compression_min_size:
+            for encoding in supported_encodings():
+                self.encoded(encoding)
+        return self
+
+    def __getstate__(self):
+        # Снимок в общем кэше (Redis) сохраняется вместе со сжатыми вариантами:
+        # иначе каждое чтение из Redis сжимало бы тело заново
+        self.encode_all()
+        return self.__dict__
+
+    def response(self, accept_encoding: Optional[str], status_code: int = 200) -> Response:
+        encoding = negotiate(accept_encoding) if len(self.body) >= settings.compression_min_size else None
+        response = Response(
+            content=self.encoded(encoding) if encoding else self.body,
+            status_code=status_code,
+            media_type=self.media_type
+        )
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.headers.add_vary_header("Accept-Encoding")
+        return response
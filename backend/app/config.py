@@ -8,6 +8,65 @@ load_dotenv()
 class Settings(BaseSettings):
     # Database
     database_url: str = os.getenv("DATABASE_URL", "")
+    database_replica_urls: str = os.getenv("DATABASE_REPLICA_URLS", "")  # через запятую
+    replica_max_lag_seconds: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    replica_lag_check_seconds: float = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
+    read_your_writes_seconds: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+    
+    # Пул соединений (задается отдельно для каждого процесса: API и бот)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # секунд ожидания свободного соединения
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "300"))  # секунд жизни соединения
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    db_pool_use_lifo: bool = os.getenv("DB_POOL_USE_LIFO", "False").lower() == "true"
+    
+    # Профилирование SQL по запросам (счетчик запросов, Server-Timing, поиск N+1)
+    sql_profiling: bool = os.getenv("SQL_PROFILING", "False").lower() == "true"
+    sql_repeat_warn_threshold: int = int(os.getenv("SQL_REPEAT_WARN_THRESHOLD", "5"))
+    
+    # Журнал медленных запросов (0 - выключен) и доля SELECT, для которых снимается EXPLAIN ANALYZE
+    slow_query_ms: float = float(os.getenv("SLOW_QUERY_MS", "500"))
+    slow_query_log_size: int = int(os.getenv("SLOW_QUERY_LOG_SIZE", "200"))
+    slow_query_explain_sample: float = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE", "0"))
+    slow_query_explain_timeout_ms: int = int(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "10000"))
+    
+    # Миграции: DDL не ждет блокировку дольше таймаута, заполнение данных идет пачками
+    migration_lock_timeout_ms: int = int(os.getenv("MIGRATION_LOCK_TIMEOUT_MS", "5000"))
+    migration_batch_size: int = int(os.getenv("MIGRATION_BATCH_SIZE", "5000"))
+    
+    # Ранги порядка карточек: колонки с рангами длиннее порога перебалансируются ночной задачей
+    rank_rebalance_length: int = int(os.getenv("RANK_REBALANCE_LENGTH", "24"))
+    
+    # Сжатие ответов: кодеки в порядке предпочтения и минимальный размер тела в байтах
+    compression_encodings: str = os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip")
+    compression_min_size: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    
+    # Кэш снимков досок и списка публичных досок: memory (в процессе) или redis (общий).
+    # Запись сбрасывает снимки сразу; TTL ограничивает устаревание при записи из
+    # другого процесса с memory-кэшем. TTL 0 - без кэша
+    cache_backend: str = os.getenv("CACHE_BACKEND", "memory")
+    redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    cache_timeout: float = float(os.getenv("CACHE_TIMEOUT", "0.5"))  # секунд
+    cache_lock_timeout: float = float(os.getenv("CACHE_LOCK_TIMEOUT", "5"))  # секунд
+    board_snapshot_ttl_seconds: float = float(os.getenv("BOARD_SNAPSHOT_TTL_SECONDS", "2"))
+    board_snapshot_max_entries: int = int(os.getenv("BOARD_SNAPSHOT_MAX_ENTRIES", "1000"))
+    
+    # Потоковая выгрузка CSV/NDJSON: строк в одной пачке курсора
+    export_batch_size: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    
+    # Массовый импорт: строк в пачке COPY и сколько ошибок строк возвращать в отчете
+    import_batch_size: int = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+    import_max_errors: int = int(os.getenv("IMPORT_MAX_ERRORS", "100"))
+    
+    # Архив сообщений: через сколько дней сообщения закрытых заказов уходят из
+    # горячей таблицы и сколько строк переносится одной транзакцией (0 дней - не переносить)
+    message_archive_after_days: int = int(os.getenv("MESSAGE_ARCHIVE_AFTER_DAYS", "90"))
+    message_archive_batch_size: int = int(os.getenv("MESSAGE_ARCHIVE_BATCH_SIZE", "1000"))
+    
+    # Метрики Prometheus: токен для /metrics (пустой - без авторизации) и порт метрик бота (0 - выключено)
+    metrics_token: str = os.getenv("METRICS_TOKEN", "")
+    bot_metrics_port: int = int(os.getenv("BOT_METRICS_PORT", "0"))
     test_database_url: str = os.getenv("TEST_DATABASE_URL", "")
     
     # Security
@@ -22,10 +81,34 @@ class Settings(BaseSettings):
     
     # API Base URL for internal requests
     api_base_url: str = os.getenv("API_BASE_URL", "http://localhost:8000")
+    api_max_connections: int = int(os.getenv("API_MAX_CONNECTIONS", "100"))
+    api_max_keepalive_connections: int = int(os.getenv("API_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    api_keepalive_expiry: float = float(os.getenv("API_KEEPALIVE_EXPIRY", "30"))  # секунд
+    api_timeout: float = float(os.getenv("API_TIMEOUT", "10"))  # секунд
+    api_connect_timeout: float = float(os.getenv("API_CONNECT_TIMEOUT", "3"))  # секунд
+    api_retries: int = int(os.getenv("API_RETRIES", "3"))
+    api_retry_backoff: float = float(os.getenv("API_RETRY_BACKOFF", "0.2"))  # секунд, удваивается
+    
+    # Рассылки
+    broadcast_rate_limit: float = float(os.getenv("BROADCAST_RATE_LIMIT", "25"))  # сообщений в секунду
+    broadcast_batch_size: int = int(os.getenv("BROADCAST_BATCH_SIZE", "500"))
+    
+    # Подбор исполнителей для новых заказов
+    matching_top_k: int = int(os.getenv("MATCHING_TOP_K", "20"))
+    matching_timeout_ms: int = int(os.getenv("MATCHING_TIMEOUT_MS", "200"))
+    matching_interval_seconds: int = int(os.getenv("MATCHING_INTERVAL_SECONDS", "30"))
+    matching_window_minutes: int = int(os.getenv("MATCHING_WINDOW_MINUTES", "60"))
+    
+    # Полнотекстовый поиск
+    search_timeout_ms: int = int(os.getenv("SEARCH_TIMEOUT_MS", "1000"))
     
     # CORS
     allowed_origins: List[str] = ["http://localhost:3000"]
     
+    @property
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+    
     @property
     def cors_origins(self) -> List[str]:
         origins_str = os.getenv("ALLOWED_ORIGINS")
@@ -5,6 +5,9 @@ from .column import column_crud
 from .order import order_crud
 from .proposal import proposal_crud
 from .message import message_crud
+from .tag import tag_crud
+from .matching import matching_crud
+from .search import search_crud
 
 __all__ = [
     "user_crud", 
@@ -13,5 +16,8 @@ __all__ = [
     "column_crud", 
     "order_crud", 
     "proposal_crud", 
-    "message_crud"
+    "message_crud",
+    "tag_crud",
+    "matching_crud",
+    "search_crud"
 ] 
\ No newline at end of file
@@ -1,21 +1,30 @@
 from sqlalchemy.orm import Session
 from app.models.board import Board
 from app.schemas.board import BoardCreate, BoardUpdate
+from app.crud.fields import FieldSelection
+from app.cache import invalidate_boards
 from typing import Optional, List
 
 class BoardCRUD:
+    def _with_fields(self, query, fields: Optional[FieldSelection]):
+        """Загрузить только поля, выбранные в ?fields= (без выбора - все)"""
+        return fields.apply(query, Board) if fields else query
+    
     def get_by_id(self, db: Session, board_id: int) -> Optional[Board]:
         return db.query(Board).filter(Board.id == board_id).first()
     
+    def get_by_ids(self, db: Session, board_ids: List[int]) -> List[Board]:
+        return db.query(Board).filter(Board.id.in_(board_ids)).all()
+    
     def get_by_id_including_deleted(self, db: Session, board_id: int) -> Optional[Board]:
         """Получить доску по ID, включая удаленные (для админов)"""
         return db.query(Board).filter(Board.id == board_id).first()
     
-    def get_by_owner(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> List[Board]:
-        return db.query(Board).filter(Board.creator_id == owner_id, Board.is_active == True).offset(skip).limit(limit).all()
+    def get_by_owner(self, db: Session, owner_id: int, skip: int = 0, limit: int = 100, fields: Optional[FieldSelection] = None) -> List[Board]:
+        return self._with_fields(db.query(Board).filter(Board.creator_id == owner_id, Board.is_active == True), fields).offset(skip).limit(limit).all()
     
-    def get_public_boards(self, db: Session, skip: int = 0, limit: int = 100) -> List[Board]:
-        return db.query(Board).filter(Board.is_public == True, Board.is_active == True).offset(skip).limit(limit).all()
+    def get_public_boards(self, db: Session, skip: int = 0, limit: int = 100, fields: Optional[FieldSelection] = None) -> List[Board]:
+        return self._with_fields(db.query(Board).filter(Board.is_public == True, Board.is_active == True), fields).offset(skip).limit(limit).all()
     
     def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Board]:
         return db.query(Board).filter(Board.is_active == True).offset(skip).limit(limit).all()
@@ -38,6 +47,7 @@ class BoardCRUD:
         db.add(db_board)
         db.commit()
         db.refresh(db_board)
+        invalidate_boards(public=db_board.is_public)
         return db_board
     
     def update(self, db: Session, board_id: int, board_update: BoardUpdate) -> Optional[Board]:
@@ -45,12 +55,14 @@ class BoardCRUD:
         if not db_board:
             return None
         
+        was_public = db_board.is_public
         update_data = board_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_board, field, value)
         
         db.commit()
         db.refresh(db_board)
+        invalidate_boards(board_id, public=was_public or db_board.is_public)
         return db_board
     
     def delete(self, db: Session, board_id: int) -> bool:
@@ -61,6 +73,7 @@ class BoardCRUD:
         # Мягкое удаление - делаем доску неактивной
         db_board.is_active = False
         db.commit()
+        invalidate_boards(board_id, public=db_board.is_public)
         return True
     
     def restore(self, db: Session, board_id: int) -> bool:
@@ -72,6 +85,7 @@ class BoardCRUD:
         # Восстанавливаем доску - делаем активной
         db_board.is_active = True
         db.commit()
+        invalidate_boards(board_id, public=db_board.is_public)
         return True
     
     def delete_permanently(self, db: Session, board_id: int) -> bool:
@@ -81,8 +95,10 @@ class BoardCRUD:
             return False
         
         # Полное удаление - удаляем из базы данных
+        is_public = db_board.is_public
         db.delete(db_board)
         db.commit()
+        invalidate_boards(board_id, public=is_public)
         return True
     
     def check_owner(self, db: Session, board_id: int, user_id: int) -> bool:
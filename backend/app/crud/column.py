@@ -1,6 +1,12 @@
+from sqlalchemy import func, select, update, values, Integer, String
+from sqlalchemy import column as sql_column
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.models.board import Board
 from app.models.column import Column
 from app.schemas.column import ColumnCreate, ColumnUpdate
+from app.crud.rank import position_in
+from app.cache import invalidate_boards
 from typing import Optional, List
 
 class ColumnCRUD:
@@ -8,23 +14,25 @@ class ColumnCRUD:
         return db.query(Column).filter(Column.id == column_id).first()
     
     def get_by_board(self, db: Session, board_id: int, skip: int = 0, limit: int = 100) -> List[Column]:
-        return db.query(Column).filter(Column.board_id == board_id).order_by(Column.order_index).offset(skip).limit(limit).all()
+        return db.query(Column).filter(Column.board_id == board_id).order_by(Column.position, Column.id).offset(skip).limit(limit).all()
     
     def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Column]:
         return db.query(Column).order_by(Column.order_index).offset(skip).limit(limit).all()
     
     def create(self, db: Session, column: ColumnCreate, board_id: int) -> Column:
         # Получаем максимальный order_index для доски
-        max_order = db.query(Column).filter(Column.board_id == board_id).with_entities(db.func.max(Column.order_index)).scalar() or 0
+        max_order = db.query(func.max(Column.order_index)).filter(Column.board_id == board_id).scalar() or 0
         
         db_column = Column(
             title=column.title,
             order_index=max_order + 1,
+            position=position_in(db, Column, [Column.board_id == board_id]),
             board_id=board_id
         )
         db.add(db_column)
         db.commit()
         db.refresh(db_column)
+        invalidate_boards(board_id)
         return db_column
     
     def update(self, db: Session, column_id: int, column_update: ColumnUpdate) -> Optional[Column]:
@@ -36,8 +44,14 @@ class ColumnCRUD:
         for field, value in update_data.items():
             setattr(db_column, field, value)
         
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # Уникальность названия и order_index на доске проверяется при commit
+            db.rollback()
+            raise ValueError("Column title and order_index must be unique within the board")
         db.refresh(db_column)
+        invalidate_boards(db_column.board_id)
         return db_column
     
     def delete(self, db: Session, column_id: int) -> bool:
@@ -45,26 +59,80 @@ class ColumnCRUD:
         if not db_column:
             return False
         
+        board_id = db_column.board_id
         db.delete(db_column)
         db.commit()
+        invalidate_boards(board_id)
         return True
     
-    def reorder(self, db: Session, columns_data: List[dict]) -> bool:
-        """Переупорядочивание колонок"""
+    def move(self, db: Session, column_id: int, after_id: Optional[int] = None, before_id: Optional[int] = None) -> Optional[Column]:
+        """
+        Переставить колонку после after_id и/или перед before_id (без соседей - в конец).
+        Пишется только строка самой колонки. LookupError - соседняя колонка с другой доски.
+        """
+        db_column = self.get_by_id(db, column_id)
+        if not db_column:
+            return None
+        
+        db_column.position = position_in(
+            db, Column, [Column.board_id == db_column.board_id],
+            moving_id=column_id, after_id=after_id, before_id=before_id
+        )
+        db.commit()
+        db.refresh(db_column)
+        invalidate_boards(db_column.board_id)
+        return db_column
+    
+    def reorder(self, db: Session, columns_data: List[dict], owner_id: int) -> int:
+        """
+        Переупорядочивание колонок одной доски двумя запросами: проверка колонок
+        и владельца доски и один UPDATE ... FROM (VALUES ...).
+
+        Колонки получают order_index из запроса, а ранги (position), которые они
+        занимали, распределяются между ними в новом порядке - остальные колонки
+        доски остаются на своих местах. Уникальность (board_id, order_index)
+        отложена до commit, поэтому колонки могут обменяться номерами.
+
+        LookupError - колонка не найдена или колонки с разных досок,
+        PermissionError - доска принадлежит другому пользователю,
+        ValueError - order_index повторяется. Возвращает id доски.
+        """
+        order = {item['id']: item['order_index'] for item in columns_data}
+        if len(order) != len(columns_data) or len(set(order.values())) != len(order):
+            raise ValueError("Column ids and order_index values must be unique")
+        if not order:
+            raise ValueError("No columns to reorder")
+        
+        rows = db.execute(
+            select(Column.id, Column.board_id, Column.position, Board.creator_id)
+            .join(Board, Board.id == Column.board_id)
+            .where(Column.id.in_(order))
+        ).all()
+        if len(rows) != len(order) or len({row.board_id for row in rows}) != 1:
+            raise LookupError("Columns not found or belong to different boards")
+        if rows[0].creator_id != owner_id:
+            raise PermissionError("Not enough permissions")
+        
+        # Занятые колонками ранги по возрастанию - колонкам в новом порядке
+        ranks = sorted(row.position or "" for row in rows)
+        new_order = sorted(order, key=lambda column_id: order[column_id])
+        data = values(
+            sql_column("id", Integer), sql_column("order_index", Integer), sql_column("position", String),
+            name="new_order"
+        ).data([(column_id, order[column_id], rank or None) for column_id, rank in zip(new_order, ranks)])
+        db.execute(
+            update(Column)
+            .where(Column.id == data.c.id)
+            .values(order_index=data.c.order_index, position=data.c.position)
+            .execution_options(synchronize_session=False)
+        )
         try:
-            for col_data in columns_data:
-                column_id = col_data.get('id')
-                new_order = col_data.get('order_index')
-                if column_id and new_order is not None:
-                    column = self.get_by_id(db, column_id)
-                    if column:
-                        column.order_index = new_order
-            
             db.commit()
-            return True
-        except Exception:
+        except IntegrityError:
             db.rollback()
-            return False
+            raise ValueError("order_index is already taken by another column of the board")
+        invalidate_boards(rows[0].board_id)
+        return rows[0].board_id
     
     def check_board_owner(self, db: Session, column_id: int, user_id: int) -> bool:
         """Проверка, является ли пользователь владельцем доски колонки"""
@@ -72,7 +140,6 @@ class ColumnCRUD:
         if not column:
             return False
         
-        from app.models.board import Board
         board = db.query(Board).filter(Board.id == column.board_id).first()
         return board and board.creator_id == user_id
 
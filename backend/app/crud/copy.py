@@ -0,0 +1,46 @@
+"""
+Загрузка многих строк в таблицу: COPY в PostgreSQL, executemany INSERT в остальных базах.
+Используется массовым импортом (app/bulk_import.py), где строк десятки тысяч.
+"""
+import csv
+import io
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+
+# Явная метка NULL: по умолчанию COPY в CSV-формате читает пустое поле как NULL,
+# и пустые строки превращались бы в NULL (или нарушали NOT NULL)
+COPY_NULL = r"\N"
+
+
+def _copy_value(value):
+    if value is None:
+        return COPY_NULL
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def copy_rows(db: Session, table, rows: List[Dict[str, Any]]):
+    """
+    Записать строки (словари с одинаковыми ключами) в транзакции сессии.
+    COPY идет мимо событий SQLAlchemy: значения по умолчанию на стороне Python
+    не подставляются, их нужно передать явно.
+    """
+    if not rows:
+        return
+    if db.get_bind().dialect.name != "postgresql":
+        db.execute(insert(table), rows)
+        return
+
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_copy_value(row[name]) for name in columns] for row in rows)
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')", buffer)
+    finally:
+        cursor.close()
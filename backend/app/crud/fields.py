@@ -0,0 +1,91 @@
+"""
+Выборочные поля в списках (sparse fieldsets): ?fields=id,title,due_date&include=proposals.
+
+fields - поля схемы ответа, include - вложенные связи. Выбор сужает и SQL
+(load_only: остальные колонки не читаются из базы, связи без include не
+загружаются), и ответ (модель только с выбранными полями). Без обоих
+параметров эндпоинт отвечает полной схемой, как раньше.
+"""
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel, Field, create_model
+from sqlalchemy.orm import load_only, selectinload
+
+
+@lru_cache(maxsize=256)
+def _sparse_schema(schema: Type[BaseModel], fields: FrozenSet[str]) -> Type[BaseModel]:
+    """
+    Наследник схемы, в котором невыбранные поля необязательны и не сериализуются.
+    Валидаторы выбранных полей (priority, tags) наследуются без изменений.
+    """
+    hidden = {
+        name: (Any, Field(default=None, exclude=True))
+        for name in schema.model_fields if name not in fields
+    }
+    return create_model(f"Sparse{schema.__name__}", __base__=schema, **hidden)
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return list(dict.fromkeys(name.strip() for name in (value or "").split(",") if name.strip()))
+
+
+class FieldSelection:
+    """Выбранные поля ответа и связи для одного запроса списка"""
+
+    def __init__(self, schema: Type[BaseModel], columns: Iterable[str], relations: Iterable[str] = ()):
+        self.schema = schema
+        self.columns = tuple(columns)
+        self.relations = tuple(relations)
+        self.model = _sparse_schema(schema, frozenset(self.columns + self.relations))
+
+    @classmethod
+    def parse(
+        cls,
+        schema: Type[BaseModel],
+        fields: Optional[str],
+        include: Optional[str],
+        relations: Tuple[str, ...] = ()
+    ) -> Optional["FieldSelection"]:
+        """
+        Разобрать параметры запроса. None - параметров нет, нужен полный ответ.
+        ValueError - неизвестное поле или связь (API отвечает 400).
+        """
+        if fields is None and include is None:
+            return None
+        available = [name for name in schema.model_fields if name not in relations]
+        columns = _split(fields) or available
+        unknown = [name for name in columns if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(available)}")
+        included = _split(include)
+        unknown = [name for name in included if name not in relations]
+        if unknown:
+            raise ValueError(f"Unknown include: {', '.join(unknown)}. Available: {', '.join(relations) or '-'}")
+        return cls(schema, columns, included)
+
+    def apply(self, query, model, *required: str):
+        """
+        Загрузить только выбранные колонки модели и подгрузить выбранные связи
+        одним запросом на связь. required - колонки, которые нужны коду (например,
+        для группировки), даже если их нет в ответе.
+        """
+        mapped = model.__mapper__.column_attrs.keys()
+        # Первичный ключ загружается всегда
+        loaded = [name for name in dict.fromkeys(self.columns + required) if name in mapped] or ["id"]
+        options = [load_only(*[getattr(model, name) for name in loaded])]
+        options += [selectinload(getattr(model, name)) for name in self.relations]
+        return query.options(*options)
+
+    def dump(self, obj) -> dict:
+        """Только выбранные поля объекта; невыбранные атрибуты не читаются (и не догружаются)"""
+        names = self.columns + self.relations
+        data = self.model.model_validate({name: getattr(obj, name, None) for name in names}).model_dump(mode="json")
+        # Поля в порядке запроса
+        return {name: data[name] for name in names}
+
+    def response(self, items: Union[list, Dict[Any, list]]):
+        """Список (или словарь списков, как в канбане) с выбранными полями, готовый к JSON"""
+        if isinstance(items, dict):
+            return {key: [self.dump(item) for item in values] for key, values in items.items()}
+        return [self.dump(item) for item in items]
@@ -0,0 +1,97 @@
+import logging
+from sqlalchemy import select, func, case, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.order import Order
+from app.models.tag import user_skills
+from app.models.user import User, UserRole
+from app.crud.tag import tag_crud
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Веса составляющих итогового балла (сумма = 1)
+OVERLAP_WEIGHT = 0.55
+RATING_WEIGHT = 0.2
+EXPERIENCE_WEIGHT = 0.15
+LEVEL_WEIGHT = 0.1
+
+# Число выполненных задач, при котором опыт дает половину своего веса
+EXPERIENCE_HALF_POINT = 10.0
+
+PROF_LEVEL_SCORES = {
+    "junior": 0.25,
+    "middle": 0.5,
+    "senior": 0.75,
+    "expert": 1.0,
+}
+
+class MatchingCRUD:
+    """
+    Подбор исполнителей для заказа по инвертированному индексу навыков.
+
+    Кандидаты берутся из user_skills только по тегам заказа, итоговый балл
+    (пересечение навыков, рейтинг, опыт, уровень) считается в БД.
+    """
+
+    def top_executors(
+        self,
+        db: Session,
+        order: Order,
+        limit: Optional[int] = None,
+        timeout_ms: Optional[int] = None
+    ) -> Optional[List[Tuple[User, int, float]]]:
+        """
+        Вернуть до `limit` пар (исполнитель, число совпавших тегов, балл).
+        Если запрос не укладывается в `timeout_ms`, возвращается None (подбор
+        не выполнен), в отличие от пустого списка - подходящих исполнителей нет.
+        """
+        limit = limit or settings.matching_top_k
+        timeout_ms = timeout_ms or settings.matching_timeout_ms
+
+        tag_ids = tag_crud.get_order_tag_ids(db, order.id)
+        if not tag_ids:
+            return []
+
+        overlap = func.count(user_skills.c.tag_id)
+        completed = func.coalesce(User.completed_tasks, 0)
+        score = (
+            overlap * OVERLAP_WEIGHT / len(tag_ids)
+            + func.coalesce(User.rating, 0) / 5.0 * RATING_WEIGHT
+            + completed / (completed + EXPERIENCE_HALF_POINT) * EXPERIENCE_WEIGHT
+            + case(PROF_LEVEL_SCORES, value=User.prof_level, else_=0.0) * LEVEL_WEIGHT
+        )
+
+        stmt = (
+            select(User, overlap.label("overlap"), score.label("score"))
+            .join(user_skills, user_skills.c.user_id == User.id)
+            .where(
+                user_skills.c.tag_id.in_(tag_ids),
+                User.role == UserRole.EXECUTOR,
+                User.is_active == True,
+                User.is_banned.isnot(True),
+                User.id != order.creator_id
+            )
+            .group_by(User.id)
+            .order_by(score.desc(), User.id)
+            .limit(limit)
+        )
+
+        postgres = db.get_bind().dialect.name == "postgresql"
+        order_id = order.id
+        try:
+            # SAVEPOINT: по таймауту откатывается только подбор, а не работа вызывающего кода в сессии
+            with db.begin_nested():
+                if postgres:
+                    db.execute(text("SELECT set_config('statement_timeout', :ms, true)"), {"ms": str(timeout_ms)})
+                rows = db.execute(stmt).all()
+                if postgres:
+                    db.execute(text("SET LOCAL statement_timeout TO DEFAULT"))
+        except OperationalError as e:
+            logger.warning(f"Matching for order {order_id} exceeded {timeout_ms} ms: {e}")
+            return None
+
+        return [(row[0], row.overlap, float(row.score)) for row in rows]
+
+matching_crud = MatchingCRUD()
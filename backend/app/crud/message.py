@@ -1,7 +1,19 @@
+import heapq
+import itertools
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.orm import Session
-from app.models.message import Message
+from app.models.message import Message, MessageArchive
+from app.models.order import Order, OrderStatus
+from app.models.user import User
 from app.schemas.message import MessageCreate, MessageUpdate
-from typing import Optional, List
+from datetime import datetime
+from typing import Callable, Optional, List
+
+# Заказы, переписка которых больше не меняется и может уйти в архив
+CLOSED_ORDER_STATUSES = (OrderStatus.COMPLETED.value, OrderStatus.CANCELLED.value)
+
+# Колонки, которые переносятся из messages в messages_archive
+_ARCHIVED_COLUMNS = ("id", "order_id", "sender_id", "receiver_id", "content", "is_read", "created_at", "updated_at")
 
 class MessageCRUD:
     def get_by_id(self, db: Session, message_id: int) -> Optional[Message]:
@@ -11,9 +23,60 @@ class MessageCRUD:
         return db.query(Message).filter(Message.order_id == order_id).order_by(Message.created_at.asc()).offset(skip).limit(limit).all()
     
     def get_by_user(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Message]:
-        return db.query(Message).filter(
-            (Message.sender_id == user_id) | (Message.receiver_id == user_id)
-        ).order_by(Message.created_at.desc()).offset(skip).limit(limit).all()
+        """
+        Сообщения пользователя от новых к старым, включая архив. Здесь смешаны
+        разные заказы, и горячие сообщения давно открытого заказа бывают старше
+        архивных: из обеих таблиц берется по skip + limit строк, они сливаются
+        по (created_at, id) и нарезаются.
+        """
+        def page(model):
+            return db.query(model).filter(
+                (model.sender_id == user_id) | (model.receiver_id == user_id)
+            ).order_by(model.created_at.desc(), model.id.desc()).limit(skip + limit).all()
+
+        merged = heapq.merge(page(Message), page(MessageArchive), key=lambda message: (message.created_at, message.id), reverse=True)
+        return list(itertools.islice(merged, skip, skip + limit))
+    
+    def get_conversation(self, db: Session, order_id: int, user_id: int, skip: int = 0, limit: int = 100) -> List[dict]:
+        """
+        Страница чата заказа с именами отправителя и получателя. skip отсчитывается
+        от самого нового сообщения (прокрутка истории назад), страница - в порядке
+        отправки. Доступ пользователя к заказу проверяет вызывающий код.
+        """
+        page = self._newest_first(db, lambda model: [model.order_id == order_id], skip, limit)
+        user_ids = {message.sender_id for message in page} | {message.receiver_id for message in page}
+        names = {
+            user.id: user.full_name or user.username
+            for user in db.query(User.id, User.full_name, User.username).filter(User.id.in_(user_ids - {None}))
+        }
+        return [
+            {
+                **{column: getattr(message, column) for column in _ARCHIVED_COLUMNS},
+                "sender_name": names.get(message.sender_id, ""),
+                "receiver_name": names.get(message.receiver_id, "")
+            }
+            for message in reversed(page)
+        ]
+    
+    def _newest_first(self, db: Session, criteria: Callable, skip: int, limit: int) -> list:
+        """
+        Страница сообщений одного заказа от новых к старым: сначала горячая таблица,
+        архив - только если страница заходит дальше ее последней строки. Годится
+        только в пределах заказа: его архивные сообщения всегда старше горячих
+        (в архив уходят сообщения закрытых заказов старше срока).
+        criteria(model) - условия отбора для Message или MessageArchive.
+        """
+        hot = db.query(Message).filter(*criteria(Message)).order_by(
+            Message.created_at.desc(), Message.id.desc()
+        ).offset(skip).limit(limit).all()
+        if len(hot) >= limit:
+            return hot
+        # Страница неполная: горячие строки закончились на ней или раньше
+        hot_total = skip + len(hot) if hot else db.query(func.count(Message.id)).filter(*criteria(Message)).scalar()
+        archived = db.query(MessageArchive).filter(*criteria(MessageArchive)).order_by(
+            MessageArchive.created_at.desc(), MessageArchive.id.desc()
+        ).offset(max(skip - hot_total, 0)).limit(limit - len(hot)).all()
+        return hot + archived
     
     def get_unread_count(self, db: Session, user_id: int) -> int:
         return db.query(Message).filter(
@@ -91,6 +154,35 @@ class MessageCRUD:
             db.rollback()
             return False
     
+    def archive_batch(self, db: Session, cutoff: datetime, batch_size: int) -> int:
+        """
+        Перенести в архив до batch_size сообщений закрытых заказов, отправленных
+        раньше cutoff. Один запрос (DELETE ... RETURNING внутри INSERT) и commit:
+        блокировки строк держатся только на время пачки, строки, занятые другими
+        транзакциями, пропускаются до следующего запуска. Возвращает число строк.
+        """
+        ids = select(Message.id).join(Order, Order.id == Message.order_id).where(
+            Order.status.in_(CLOSED_ORDER_STATUSES),
+            Message.created_at < cutoff
+        ).order_by(Message.id).limit(batch_size).with_for_update(of=Message, skip_locked=True)
+        moved = delete(Message).where(Message.id.in_(ids)).returning(
+            *[getattr(Message, column) for column in _ARCHIVED_COLUMNS]
+        ).cte("moved")
+        result = db.execute(insert(MessageArchive).from_select(
+            list(_ARCHIVED_COLUMNS), select(*[moved.c[column] for column in _ARCHIVED_COLUMNS])
+        ))
+        db.commit()
+        return result.rowcount
+    
+    def archive_old(self, db: Session, cutoff: datetime, batch_size: int) -> int:
+        """Перенести в архив все подходящие сообщения пачками; возвращает общее число"""
+        total = 0
+        while True:
+            moved = self.archive_batch(db, cutoff, batch_size)
+            total += moved
+            if moved < batch_size:
+                return total
+    
     def check_owner(self, db: Session, message_id: int, user_id: int) -> bool:
         message = self.get_by_id(db, message_id)
         return message and message.sender_id == user_id
@@ -1,46 +1,76 @@
 from sqlalchemy.orm import Session
 from app.models.order import Order, OrderStatus, OrderPriority
 from app.schemas.order import OrderCreate, OrderUpdate
+from app.models.tag import order_tags
+from app.crud.tag import tag_crud, split_tags
+from app.crud.versioning import check_version, commit_versioned
+from app.crud.fields import FieldSelection
 from typing import Optional, List
 
 class OrderCRUD:
+    def _with_tags(self, query, tags: Optional[List[str]]):
+        """Оставить заказы, у которых есть хотя бы один из тегов"""
+        if tags:
+            query = query.filter(Order.id.in_(tag_crud.tagged_ids(order_tags, "order_id", tags)))
+        return query
+    
+    def _with_fields(self, query, fields: Optional[FieldSelection]):
+        """Загрузить только поля и связи, выбранные в ?fields= и ?include= (без выбора - все)"""
+        return fields.apply(query, Order) if fields else query
+    
     def get_by_id(self, db: Session, order_id: int) -> Optional[Order]:
         return db.query(Order).filter(Order.id == order_id).first()
     
-    def get_by_creator(self, db: Session, creator_id: int, skip: int = 0, limit: int = 100) -> List[Order]:
-        return db.query(Order).filter(Order.creator_id == creator_id).order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
+    def get_by_creator(self, db: Session, creator_id: int, skip: int = 0, limit: int = 100, tags: Optional[List[str]] = None, fields: Optional[FieldSelection] = None) -> List[Order]:
+        return self._with_fields(self._with_tags(db.query(Order).filter(Order.creator_id == creator_id), tags), fields).order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
+    
+    def get_by_executor(self, db: Session, executor_id: int, skip: int = 0, limit: int = 100, tags: Optional[List[str]] = None, fields: Optional[FieldSelection] = None) -> List[Order]:
+        return self._with_fields(self._with_tags(db.query(Order).filter(Order.assigned_executor_id == executor_id), tags), fields).order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
     
-    def get_open_orders(self, db: Session, skip: int = 0, limit: int = 100) -> List[Order]:
-        return db.query(Order).filter(Order.status == OrderStatus.OPEN.value).order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
+    def get_open_orders(self, db: Session, skip: int = 0, limit: int = 100, tags: Optional[List[str]] = None, fields: Optional[FieldSelection] = None) -> List[Order]:
+        return self._with_fields(self._with_tags(db.query(Order).filter(Order.status == OrderStatus.OPEN.value), tags), fields).order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Order]:
-        return db.query(Order).order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
+    def get_all(self, db: Session, skip: int = 0, limit: int = 100, tags: Optional[List[str]] = None, fields: Optional[FieldSelection] = None) -> List[Order]:
+        return self._with_fields(self._with_tags(db.query(Order), tags), fields).order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
     
     def create(self, db: Session, order: OrderCreate, creator_id: int) -> Order:
+        tags = split_tags(order.tags)
         db_order = Order(
             title=order.title,
             description=order.description,
             budget=order.budget,
             deadline=order.deadline,
             priority=order.priority.value if order.priority else OrderPriority.MEDIUM.value,
-            tags=','.join(order.tags) if order.tags else None,
+            tags=','.join(tags) if tags else None,
             creator_id=creator_id
         )
         db.add(db_order)
+        db.flush()
+        
+        # Нормализованные теги для подбора исполнителей
+        tag_crud.set_order_tags(db, db_order.id, tags)
+        
         db.commit()
         db.refresh(db_order)
         return db_order
     
     def update(self, db: Session, order_id: int, order_update: OrderUpdate) -> Optional[Order]:
+        """
+        Обновить заказ. Если передана version, правка применяется только к этой
+        версии заказа, иначе VersionConflictError (см. app/crud/versioning.py).
+        """
         db_order = self.get_by_id(db, order_id)
         if not db_order:
             return None
         
         update_data = order_update.dict(exclude_unset=True)
+        check_version(db_order, update_data.pop('version', None))
         
-        # Конвертируем tags из списка в строку, если они есть
+        # Конвертируем tags в строку через запятую, если они есть
+        tags = None
         if 'tags' in update_data and update_data['tags'] is not None:
-            update_data['tags'] = ','.join(update_data['tags'])
+            tags = split_tags(update_data['tags'])
+            update_data['tags'] = ','.join(tags) if tags else None
         
         # Конвертируем priority enum в строку
         if 'priority' in update_data and update_data['priority'] is not None:
@@ -49,7 +79,10 @@ class OrderCRUD:
         for field, value in update_data.items():
             setattr(db_order, field, value)
         
-        db.commit()
+        if tags is not None:
+            tag_crud.set_order_tags(db, order_id, tags)
+        
+        commit_versioned(db, db_order)
         db.refresh(db_order)
         return db_order
     
@@ -58,6 +91,8 @@ class OrderCRUD:
         if not db_order:
             return False
         
+        # Снимаем теги, чтобы уменьшить счетчики частот
+        tag_crud.set_order_tags(db, order_id, [])
         db.delete(db_order)
         db.commit()
         return True
@@ -71,7 +106,7 @@ class OrderCRUD:
         db_order.assigned_executor_id = executor_id
         db_order.completed_at = db.func.now()
         
-        db.commit()
+        commit_versioned(db, db_order)
         db.refresh(db_order)
         return db_order
     
@@ -82,7 +117,7 @@ class OrderCRUD:
         
         db_order.status = OrderStatus.CANCELLED.value
         
-        db.commit()
+        commit_versioned(db, db_order)
         db.refresh(db_order)
         return db_order
     
@@ -93,7 +128,7 @@ class OrderCRUD:
         
         db_order.status = OrderStatus.OPEN.value
         
-        db.commit()
+        commit_versioned(db, db_order)
         db.refresh(db_order)
         return db_order
     
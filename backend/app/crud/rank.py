@@ -0,0 +1,186 @@
+"""
+Дробные (лексикографические) ранги для порядка задач в колонке и колонок на доске.
+
+Ранг - строка из цифр base36, которая сравнивается побайтно (COLLATE "C") как
+дробь 0.<ранг>. Между любыми двумя рангами всегда есть еще один, поэтому
+перенос карточки меняет одну строку: ей назначается ранг между соседями.
+Ранги не заканчиваются на "0", иначе перед рангом "x0" не было бы места.
+
+При частых вставках в одно место ранг удлиняется; длинные ранги
+выравниваются перебалансировкой (evenly_spaced для всей колонки): в фоне,
+если ранг длиннее settings.rank_rebalance_length, и сразу, если длиннее
+MAX_RANK_LENGTH или ранги соседей совпали.
+"""
+from typing import List, Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+_VALUES = {digit: value for value, digit in enumerate(DIGITS)}
+
+# Ранг длиннее этого перебалансируется сразу при переносе
+MAX_RANK_LENGTH = 128
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Ранг строго между before и after (None - начало/конец списка).
+    Поднимает ValueError, если before >= after (ранги совпали при гонке
+    переносов) - тогда колонку нужно перебалансировать.
+    """
+    lower = before or ""
+    if after is not None and lower >= after:
+        raise ValueError(f"Нет места между рангами {before!r} и {after!r}")
+
+    # В конец и в начало списка добавляют чаще всего: соседний ранг той же длины,
+    # а не середина промежутка, иначе ранг удлиняется через каждые несколько вставок
+    if after is None and before:
+        return _increment(before)
+    if before is None and after:
+        return _decrement(after)
+
+    result = []
+    upper = after
+    i = 0
+    while True:
+        low = _VALUES[lower[i]] if i < len(lower) else 0
+        high = _VALUES[upper[i]] if upper is not None and i < len(upper) else BASE
+        if high - low > 1:
+            result.append(DIGITS[(low + high) // 2])
+            return "".join(result)
+        result.append(DIGITS[low])
+        if high - low == 1:
+            # Дальше верхняя граница не ограничивает: любое продолжение low меньше high
+            upper = None
+        i += 1
+
+
+def _format(value: int, width: int) -> str:
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits))
+
+
+def _increment(rank: str) -> str:
+    """Следующий ранг той же длины; когда они кончились - ранг вдвое длиннее"""
+    width = len(rank)
+    value = int(rank, BASE) + 1
+    if value % BASE == 0:
+        value += 1
+    if value >= BASE ** width:
+        return rank + "0" * (width - 1) + "1"
+    return _format(value, width)
+
+
+def _decrement(rank: str) -> str:
+    """Предыдущий ранг той же длины; когда они кончились - ранг вдвое длиннее"""
+    width = len(rank)
+    value = int(rank, BASE) - 1
+    if value % BASE == 0:
+        value -= 1
+    if value <= 0:
+        return "0" * width + DIGITS[-1] * width
+    return _format(value, width)
+
+
+def ranks_between(before: Optional[str], after: Optional[str], count: int) -> List[str]:
+    """count возрастающих рангов между before и after, делящих промежуток поровну"""
+    if count <= 0:
+        return []
+    if after is None and before:
+        # Добавление в конец: подряд идущие ранги одной длины
+        ranks = [_increment(before)]
+        while len(ranks) < count:
+            ranks.append(_increment(ranks[-1]))
+        return ranks
+    middle = rank_between(before, after)
+    left = count // 2
+    return ranks_between(before, middle, left) + [middle] + ranks_between(middle, after, count - left - 1)
+
+
+def evenly_spaced(count: int) -> List[str]:
+    """Ранги одинаковой (минимальной) длины для перебалансировки count элементов"""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    return [_format(k * BASE ** width // (count + 1), width).rstrip("0") for k in range(1, count + 1)]
+
+
+def rebalance(db: Session, model, scope: list) -> int:
+    """
+    Переназначить ранги всех элементов списка (условия scope) равномерно,
+    сохранив текущий порядок. Не делает commit. Возвращает число элементов.
+    """
+    ids = list(db.execute(
+        select(model.id).where(*scope).order_by(model.position.asc().nulls_last(), model.id)
+    ).scalars())
+    if ids:
+        table = model.__table__
+        db.execute(
+            update(table).where(table.c.id == bindparam("item_id")).values(position=bindparam("new_position")),
+            [{"item_id": item_id, "new_position": rank} for item_id, rank in zip(ids, evenly_spaced(len(ids)))]
+        )
+    return len(ids)
+
+
+def _neighbors(db: Session, model, scope: list, moving_id: Optional[int], after_id: Optional[int], before_id: Optional[int]):
+    """Ранги соседей, между которыми встанет элемент"""
+    others = [*scope, model.id != moving_id] if moving_id is not None else list(scope)
+    anchors = dict(db.execute(
+        select(model.id, model.position).where(*others, model.id.in_([i for i in (after_id, before_id) if i]))
+    ).all())
+    for anchor_id in (after_id, before_id):
+        if anchor_id and anchor_id not in anchors:
+            raise LookupError(f"Соседний элемент {anchor_id} не найден в этом списке")
+
+    lower = anchors.get(after_id) if after_id else None
+    upper = anchors.get(before_id) if before_id else None
+    if after_id and not before_id:
+        upper = db.execute(
+            select(model.position).where(*others, model.position > lower).order_by(model.position).limit(1)
+        ).scalar()
+    elif before_id and not after_id:
+        lower = db.execute(
+            select(model.position).where(*others, model.position < upper).order_by(model.position.desc()).limit(1)
+        ).scalar()
+    elif not after_id and not before_id:
+        lower = db.execute(
+            select(model.position).where(*others, model.position.isnot(None)).order_by(model.position.desc()).limit(1)
+        ).scalar()
+    return lower, upper
+
+
+def position_in(
+    db: Session,
+    model,
+    scope: list,
+    moving_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None
+) -> str:
+    """
+    Ранг, с которым элемент moving_id встанет в списке scope после after_id
+    и/или перед before_id (без соседей - в конец). Меняется одна строка;
+    список перебалансируется только если между соседями нет места.
+    LookupError - сосед не найден в этом списке.
+    """
+    lower, upper = _neighbors(db, model, scope, moving_id, after_id, before_id)
+    try:
+        if (after_id and lower is None) or (before_id and upper is None):
+            raise ValueError("У соседа нет ранга")
+        rank = rank_between(lower, upper)
+        if len(rank) <= MAX_RANK_LENGTH:
+            return rank
+    except ValueError:
+        pass
+    rebalance(db, model, scope)
+    lower, upper = _neighbors(db, model, scope, moving_id, after_id, before_id)
+    if after_id and before_id and lower >= upper:
+        # Соседи с одинаковым рангом после выравнивания оказались в другом
+        # порядке, чем их видел клиент: ставим элемент сразу после after_id
+        lower, upper = _neighbors(db, model, scope, moving_id, after_id, None)
+    return rank_between(lower, upper)
@@ -0,0 +1,148 @@
+import base64
+from sqlalchemy import select, func, or_, tuple_, cast, literal, text
+from sqlalchemy.dialects.postgresql import REAL
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.board import Board
+from app.models.message import Message
+from app.models.order import Order
+from app.models.search import SEARCH_CONFIG
+from app.models.tag import order_tags, task_tags
+from app.models.task import Task
+from app.models.user import User, UserRole
+from app.crud.tag import tag_crud
+from typing import Any, Dict, List, Optional, Tuple
+
+# Выделение совпадений в сниппете: без HTML, чтобы текст можно было выводить как есть
+HEADLINE_OPTIONS = "StartSel=«, StopSel=», MaxWords=30, MinWords=10, MaxFragments=2"
+
+def encode_cursor(rank: float, item_id: int) -> str:
+    """Курсор keyset-пагинации: ранг и id последнего результата страницы"""
+    return base64.urlsafe_b64encode(f"{rank!r}:{item_id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        rank, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(rank), int(item_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+class SearchCRUD:
+    """
+    Полнотекстовый поиск по задачам, заказам и сообщениям.
+
+    Совпадения ищутся по GIN индексу на search_vector, результаты упорядочены
+    по (ранг, id) по убыванию. Сначала выбираются только id и ранг страницы,
+    сниппеты (ts_headline) строятся уже для найденных строк.
+    """
+
+    def search_tasks(
+        self,
+        db: Session,
+        user: User,
+        query: str,
+        board_id: Optional[int] = None,
+        status: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        conditions = []
+        if user.role != UserRole.ADMIN:
+            visible_boards = select(Board.id).where(or_(Board.is_public == True, Board.creator_id == user.id))
+            conditions.append(Task.board_id.in_(visible_boards))
+        if board_id is not None:
+            conditions.append(Task.board_id == board_id)
+        if status:
+            conditions.append(Task.status == status)
+        if tags:
+            conditions.append(Task.id.in_(tag_crud.tagged_ids(task_tags, "task_id", tags)))
+
+        return self._search(
+            db, Task, query, conditions, limit, cursor,
+            title=Task.title,
+            document=func.coalesce(Task.description, Task.title),
+            extra=(Task.board_id, Task.status, Task.created_at)
+        )
+
+    def search_orders(
+        self,
+        db: Session,
+        user: User,
+        query: str,
+        status: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        conditions = []
+        if user.role == UserRole.CUSTOMER:
+            conditions.append(Order.creator_id == user.id)
+        if status:
+            conditions.append(Order.status == status)
+        if tags:
+            conditions.append(Order.id.in_(tag_crud.tagged_ids(order_tags, "order_id", tags)))
+
+        return self._search(
+            db, Order, query, conditions, limit, cursor,
+            title=Order.title,
+            document=Order.description,
+            extra=(Order.status, Order.created_at)
+        )
+
+    def search_messages(
+        self,
+        db: Session,
+        user: User,
+        query: str,
+        order_id: Optional[int] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        # Сообщения доступны только участникам заказа
+        conditions = [Message.order_id.in_(
+            select(Order.id).where(or_(Order.creator_id == user.id, Order.assigned_executor_id == user.id))
+        )]
+        if order_id is not None:
+            conditions.append(Message.order_id == order_id)
+
+        return self._search(
+            db, Message, query, conditions, limit, cursor,
+            title=None,
+            document=Message.content,
+            extra=(Message.order_id, Message.created_at)
+        )
+
+    def _search(self, db: Session, model, query: str, conditions, limit: int, cursor: Optional[str], title, document, extra):
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank(model.search_vector, tsquery)
+
+        ranked = (
+            select(model.id, rank.label("rank"))
+            .where(model.search_vector.op("@@")(tsquery), *conditions)
+        )
+        if cursor:
+            last_rank, last_id = decode_cursor(cursor)
+            ranked = ranked.where(tuple_(rank, model.id) < tuple_(cast(literal(last_rank), REAL), last_id))
+        ranked = ranked.order_by(rank.desc(), model.id.desc()).limit(limit + 1).subquery()
+
+        columns = [model.id, ranked.c.rank, func.ts_headline(SEARCH_CONFIG, document, tsquery, HEADLINE_OPTIONS).label("snippet")]
+        if title is not None:
+            columns.append(title.label("title"))
+        stmt = (
+            select(*columns, *extra)
+            .join(ranked, ranked.c.id == model.id)
+            .order_by(ranked.c.rank.desc(), model.id.desc())
+        )
+
+        db.execute(text("SELECT set_config('statement_timeout', :ms, true)"), {"ms": str(settings.search_timeout_ms)})
+        rows = db.execute(stmt).mappings().all()
+        db.execute(text("SET LOCAL statement_timeout TO DEFAULT"))
+
+        items = [dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(items[-1]["rank"], items[-1]["id"])
+        return items, next_cursor
+
+search_crud = SearchCRUD()
@@ -0,0 +1,243 @@
+import json
+from collections import Counter
+from sqlalchemy import select, insert, delete, update, func, tuple_
+from sqlalchemy.orm import Session
+from app.crud.copy import copy_rows
+from app.models.tag import Tag, user_skills, order_tags, task_tags
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MAX_TAG_LENGTH = 50
+
+def normalize_tag(name: Any) -> str:
+    """Нормализованное имя тега: нижний регистр, одиночные пробелы"""
+    return ' '.join(str(name).lower().split())[:MAX_TAG_LENGTH]
+
+def split_tags(value: Any) -> List[str]:
+    """
+    Привести теги к списку без дублей.
+    Принимает список, JSON строку со списком или строку через запятую.
+    """
+    if not value:
+        return []
+
+    if isinstance(value, str):
+        value = value.strip()
+        if value in ('', '{}'):
+            return []
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            parsed = None
+        items = parsed if isinstance(parsed, list) else value.split(',')
+    else:
+        items = value
+
+    result = []
+    seen = set()
+    for item in items:
+        tag = str(item).strip()[:MAX_TAG_LENGTH]
+        key = normalize_tag(tag)
+        if key and key not in seen:
+            seen.add(key)
+            result.append(tag)
+    return result
+
+def _insert_ignore(db: Session, table, rows: List[Dict[str, Any]]):
+    """INSERT ... ON CONFLICT DO NOTHING для PostgreSQL и SQLite"""
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        db.execute(insert(table), rows)
+        return
+    db.execute(dialect_insert(table).on_conflict_do_nothing(), rows)
+
+class TagCRUD:
+    """
+    Словарь тегов и связи с пользователями, заказами и задачами.
+    Методы не делают commit — изменения фиксируются транзакцией вызывающего кода.
+    """
+
+    def get_or_create_ids(self, db: Session, names: Iterable[Any]) -> List[int]:
+        normalized = list(dict.fromkeys(n for n in map(normalize_tag, names) if n))
+        if not normalized:
+            return []
+
+        existing = dict(db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(normalized))).all())
+        missing = [name for name in normalized if name not in existing]
+        if missing:
+            _insert_ignore(db, Tag.__table__, [{"name": name} for name in missing])
+            existing.update(db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing))).all())
+
+        return [existing[name] for name in normalized]
+
+    def _set_links(self, db: Session, table, owner_column: str, owner_id: int, tags: Any, counter=None):
+        """
+        Привести связи владельца с тегами к списку `tags`.
+        Меняются только добавленные/удаленные связи, счетчик `counter` в Tag
+        сдвигается на ту же разницу.
+        """
+        tag_ids = self.get_or_create_ids(db, split_tags(tags))
+        current = set(db.execute(select(table.c.tag_id).where(table.c[owner_column] == owner_id)).scalars())
+        added = [tag_id for tag_id in tag_ids if tag_id not in current]
+        removed = list(current.difference(tag_ids))
+
+        if removed:
+            db.execute(delete(table).where(table.c[owner_column] == owner_id, table.c.tag_id.in_(removed)))
+        if added:
+            db.execute(insert(table), [{owner_column: owner_id, "tag_id": tag_id} for tag_id in added])
+
+        if counter is not None:
+            if added:
+                db.execute(update(Tag).where(Tag.id.in_(added)).values({counter: counter + 1}))
+            if removed:
+                db.execute(update(Tag).where(Tag.id.in_(removed)).values({counter: counter - 1}))
+
+    def _set_links_bulk(self, db: Session, table, owner_column: str, tags_by_owner: Dict[int, Any], counter=None, new_owners: bool = False):
+        """
+        То же, что _set_links, для многих владельцев сразу: число запросов
+        не зависит от числа владельцев. new_owners - владельцы только что
+        созданы и связей у них еще нет (массовый импорт): текущие связи не читаются.
+        """
+        if not tags_by_owner:
+            return
+        wanted = {owner_id: [normalize_tag(tag) for tag in split_tags(tags)] for owner_id, tags in tags_by_owner.items()}
+        names = list(dict.fromkeys(name for tags in wanted.values() for name in tags if name))
+        id_by_name = dict(zip(names, self.get_or_create_ids(db, names)))
+        desired = {(owner_id, id_by_name[name]) for owner_id, tags in wanted.items() for name in tags if name}
+        owner = table.c[owner_column]
+        current = set() if new_owners else set(
+            db.execute(select(owner, table.c.tag_id).where(owner.in_(list(wanted)))).tuples()
+        )
+        added = desired - current
+        removed = current - desired
+
+        if removed:
+            db.execute(delete(table).where(tuple_(owner, table.c.tag_id).in_(list(removed))))
+        links = [{owner_column: owner_id, "tag_id": tag_id} for owner_id, tag_id in added]
+        if new_owners:
+            copy_rows(db, table, links)
+        elif links:
+            db.execute(insert(table), links)
+
+        if counter is not None:
+            deltas = Counter(tag_id for _, tag_id in added)
+            deltas.subtract(tag_id for _, tag_id in removed)
+            # Один UPDATE на каждое различное значение сдвига, а не на каждый тег
+            tags_by_delta: Dict[int, List[int]] = {}
+            for tag_id, delta in deltas.items():
+                if delta:
+                    tags_by_delta.setdefault(delta, []).append(tag_id)
+            for delta, tag_ids in tags_by_delta.items():
+                db.execute(update(Tag).where(Tag.id.in_(tag_ids)).values({counter: counter + delta}))
+
+    def set_user_skills(self, db: Session, user_id: int, skills: Any):
+        """Перестроить навыки пользователя в инвертированном индексе"""
+        self._set_links(db, user_skills, "user_id", user_id, skills)
+
+    def set_order_tags(self, db: Session, order_id: int, tags: Any):
+        """Перестроить нормализованные теги заказа"""
+        self._set_links(db, order_tags, "order_id", order_id, tags, Tag.order_count)
+
+    def set_order_tags_bulk(self, db: Session, tags_by_order: Dict[int, Any], new_orders: bool = False):
+        """Перестроить нормализованные теги многих заказов"""
+        self._set_links_bulk(db, order_tags, "order_id", tags_by_order, Tag.order_count, new_owners=new_orders)
+
+    def set_task_tags(self, db: Session, task_id: int, tags: Any):
+        """Перестроить нормализованные теги задачи"""
+        self._set_links(db, task_tags, "task_id", task_id, tags, Tag.task_count)
+
+    def set_task_tags_bulk(self, db: Session, tags_by_task: Dict[int, Any], new_tasks: bool = False):
+        """Перестроить нормализованные теги многих задач"""
+        self._set_links_bulk(db, task_tags, "task_id", tags_by_task, Tag.task_count, new_owners=new_tasks)
+
+    def tagged_ids(self, table, owner_column: str, tags: Iterable[Any]):
+        """Подзапрос id владельцев, у которых есть хотя бы один из тегов"""
+        names = [name for name in map(normalize_tag, tags) if name]
+        return (
+            select(table.c[owner_column])
+            .join(Tag, Tag.id == table.c.tag_id)
+            .where(Tag.name.in_(names))
+        )
+
+    def get_frequencies(self, db: Session, kind: str = "tasks", limit: int = 50, criteria: Optional[list] = None) -> List[Tuple[str, int]]:
+        """
+        Самые используемые теги задач или заказов. Без criteria - по предрасчитанным
+        счетчикам (все задачи и заказы); с criteria - подсчет по связям только тех
+        задач (условия на Task и Board) или заказов (условия на Order), что им подходят.
+        """
+        if criteria is None:
+            counter = Tag.task_count if kind == "tasks" else Tag.order_count
+            stmt = select(Tag.name, counter).where(counter > 0).order_by(counter.desc(), Tag.name).limit(limit)
+            return [tuple(row) for row in db.execute(stmt).all()]
+
+        from app.models.board import Board
+        from app.models.order import Order
+        from app.models.task import Task
+
+        count = func.count().label("count")
+        if kind == "tasks":
+            stmt = (
+                select(Tag.name, count)
+                .join(task_tags, task_tags.c.tag_id == Tag.id)
+                .join(Task, Task.id == task_tags.c.task_id)
+                .join(Board, Board.id == Task.board_id)
+            )
+        else:
+            stmt = (
+                select(Tag.name, count)
+                .join(order_tags, order_tags.c.tag_id == Tag.id)
+                .join(Order, Order.id == order_tags.c.order_id)
+            )
+        stmt = stmt.where(*criteria).group_by(Tag.id, Tag.name).order_by(count.desc(), Tag.name).limit(limit)
+        return [tuple(row) for row in db.execute(stmt).all()]
+
+    def refresh_counts(self, db: Session):
+        """Пересчитать счетчики тегов по таблицам связей"""
+        for table, counter in ((task_tags, Tag.task_count), (order_tags, Tag.order_count)):
+            actual = select(func.count()).select_from(table).where(table.c.tag_id == Tag.id).scalar_subquery()
+            db.execute(update(Tag).values({counter: actual}))
+
+    def get_order_tag_ids(self, db: Session, order_id: int) -> List[int]:
+        return list(db.execute(select(order_tags.c.tag_id).where(order_tags.c.order_id == order_id)).scalars())
+
+    def rebuild_index(self, db: Session, batch_size: int = 1000) -> Dict[str, int]:
+        """
+        Полностью перестроить user_skills, order_tags и task_tags из
+        JSON/строковых полей и пересчитать счетчики тегов.
+        Источники читаются пачками, чтобы не загружать таблицы целиком.
+        """
+        from app.models.user import User
+        from app.models.order import Order
+        from app.models.task import Task
+
+        db.execute(delete(user_skills))
+        db.execute(delete(order_tags))
+        db.execute(delete(task_tags))
+
+        counts = {"users": 0, "orders": 0, "tasks": 0}
+        sources = (
+            ("users", select(User.id, User.skills).where(User.skills.isnot(None)), user_skills, "user_id"),
+            ("orders", select(Order.id, Order.tags).where(Order.tags.isnot(None)), order_tags, "order_id"),
+            ("tasks", select(Task.id, Task.tags).where(Task.tags.isnot(None)), task_tags, "task_id"),
+        )
+        for key, stmt, table, owner_column in sources:
+            result = db.execute(stmt.execution_options(yield_per=batch_size))
+            for partition in result.partitions():
+                parsed = [(row[0], [normalize_tag(t) for t in split_tags(row[1])]) for row in partition]
+                names = list({name for _, tags in parsed for name in tags})
+                ids = dict(zip(names, self.get_or_create_ids(db, names))) if names else {}
+                rows = [
+                    {owner_column: owner_id, "tag_id": ids[name]}
+                    for owner_id, tags in parsed for name in tags
+                ]
+                if rows:
+                    db.execute(insert(table), rows)
+                counts[key] += len(partition)
+
+        self.refresh_counts(db)
+        return counts
+
+tag_crud = TagCRUD()
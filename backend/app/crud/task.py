@@ -1,30 +1,59 @@
+from sqlalchemy import bindparam, delete, func, literal, select, true, update
 from sqlalchemy.orm import Session
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
-from typing import Optional, List
+from app.models.column import Column
+from app.models.user import User
+from app.models.tag import task_tags
+from app.models.task_status import TaskStatusEnum
+from app.schemas.task import TaskCreate, TaskUpdate, TaskBulkOperation
+from app.crud.tag import tag_crud, split_tags, normalize_tag
+from app.crud.rank import position_in, ranks_between, rebalance
+from app.crud.versioning import check_version, commit_versioned
+from app.crud.fields import FieldSelection
+from app.cache import invalidate_boards
+from typing import Dict, Optional, List, Set
+
+# Глубже дерево не разворачивается: защита от циклов в parent_id
+MAX_TREE_DEPTH = 50
 
 class TaskCRUD:
+    def _with_tags(self, query, tags: Optional[List[str]]):
+        """Оставить задачи, у которых есть хотя бы один из тегов"""
+        if tags:
+            query = query.filter(Task.id.in_(tag_crud.tagged_ids(task_tags, "task_id", tags)))
+        return query
+    
+    def _with_fields(self, query, fields: Optional[FieldSelection], *required: str):
+        """Загрузить только поля, выбранные в ?fields= (без выбора - все), и нужные коду required"""
+        return fields.apply(query, Task, *required) if fields else query
+    
     def get_by_id(self, db: Session, task_id: int) -> Optional[Task]:
         return db.query(Task).filter(Task.id == task_id).first()
     
-    def get_by_board(self, db: Session, board_id: int, skip: int = 0, limit: int = 100) -> List[Task]:
-        return db.query(Task).filter(Task.board_id == board_id).offset(skip).limit(limit).all()
+    def get_by_board(self, db: Session, board_id: int, skip: int = 0, limit: int = 100, tags: Optional[List[str]] = None, fields: Optional[FieldSelection] = None) -> List[Task]:
+        query = self._with_fields(self._with_tags(db.query(Task).filter(Task.board_id == board_id), tags), fields)
+        return query.order_by(Task.column_id, Task.position, Task.id).offset(skip).limit(limit).all()
     
     def get_by_status(self, db: Session, board_id: int, column_id: int) -> List[Task]:
-        return db.query(Task).filter(Task.board_id == board_id, Task.column_id == column_id).all()
+        return db.query(Task).filter(Task.board_id == board_id, Task.column_id == column_id).order_by(Task.position, Task.id).all()
     
-    def get_by_assigned_user(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Task]:
-        return db.query(Task).filter(Task.assignee_id == user_id).offset(skip).limit(limit).all()
+    def _column_scope(self, board_id: int, column_id: Optional[int]) -> list:
+        """Условия списка задач одной колонки (порядок рангов задается внутри колонки)"""
+        return [Task.board_id == board_id, Task.column_id == column_id]
     
-    def get_by_creator(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Task]:
-        return db.query(Task).filter(Task.creator_id == user_id).offset(skip).limit(limit).all()
+    def get_by_assigned_user(self, db: Session, user_id: int, skip: int = 0, limit: int = 100, tags: Optional[List[str]] = None, fields: Optional[FieldSelection] = None) -> List[Task]:
+        return self._with_fields(self._with_tags(db.query(Task).filter(Task.assignee_id == user_id), tags), fields).offset(skip).limit(limit).all()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100) -> List[Task]:
-        return db.query(Task).offset(skip).limit(limit).all()
+    def get_by_creator(self, db: Session, user_id: int, skip: int = 0, limit: int = 100, tags: Optional[List[str]] = None, fields: Optional[FieldSelection] = None) -> List[Task]:
+        return self._with_fields(self._with_tags(db.query(Task).filter(Task.creator_id == user_id), tags), fields).offset(skip).limit(limit).all()
+    
+    def get_all(self, db: Session, skip: int = 0, limit: int = 100, tags: Optional[List[str]] = None, fields: Optional[FieldSelection] = None) -> List[Task]:
+        return self._with_fields(self._with_tags(db.query(Task), tags), fields).offset(skip).limit(limit).all()
     
     def create(self, db: Session, task: TaskCreate, created_by_id: int) -> Task:
         # Конвертируем tags из списка в строку
-        tags_str = ','.join(task.tags) if task.tags else None
+        tags = split_tags(task.tags)
+        tags_str = ','.join(tags) if tags else None
         
         db_task = Task(
             title=task.title,
@@ -37,29 +66,51 @@ class TaskCRUD:
             assignee_id=task.assigned_to_id,
             creator_id=created_by_id,
             column_id=task.column_id,
-            parent_id=task.parent_id
+            parent_id=task.parent_id,
+            position=position_in(db, Task, self._column_scope(task.board_id, task.column_id))
         )
         db.add(db_task)
+        db.flush()
+        
+        # Нормализованные теги для фильтрации и частот
+        tag_crud.set_task_tags(db, db_task.id, tags)
+        
         db.commit()
         db.refresh(db_task)
+        invalidate_boards(db_task.board_id)
         return db_task
     
     def update(self, db: Session, task_id: int, task_update: TaskUpdate) -> Optional[Task]:
+        """
+        Обновить задачу. Если передана version, правка применяется только к этой
+        версии задачи, иначе VersionConflictError (см. app/crud/versioning.py).
+        """
         db_task = self.get_by_id(db, task_id)
         if not db_task:
             return None
         
         update_data = task_update.dict(exclude_unset=True)
+        check_version(db_task, update_data.pop('version', None))
         
         # Конвертируем tags из списка в строку, если они есть
+        tags = None
         if 'tags' in update_data and update_data['tags'] is not None:
-            update_data['tags'] = ','.join(update_data['tags'])
+            tags = split_tags(update_data['tags'])
+            update_data['tags'] = ','.join(tags) if tags else None
+        
+        if update_data.get('column_id') is not None and update_data['column_id'] != db_task.column_id:
+            # В новой колонке задача встает в конец
+            db_task.position = position_in(db, Task, self._column_scope(db_task.board_id, update_data['column_id']))
         
         for field, value in update_data.items():
             setattr(db_task, field, value)
         
-        db.commit()
+        if tags is not None:
+            tag_crud.set_task_tags(db, task_id, tags)
+        
+        commit_versioned(db, db_task)
         db.refresh(db_task)
+        invalidate_boards(db_task.board_id)
         return db_task
     
     def update_status(self, db: Session, task_id: int, column_id: int) -> Optional[Task]:
@@ -67,30 +118,243 @@ class TaskCRUD:
         if not db_task:
             return None
         
+        if column_id != db_task.column_id:
+            db_task.position = position_in(db, Task, self._column_scope(db_task.board_id, column_id))
         db_task.column_id = column_id
-        db.commit()
+        commit_versioned(db, db_task)
         db.refresh(db_task)
+        invalidate_boards(db_task.board_id)
         return db_task
     
+    def move(
+        self,
+        db: Session,
+        task_id: int,
+        column_id: Optional[int],
+        after_id: Optional[int] = None,
+        before_id: Optional[int] = None
+    ) -> Optional[Task]:
+        """
+        Перенести задачу в колонку после after_id и/или перед before_id
+        (без соседей - в конец колонки). Пишется только строка самой задачи.
+        LookupError - соседняя задача не в этой колонке,
+        VersionConflictError - задачу изменили параллельно.
+        """
+        db_task = self.get_by_id(db, task_id)
+        if not db_task:
+            return None
+        
+        db_task.position = position_in(
+            db, Task, self._column_scope(db_task.board_id, column_id),
+            moving_id=task_id, after_id=after_id, before_id=before_id
+        )
+        db_task.column_id = column_id
+        commit_versioned(db, db_task)
+        db.refresh(db_task)
+        invalidate_boards(db_task.board_id)
+        return db_task
+    
+    def rebalance_long_ranks(self, db: Session, max_length: int) -> int:
+        """Перебалансировать колонки, где ранги задач стали длиннее max_length"""
+        columns = db.query(Task.board_id, Task.column_id).filter(func.length(Task.position) > max_length).distinct().all()
+        for board_id, column_id in columns:
+            rebalance(db, Task, self._column_scope(board_id, column_id))
+        db.commit()
+        invalidate_boards(*{board_id for board_id, _ in columns})
+        return len(columns)
+    
     def delete(self, db: Session, task_id: int) -> bool:
         db_task = self.get_by_id(db, task_id)
         if not db_task:
             return False
         
+        # Снимаем теги, чтобы уменьшить счетчики частот
+        tag_crud.set_task_tags(db, task_id, [])
+        board_id = db_task.board_id
         db.delete(db_task)
         db.commit()
+        invalidate_boards(board_id)
         return True
     
-    def get_tasks_by_board_and_columns(self, db: Session, board_id: int) -> dict:
+    def get_board_ids(self, db: Session, task_ids: List[int]) -> Dict[int, int]:
+        """Доска каждой из задач (отсутствующих задач в словаре нет)"""
+        return dict(db.query(Task.id, Task.board_id).filter(Task.id.in_(task_ids)).all())
+    
+    def apply_bulk(
+        self,
+        db: Session,
+        operations: List[TaskBulkOperation],
+        board_by_task: Dict[int, int],
+        allowed_board_ids: Set[int]
+    ) -> List[dict]:
+        """
+        Применить массовые операции в одной транзакции.
+        Каждая операция - несколько UPDATE/DELETE по списку id, а не запрос на задачу.
+        Права проверены вызывающим кодом по доскам: allowed_board_ids.
+        Возвращает результат по каждой задаче каждой операции.
+        """
+        results = []
+        deleted: Set[int] = set()
+        changed_boards: Set[int] = set()
+        for index, operation in enumerate(operations):
+            task_ids = []
+            for task_id in dict.fromkeys(operation.task_ids):
+                board_id = board_by_task.get(task_id)
+                if board_id is None or task_id in deleted:
+                    results.append({"operation": index, "task_id": task_id, "status": "not_found", "detail": "Task not found"})
+                elif board_id not in allowed_board_ids:
+                    results.append({"operation": index, "task_id": task_id, "status": "forbidden", "detail": "Not enough permissions"})
+                else:
+                    task_ids.append(task_id)
+            
+            invalid = {}
+            if task_ids:
+                apply = getattr(self, f"_bulk_{operation.action}")
+                invalid = apply(db, operation, task_ids, board_by_task) or {}
+                changed_boards.update(board_by_task[task_id] for task_id in task_ids)
+            if operation.action == "delete":
+                deleted.update(task_ids)
+            for task_id in task_ids:
+                if task_id in invalid:
+                    results.append({"operation": index, "task_id": task_id, "status": "invalid", "detail": invalid[task_id]})
+                else:
+                    results.append({"operation": index, "task_id": task_id, "status": "ok", "detail": None})
+        
+        db.commit()
+        invalidate_boards(*changed_boards)
+        return results
+    
+    def _update_many(self, db: Session, task_ids: List[int], **values):
+        db.execute(
+            update(Task).where(Task.id.in_(task_ids)).values(**values, version=Task.version + 1),
+            execution_options={"synchronize_session": False}
+        )
+    
+    def _bulk_move(self, db: Session, operation: TaskBulkOperation, task_ids: List[int], board_by_task: Dict[int, int]) -> Dict[int, str]:
+        column = db.query(Column).filter(Column.id == operation.column_id).first() if operation.column_id else None
+        if column is None:
+            return {task_id: "Column not found" for task_id in task_ids}
+        invalid = {
+            task_id: "Column belongs to another board"
+            for task_id in task_ids if board_by_task[task_id] != column.board_id
+        }
+        movable = [task_id for task_id in task_ids if task_id not in invalid]
+        if movable:
+            # Переносимые задачи встают в конец колонки в порядке запроса
+            last = db.query(Task.position).filter(
+                *self._column_scope(column.board_id, column.id), Task.id.not_in(movable), Task.position.isnot(None)
+            ).order_by(Task.position.desc()).limit(1).scalar()
+            db.execute(
+                update(Task.__table__).where(Task.__table__.c.id == bindparam("task_id")).values(
+                    column_id=column.id, position=bindparam("new_position"), version=Task.__table__.c.version + 1
+                ),
+                [{"task_id": task_id, "new_position": rank} for task_id, rank in zip(movable, ranks_between(last, None, len(movable)))]
+            )
+        return invalid
+    
+    def _bulk_assign(self, db: Session, operation: TaskBulkOperation, task_ids: List[int], board_by_task: Dict[int, int]) -> Dict[int, str]:
+        if operation.assigned_to_id is not None and not db.query(User.id).filter(User.id == operation.assigned_to_id).first():
+            return {task_id: "User not found" for task_id in task_ids}
+        self._update_many(db, task_ids, assignee_id=operation.assigned_to_id)
+        return {}
+    
+    def _retag(self, db: Session, task_ids: List[int], change) -> None:
+        """Пересчитать строку tags и нормализованные связи для задач, у которых теги изменились"""
+        new_tags = {}
+        for task_id, current in db.query(Task.id, Task.tags).filter(Task.id.in_(task_ids)).all():
+            tags = change(split_tags(current))
+            if tags != split_tags(current):
+                new_tags[task_id] = tags
+        if not new_tags:
+            return
+        # executemany: драйвер отправляет UPDATE пачками
+        db.execute(
+            update(Task.__table__).where(Task.__table__.c.id == bindparam("task_id")).values(
+                tags=bindparam("new_tags"), version=Task.__table__.c.version + 1
+            ),
+            [{"task_id": task_id, "new_tags": ','.join(tags) if tags else None} for task_id, tags in new_tags.items()]
+        )
+        tag_crud.set_task_tags_bulk(db, new_tags)
+    
+    def _bulk_add_tags(self, db: Session, operation: TaskBulkOperation, task_ids: List[int], board_by_task: Dict[int, int]) -> Dict[int, str]:
+        added = split_tags(operation.tags)
+        if not added:
+            return {task_id: "Tags are required" for task_id in task_ids}
+        self._retag(db, task_ids, lambda tags: split_tags(tags + added))
+        return {}
+    
+    def _bulk_remove_tags(self, db: Session, operation: TaskBulkOperation, task_ids: List[int], board_by_task: Dict[int, int]) -> Dict[int, str]:
+        removed = {normalize_tag(tag) for tag in operation.tags}
+        if not removed:
+            return {task_id: "Tags are required" for task_id in task_ids}
+        self._retag(db, task_ids, lambda tags: [tag for tag in tags if normalize_tag(tag) not in removed])
+        return {}
+    
+    def _bulk_delete(self, db: Session, operation: TaskBulkOperation, task_ids: List[int], board_by_task: Dict[int, int]) -> Dict[int, str]:
+        # Снимаем теги, чтобы уменьшить счетчики частот
+        tag_crud.set_task_tags_bulk(db, {task_id: [] for task_id in task_ids})
+        # Как и при удалении одной задачи через ORM, подзадачи остаются без родителя
+        db.execute(
+            update(Task).where(Task.parent_id.in_(task_ids), Task.id.not_in(task_ids)).values(parent_id=None, version=Task.version + 1),
+            execution_options={"synchronize_session": False}
+        )
+        db.execute(delete(Task).where(Task.id.in_(task_ids)), execution_options={"synchronize_session": False})
+        return {}
+    
+    def get_tree(self, db: Session, board_id: Optional[int] = None, root_id: Optional[int] = None) -> List[dict]:
+        """
+        Дерево подзадач одним рекурсивным CTE: поддерево задачи root_id или все
+        деревья доски board_id (от задач без родителя). Если задан board_id, в дерево
+        попадают только задачи этой доски - подзадачи с чужих досок отсекаются.
+        Возвращает вложенные словари со списком children и агрегатами по поддереву каждого узла.
+        """
+        root_filter = Task.id == root_id if root_id is not None else Task.parent_id.is_(None)
+        board_filter = Task.board_id == board_id if board_id is not None else true()
+        node_columns = (
+            Task.id, Task.parent_id, Task.title, Task.status, Task.priority, Task.column_id,
+            Task.assignee_id.label("assigned_to_id"), Task.budget, Task.due_date, Task.position
+        )
+        tree = select(*node_columns, literal(0).label("depth")).where(root_filter, board_filter).cte("task_tree", recursive=True)
+        tree = tree.union_all(
+            select(*node_columns, (tree.c.depth + 1).label("depth"))
+            .join(tree, Task.parent_id == tree.c.id)
+            .where(tree.c.depth < MAX_TREE_DEPTH, board_filter)
+        )
+        rows = db.execute(select(tree).order_by(tree.c.depth, tree.c.position, tree.c.id)).mappings().all()
+        
+        nodes: Dict[int, dict] = {}
+        roots = []
+        links = []
+        for row in rows:
+            if row["id"] in nodes:
+                # Задача встретилась повторно - в parent_id цикл
+                continue
+            node = dict(row, children=[], subtask_count=0, done_count=0, total_budget=row["budget"] or 0)
+            del node["parent_id"], node["depth"]
+            nodes[row["id"]] = node
+            parent = nodes.get(row["parent_id"]) if row["depth"] else None
+            (parent["children"] if parent else roots).append(node)
+            if parent:
+                links.append((node, parent))
+        
+        # Узлы добавлялись по возрастанию глубины: в обратном порядке дети учитываются раньше родителей
+        for node, parent in reversed(links):
+            parent["subtask_count"] += node["subtask_count"] + 1
+            parent["done_count"] += node["done_count"] + (node["status"] == TaskStatusEnum.DONE.value)
+            parent["total_budget"] += node["total_budget"]
+        return roots
+    
+    def get_tasks_by_board_and_columns(self, db: Session, board_id: int, fields: Optional[FieldSelection] = None) -> dict:
         """Получить задачи, сгруппированные по колонкам для канбан-доски"""
-        tasks = self.get_by_board(db, board_id)
+        # column_id нужен для группировки, даже если его нет в ?fields=
+        query = self._with_fields(db.query(Task).filter(Task.board_id == board_id), fields, "column_id")
+        tasks = query.order_by(Task.column_id, Task.position, Task.id).limit(100).all()
         grouped_tasks = {}
         
         for task in tasks:
             if task.column_id:
-                if task.column_id not in grouped_tasks:
-                    grouped_tasks[task.column_id] = []
-                grouped_tasks[task.column_id].append(task)
+                # Ключи - строки, как в схеме ответа Dict[str, List[TaskResponse]]
+                grouped_tasks.setdefault(str(task.column_id), []).append(task)
         
         return grouped_tasks
 
@@ -0,0 +1,54 @@
+"""
+Оптимистичная блокировка задач и заказов.
+
+У строки есть счетчик version (version_id_col модели): каждый UPDATE из ORM
+выполняется как UPDATE ... SET version = version + 1 WHERE id = ? AND version = ?,
+поэтому параллельная запись обнаруживается без блокировок строк. Клиент передает
+version, которую видел; если строку с тех пор изменили, правка отклоняется с
+VersionConflictError, а API отвечает 409 с текущим состоянием. Если строку
+параллельно удалили, поднимается RowDeletedError (API отвечает 404).
+"""
+from typing import Optional
+
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import ObjectDeletedError, StaleDataError
+
+
+class VersionConflictError(Exception):
+    """Строку изменили после того, как ее прочитал клиент; current - актуальное состояние"""
+
+    def __init__(self, current):
+        super().__init__(f"{type(current).__name__} {current.id} was modified concurrently")
+        self.current = current
+
+
+class RowDeletedError(Exception):
+    """Строку удалили, пока ее правили"""
+
+    def __init__(self, obj):
+        super().__init__(f"{type(obj).__name__} not found")
+
+
+def check_version(obj, expected_version: Optional[int]) -> None:
+    """Версия, которую видел клиент, должна совпадать с загруженной (None - без проверки)"""
+    if expected_version is not None and obj.version != expected_version:
+        raise VersionConflictError(obj)
+
+
+def commit_versioned(db: Session, obj) -> None:
+    """
+    Commit изменений obj. Если строку успели изменить между чтением и записью,
+    UPDATE не находит строку с прежней версией - откатываемся и поднимаем
+    VersionConflictError с перечитанной строкой, а если строки больше нет -
+    RowDeletedError.
+    """
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        try:
+            db.refresh(obj)
+        except (InvalidRequestError, ObjectDeletedError):
+            raise RowDeletedError(obj) from None
+        raise VersionConflictError(obj)
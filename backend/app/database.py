@@ -1,16 +1,56 @@
-from sqlalchemy import create_engine
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.requests import Request
 from app.config import settings
+from app.profiling import install_sql_profiler
+from app.metrics import Gauge, Histogram, InstrumentedQueuePool, POOL_WAIT_BUCKETS, instrument_engine, pool_metrics, pool_snapshot, registry
+
+logger = logging.getLogger(__name__)
+
+
+def _create_engine(url: str, name: str, **connect_args) -> Engine:
+    """
+    Движок с общими настройками пула и сбором метрик пула.
+    Параметры libpq и размеры пула передаются только для PostgreSQL.
+    """
+    kwargs = {}
+    if url.startswith("postgresql"):
+        connect_args = {"options": "-c client_encoding=utf8", **connect_args}
+        kwargs = {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_use_lifo": settings.db_pool_use_lifo
+        }
+    else:
+        connect_args = {}
+    db_engine = create_engine(
+        url,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+        echo=settings.debug,
+        connect_args=connect_args,
+        **kwargs
+    )
+    instrument_engine(db_engine, name)
+    return db_engine
+
 
 # Создаем движок базы данных
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.debug,
-    connect_args={"options": "-c client_encoding=utf8"}
-)
+engine = _create_engine(settings.database_url, "primary")
+
+# Журнал медленных запросов работает на событиях движков (before/after_cursor_execute)
+if settings.slow_query_ms > 0:
+    install_sql_profiler()
 
 # Создаем фабрику сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -24,4 +64,180 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+# Отставание реплики в секундах: 0, если реплика догнала primary (или это не standby)
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+# Методы запросов, которые не меняют данные
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReplicaSet:
+    """
+    Реплики для чтения: выбор по кругу среди реплик с допустимым отставанием,
+    периодический замер отставания и окно read-your-writes после записи.
+
+    Окно read-your-writes хранится в памяти процесса: при нескольких воркерах
+    каждый из них отслеживает только запросы, прошедшие через него.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.urls = urls
+        self.engines = [
+            _create_engine(url, f"replica-{i}", connect_timeout=2)
+            for i, url in enumerate(urls, start=1)
+        ]
+        # None - реплика недоступна; до первого замера считаем, что отставания нет
+        self.lags: List[Optional[float]] = [0.0] * len(self.engines)
+        self._checked_at = 0.0
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._writes: Dict[str, float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def _measure_lag(self, replica: Engine) -> float:
+        if replica.dialect.name != "postgresql":
+            # Файлы SQLite в тестах и локальной разработке не отстают
+            return 0.0
+        with replica.connect() as conn:
+            return float(conn.execute(REPLICA_LAG_SQL).scalar() or 0)
+
+    def refresh_lag(self, force: bool = False):
+        """
+        Перемерить отставание реплик не чаще раза в replica_lag_check_seconds.
+
+        Под блокировкой замер только занимается (остальные потоки сразу читают
+        прежние lags), сами подключения к репликам идут без нее, иначе pick()
+        ждал бы connect_timeout недоступной реплики.
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._checked_at < settings.replica_lag_check_seconds:
+                return
+            self._checked_at = time.monotonic()
+            engines = list(self.engines)
+            previous = list(self.lags)
+        lags: List[Optional[float]] = []
+        for replica, was in zip(engines, previous):
+            try:
+                lag = self._measure_lag(replica)
+            except Exception as e:
+                lag = None
+                if was is not None:
+                    logger.warning(f"Реплика {replica.url!r} недоступна: {e}")
+            if lag is not None and lag > settings.replica_max_lag_seconds:
+                logger.warning(f"Реплика {replica.url!r} отстает на {lag:.1f} с")
+            lags.append(lag)
+        with self._lock:
+            self.lags = lags
+            self._checked_at = time.monotonic()
+
+    def pick(self) -> Optional[Engine]:
+        """Реплика для чтения или None, если подходящих нет (тогда читаем с primary)"""
+        if not self.enabled:
+            return None
+        self.refresh_lag()
+        healthy = [
+            replica for replica, lag in zip(self.engines, self.lags)
+            if lag is not None and lag <= settings.replica_max_lag_seconds
+        ]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def note_write(self, key: Optional[str]):
+        """Запомнить запись клиента: его чтения пойдут на primary до конца окна"""
+        if not self.enabled or not key:
+            return
+        now = time.monotonic()
+        self._writes[key] = now
+        if len(self._writes) > 10000:
+            window = settings.read_your_writes_seconds
+            self._writes = {k: t for k, t in self._writes.items() if now - t < window}
+
+    def wrote_recently(self, key: Optional[str]) -> bool:
+        written_at = self._writes.get(key) if key else None
+        return written_at is not None and time.monotonic() - written_at < settings.read_your_writes_seconds
+
+    def get_status(self) -> List[Dict]:
+        """Состояние реплик для мониторинга"""
+        self.refresh_lag()
+        return [
+            {
+                "url": replica.url.render_as_string(hide_password=True),
+                "lag_seconds": lag,
+                "healthy": lag is not None and lag <= settings.replica_max_lag_seconds
+            }
+            for replica, lag in zip(self.engines, self.lags)
+        ]
+
+
+replicas = ReplicaSet(settings.replica_urls)
+
+
+def get_pool_stats() -> List[Dict]:
+    """Состояние пулов соединений процесса (primary и реплики)"""
+    stats = [pool_snapshot(engine, "primary")]
+    for i, replica in enumerate(replicas.engines, start=1):
+        stats.append(pool_snapshot(replica, f"replica-{i}"))
+    return stats
+
+
+def _collect_pool_metrics():
+    """Метрики пулов для /metrics"""
+    gauges = {
+        key: Gauge(f"db_pool_{key}", f"DB connection pool {key.replace('_', ' ')}", ("pool",), register=False)
+        for key in ("size", "checked_out", "checked_in", "overflow", "peak_checked_out", "timeouts", "connects", "invalidations")
+    }
+    wait = Histogram("db_pool_checkout_seconds", "Time to check out a DB connection from the pool", ("pool",),
+                     buckets=POOL_WAIT_BUCKETS, register=False)
+    for stats in get_pool_stats():
+        for key, gauge in gauges.items():
+            if key in stats:
+                gauge.set(stats[key], stats["name"])
+        if stats["name"] in pool_metrics:
+            wait.set_child(pool_metrics[stats["name"]].wait, stats["name"])
+    return [*gauges.values(), wait]
+
+
+registry.register_collector(_collect_pool_metrics)
+
+
+def _forbid_writes(session, flush_context, instances):
+    raise RuntimeError("Сессия реплики предназначена только для чтения")
+
+
+def writer_key(request: Request) -> Optional[str]:
+    """Ключ клиента для read-your-writes: токен авторизации"""
+    return request.headers.get("authorization")
+
+
+def read_session(primary: bool = False) -> Session:
+    """
+    Сессия только для чтения: на реплике, если есть подходящая, иначе на primary
+    """
+    replica = None if primary else replicas.pick()
+    if replica is None:
+        return SessionLocal()
+    db = SessionLocal(bind=replica)
+    event.listen(db, "before_flush", _forbid_writes)
+    return db
+
+
+# Dependency для тяжелых чтений (списки, статистика, поиск)
+def get_read_db(request: Request):
+    db = read_session(primary=replicas.wrote_recently(writer_key(request)))
+    try:
+        yield db
+    finally:
+        db.close()
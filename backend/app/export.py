@@ -0,0 +1,115 @@
+"""
+Потоковая выгрузка задач, заказов, досок и пользователей в CSV и NDJSON.
+
+Строки читаются курсором на стороне сервера (yield_per) пачками по
+settings.export_batch_size и сразу отдаются клиенту через StreamingResponse:
+память воркера не зависит от размера выгрузки. Читаются только колонки
+(Core select, без ORM-объектов и identity map).
+
+Генератор открывает собственную сессию (реплику, если она есть): выгрузка
+длится дольше запроса, который ее начал. CompressionMiddleware сжимает поток
+на лету.
+"""
+import csv
+import enum
+import io
+from datetime import date, datetime
+from typing import Iterator, Literal
+
+import orjson
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+from app.config import settings
+from app.database import read_session, replicas, writer_key
+from app.models.board import Board
+from app.models.order import Order
+from app.models.task import Task
+from app.models.user import User
+
+ExportFormat = Literal["csv", "ndjson"]
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson"
+}
+
+# Выгружаемые колонки; пароли и персональные поля пользователей не выгружаются
+EXPORT_COLUMNS = {
+    "tasks": (Task, (
+        "id", "title", "description", "status", "type", "priority", "budget", "due_date", "tags",
+        "board_id", "column_id", "parent_id", "position", "assignee_id", "creator_id", "created_at", "updated_at"
+    )),
+    "orders": (Order, (
+        "id", "title", "description", "budget", "deadline", "priority", "status", "tags",
+        "creator_id", "assigned_executor_id", "created_at", "updated_at", "completed_at"
+    )),
+    "boards": (Board, ("id", "title", "description", "is_public", "is_active", "creator_id", "created_at", "updated_at")),
+    "users": (User, (
+        "id", "username", "full_name", "role", "is_active", "is_superuser", "is_banned",
+        "rating", "completed_tasks", "created_at", "last_activity"
+    ))
+}
+
+# Ячейки, которые табличный редактор принял бы за формулу
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def export_statement(entity: str, *criteria) -> Select:
+    """SELECT выгружаемых колонок сущности в порядке id"""
+    model, columns = EXPORT_COLUMNS[entity]
+    return select(*[getattr(model, name) for name in columns]).where(*criteria).order_by(model.id)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_chunk(columns, rows) -> bytes:
+    return b"".join(
+        orjson.dumps(dict(zip(columns, row)), option=orjson.OPT_APPEND_NEWLINE) for row in rows
+    )
+
+
+def stream_export(statement: Select, fmt: ExportFormat, primary: bool = False) -> Iterator[bytes]:
+    """Выгрузка пачками: один фрагмент ответа на пачку строк курсора"""
+    db = read_session(primary=primary)
+    try:
+        result = db.execute(statement.execution_options(yield_per=settings.export_batch_size))
+        columns = list(result.keys())
+        if fmt == "csv":
+            yield _csv_chunk([columns])
+        for rows in result.partitions():
+            yield _csv_chunk(rows) if fmt == "csv" else _ndjson_chunk(columns, rows)
+    finally:
+        db.close()
+
+
+def export_response(request: Request, entity: str, fmt: ExportFormat, filename: str, *criteria) -> StreamingResponse:
+    """
+    StreamingResponse с выгрузкой сущности entity (строки, подходящие под criteria).
+    Читает с реплики, как get_read_db: с primary, если клиент недавно писал.
+    """
+    primary = replicas.wrote_recently(writer_key(request))
+    return StreamingResponse(
+        stream_export(export_statement(entity, *criteria), fmt, primary=primary),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
@@ -1,13 +1,23 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from fastapi.utils import is_body_allowed_for_status_code
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.responses import Response
 from app.config import settings
-from app.database import engine, Base
-from app.api import auth, users, boards, tasks, columns, admin, orders, proposals, messages, telegram
+from app.database import engine, Base, replicas, writer_key, SAFE_METHODS
+from app.responses import UTF8JSONResponse
+from app.profiling import install_sql_profiler, profile_scope
+from app.crud.versioning import RowDeletedError, VersionConflictError
+from app.schemas.task import TaskResponse
+from app.schemas.order import OrderResponse
+from app.compression import CompressionMiddleware
+from app.metrics import MetricsMiddleware, metrics_authorized, registry, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from app.api import auth, users, boards, tasks, columns, admin, orders, proposals, messages, telegram, search, tags, metrics
 # Импортируем все модели для их регистрации
 from app.models import User, Board, Task, Order, Proposal, Message
 import logging
+import time
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO)
@@ -22,19 +32,15 @@ app = FastAPI(
     description="API для управления задачами с дедлайнами и системой заказов",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=UTF8JSONResponse
 )
 
-# Health check endpoint
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy"}
-
 # Обработчик ошибок валидации
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     logger.error(f"Validation error: {exc.errors()}")
-    return JSONResponse(
+    return UTF8JSONResponse(
         status_code=422,
         content={
             "detail": "Validation error",
@@ -49,17 +55,71 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         }
     )
 
+# Обработчик HTTP ошибок: тот же ответ, что и по умолчанию, но с кодировкой в content-type
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    headers = getattr(exc, "headers", None)
+    if not is_body_allowed_for_status_code(exc.status_code):
+        return Response(status_code=exc.status_code, headers=headers)
+    return UTF8JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=headers
+    )
+
 # Обработчик ValueError
 @app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
     logger.error(f"ValueError: {str(exc)}")
-    return JSONResponse(
+    return UTF8JSONResponse(
         status_code=400,
         content={
             "detail": str(exc)
         }
     )
 
+# Конфликт оптимистичной блокировки: клиент получает актуальное состояние и может повторить правку
+VERSIONED_RESPONSES = {Task: TaskResponse, Order: OrderResponse}
+
+@app.exception_handler(VersionConflictError)
+async def version_conflict_handler(request: Request, exc: VersionConflictError):
+    logger.info(f"Version conflict: {exc}")
+    schema = VERSIONED_RESPONSES[type(exc.current)]
+    return UTF8JSONResponse(
+        status_code=409,
+        content={
+            "detail": "Resource was modified by another request",
+            "current": schema.model_validate(exc.current).model_dump(mode="json")
+        }
+    )
+
+@app.exception_handler(RowDeletedError)
+async def row_deleted_handler(request: Request, exc: RowDeletedError):
+    logger.info(f"Row deleted during update: {exc}")
+    return UTF8JSONResponse(status_code=404, content={"detail": str(exc)})
+
+# Read-your-writes: после успешной записи чтения клиента какое-то время идут на primary
+@app.middleware("http")
+async def track_writes_middleware(request: Request, call_next):
+    response = await call_next(request)
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        replicas.note_write(writer_key(request))
+    return response
+
+# Профилирование SQL: число запросов и время в базе в Server-Timing, предупреждения о N+1
+if settings.sql_profiling:
+    install_sql_profiler()
+    
+    @app.middleware("http")
+    async def sql_profiling_middleware(request: Request, call_next):
+        started = time.perf_counter()
+        with profile_scope() as stats:
+            response = await call_next(request)
+        total = (time.perf_counter() - started) * 1000
+        response.headers.append("Server-Timing", f"{stats.server_timing()}, app;dur={total:.2f}")
+        stats.warn_repeats(f"{request.method} {request.url.path}")
+        return response
+
 # Настройка CORS с улучшенной безопасностью
 app.add_middleware(
     CORSMiddleware,
@@ -68,16 +128,14 @@ app.add_middleware(
     allow_methods=settings.allowed_methods,
     allow_headers=settings.allowed_headers,
     max_age=settings.max_age,
-    expose_headers=["Content-Length", "Content-Range"]
+    expose_headers=["Content-Length", "Content-Range", "Server-Timing"]
 )
 
-# Middleware для правильной обработки кодировки
-@app.middleware("http")
-async def add_charset_middleware(request: Request, call_next):
-    response = await call_next(request)
-    if "application/json" in response.headers.get("content-type", ""):
-        response.headers["content-type"] = "application/json; charset=utf-8"
-    return response
+# Сжатие ответов по Accept-Encoding (gzip/brotli/zstd) от COMPRESSION_MIN_SIZE байт
+app.add_middleware(CompressionMiddleware)
+
+# Метрики HTTP-запросов (добавляется последним, чтобы учитывать время всех middleware)
+app.add_middleware(MetricsMiddleware)
 
 # Подключаем роуты
 app.include_router(auth.router, prefix="/api/v1")
@@ -90,6 +148,9 @@ app.include_router(orders.router, prefix="/api/v1")
 app.include_router(proposals.router, prefix="/api/v1")
 app.include_router(messages.router, prefix="/api/v1")
 app.include_router(telegram.router, prefix="/api/v1")
+app.include_router(search.router, prefix="/api/v1")
+app.include_router(tags.router, prefix="/api/v1")
+app.include_router(metrics.router, prefix="/api/v1")
 
 @app.get("/")
 async def root():
@@ -106,6 +167,13 @@ async def health_check():
     """Проверка здоровья API"""
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Метрики в формате Prometheus"""
+    if not metrics_authorized(request.headers.get("authorization")):
+        return Response(status_code=401)
+    return Response(registry.render(), headers={"Content-Type": METRICS_CONTENT_TYPE})
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
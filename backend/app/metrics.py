@@ -0,0 +1,387 @@
+"""
+Метрики процесса в формате Prometheus: счетчики, gauge и гистограммы задержек,
+инструментирование пула соединений БД и ASGI-middleware для HTTP-запросов.
+
+Без внешних зависимостей: наблюдение - поиск корзины и инкремент в словаре.
+Блокировок нет, под GIL возможна потеря единичных инкрементов при гонке потоков,
+для мониторинга это допустимо.
+"""
+import bisect
+import secrets
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.config import settings
+from app.profiling import operation_scope
+
+# Границы корзин гистограммы задержек (секунды)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Ожидание соединения из пула обычно укладывается в доли миллисекунды
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """
+    Гистограмма задержек (кумулятивные корзины, как в Prometheus)
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool = False):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if error:
+            self.errors += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Оценка квантиля по верхней границе корзины"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict:
+        cumulative = []
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            cumulative.append((bound, seen))
+        cumulative.append((float("inf"), self.count))
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "sum": self.total,
+            "avg": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": cumulative
+        }
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    """
+    Семейство метрик с метками; значения хранятся по кортежу значений меток
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), register: bool = True):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        if register:
+            registry.register(self)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Монотонный счетчик"""
+
+    type = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+
+class Gauge(Metric):
+    """Текущее значение (может уменьшаться)"""
+
+    type = "gauge"
+
+    def set(self, value: float, *labels):
+        self._values[labels] = value
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    """Гистограмма задержек с метками"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets=LATENCY_BUCKETS, register: bool = True):
+        super().__init__(name, documentation, labelnames, register)
+        self.buckets = buckets
+        self._children: Dict[Tuple, LatencyHistogram] = {}
+
+    def labels(self, *labels) -> LatencyHistogram:
+        """Гистограмма для набора меток (можно сохранить и наблюдать напрямую)"""
+        child = self._children.get(labels)
+        if child is None:
+            child = self._children[labels] = LatencyHistogram(self.buckets)
+        return child
+
+    def observe(self, seconds: float, *labels, error: bool = False):
+        self.labels(*labels).observe(seconds, error)
+
+    def set_child(self, histogram: LatencyHistogram, *labels):
+        """Экспортировать готовую гистограмму (например, собранную пулом соединений)"""
+        self._children[labels] = histogram
+
+    def children(self) -> Dict[Tuple, LatencyHistogram]:
+        return self._children
+
+    def samples(self) -> Iterable[str]:
+        for labels, histogram in list(self._children.items()):
+            seen = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                seen += count
+                le = f'le="{_format_value(float(bound))}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {seen}"
+            inf = 'le="+Inf"'
+            yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, inf)} {histogram.count}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(histogram.total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {histogram.count}"
+
+
+class Registry:
+    """
+    Реестр метрик процесса. Коллекторы вызываются при каждом снятии метрик
+    и возвращают метрики, посчитанные на лету (например, состояние пула).
+    """
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, metric: Metric):
+        self._metrics.append(metric)
+
+    def register_collector(self, collector: Callable[[], Iterable[Metric]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Текст в формате Prometheus exposition 0.0.4"""
+        metrics = list(self._metrics)
+        for collector in self._collectors:
+            metrics.extend(collector())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+registry = Registry()
+
+# Формат ответа для Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_authorized(authorization: Optional[str]) -> bool:
+    """Проверка токена METRICS_TOKEN (если он не задан, метрики открыты)"""
+    if not settings.metrics_token:
+        return True
+    return secrets.compare_digest(authorization or "", f"Bearer {settings.metrics_token}")
+
+# HTTP API
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"))
+HTTP_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP requests currently being processed")
+
+# Кэши: result = hit | miss | wait (снимок собрал другой запрос)
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache and result", ("cache", "result"))
+
+# Бот
+BOT_UPDATES = Counter("bot_updates_total", "Bot updates by handler and result", ("handler", "result"))
+BOT_HANDLER_LATENCY = Histogram("bot_handler_duration_seconds", "Bot update processing latency by handler", ("handler",))
+TELEGRAM_REQUESTS = Counter("telegram_requests_total", "Outbound Telegram Bot API calls by method and result", ("method", "result"))
+TELEGRAM_LATENCY = Histogram("telegram_request_duration_seconds", "Outbound Telegram Bot API call latency", ("method",))
+BOT_API_LATENCY = Histogram("bot_api_request_duration_seconds", "Bot to API request latency by endpoint", ("endpoint",))
+
+# Планировщик
+SCHEDULER_JOB_RUNS = Counter("scheduler_job_runs_total", "Scheduler job runs by result", ("job", "result"))
+SCHEDULER_JOB_LATENCY = Histogram("scheduler_job_duration_seconds", "Scheduler job duration", ("job",),
+                                  buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0))
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware: задержка и число запросов по шаблону маршрута, запросы в работе.
+    Шаблон берется из scope["route"], который заполняет роутер FastAPI.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc()
+        started = time.perf_counter()
+        try:
+            with operation_scope(f"{scope['method']} {scope['path']}"):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_PROGRESS.dec()
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_LATENCY.observe(time.perf_counter() - started, method, template, error=status_code >= 500)
+            HTTP_REQUESTS.inc(method, template, status_code)
+
+
+def timed_job(job_id: str, func: Callable) -> Callable:
+    """Обернуть задачу планировщика замером длительности"""
+    histogram = SCHEDULER_JOB_LATENCY.labels(job_id)
+
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        result = "ok"
+        try:
+            with operation_scope(f"job {job_id}"):
+                return await func(*args, **kwargs)
+        except Exception:
+            result = "error"
+            raise
+        finally:
+            histogram.observe(time.perf_counter() - started, error=result == "error")
+            SCHEDULER_JOB_RUNS.inc(job_id, result)
+
+    wrapper.__name__ = getattr(func, "__name__", job_id)
+    return wrapper
+
+
+class PoolMetrics:
+    """
+    Счетчики пула соединений одного движка
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wait = LatencyHistogram(POOL_WAIT_BUCKETS)
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.peak_checked_out = 0
+
+
+# Метрики пулов процесса по имени движка ("primary", "replica-1", ...)
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool, замеряющий время получения соединения и таймауты ожидания.
+    В замер входит pre-ping, если он включен: это тоже часть задержки checkout.
+    """
+
+    metrics: Optional[PoolMetrics] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            if self.metrics is not None:
+                self.metrics.wait.observe(time.perf_counter() - started, error=True)
+                self.metrics.timeouts += 1
+            raise
+        if self.metrics is not None:
+            self.metrics.wait.observe(time.perf_counter() - started)
+            self.metrics.peak_checked_out = max(self.metrics.peak_checked_out, self.checkedout())
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def instrument_engine(engine: Engine, name: str):
+    """Подключить сбор метрик к пулу движка"""
+    metrics = pool_metrics[name] = PoolMetrics(name)
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+
+def pool_snapshot(engine: Engine, name: str) -> Dict:
+    """Текущее состояние пула и накопленные счетчики"""
+    pool = engine.pool
+    metrics = pool_metrics.get(name) or PoolMetrics(name)
+    snapshot = {"name": name, "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        snapshot.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0)
+        })
+    snapshot.update({
+        "peak_checked_out": metrics.peak_checked_out,
+        "timeouts": metrics.timeouts,
+        "connects": metrics.connects,
+        "invalidations": metrics.invalidations,
+        "wait_seconds": metrics.wait.snapshot()
+    })
+    return snapshot
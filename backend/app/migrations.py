@@ -0,0 +1,130 @@
+"""
+Операции для онлайн-миграций Alembic.
+
+Обычная миграция выполняется в одной транзакции и держит блокировки до ее конца.
+Для больших таблиц это недопустимо, поэтому здесь собраны операции, которые
+выходят из транзакции миграции (autocommit_block):
+
+- create_index_concurrently / drop_index_concurrently - индекс строится без
+  блокировки записи в таблицу;
+- backfill_in_batches - UPDATE по диапазонам первичного ключа, каждая пачка
+  фиксируется отдельно и держит блокировки строк только на время пачки.
+
+Все операции идемпотентны (IF [NOT] EXISTS, повторное заполнение не трогает
+уже заполненные строки), поэтому прерванную миграцию можно просто перезапустить.
+"""
+import logging
+import time
+from typing import Optional, Sequence
+
+from alembic import op
+from sqlalchemy import text
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    where: Optional[str] = None,
+    using: Optional[str] = None,
+    unique: bool = False
+):
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS вне транзакции миграции.
+
+    Если прошлая попытка построения прервалась, PostgreSQL оставляет невалидный
+    индекс с тем же именем - он удаляется и строится заново.
+
+    В других базах индекс строится обычным CREATE INDEX. Частичный индекс (where)
+    поддерживает еще SQLite; where в остальных базах и using вне PostgreSQL
+    поднимают ValueError, чтобы не построить молча другой индекс.
+    """
+    if not _is_postgresql():
+        dialect = op.get_bind().dialect.name
+        if using or (where and dialect != "sqlite"):
+            raise ValueError(f"Индекс {name}: параметры where/using не поддерживаются в {dialect}")
+        kwargs = {"sqlite_where": text(where)} if where else {}
+        op.create_index(name, table, list(columns), unique=unique, **kwargs)
+        return
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        invalid = conn.execute(
+            text("SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                 "WHERE c.relname = :name AND NOT i.indisvalid"),
+            {"name": name}
+        ).scalar()
+        if invalid:
+            logger.warning(f"Индекс {name} остался невалидным после прерванной сборки, пересоздаем")
+            conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        statement = (
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} "
+            f"ON {table}{f' USING {using}' if using else ''} ({', '.join(columns)})"
+        )
+        if where:
+            statement += f" WHERE {where}"
+        conn.exec_driver_sql(statement)
+
+
+def drop_index_concurrently(name: str, table: Optional[str] = None):
+    """DROP INDEX CONCURRENTLY IF EXISTS вне транзакции миграции"""
+    if not _is_postgresql():
+        op.drop_index(name, table_name=table, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        op.get_bind().exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def backfill_in_batches(
+    table: str,
+    set_clause: str,
+    where: str,
+    batch_size: Optional[int] = None,
+    pause: float = 0.0,
+    key: str = "id"
+) -> int:
+    """
+    UPDATE {table} SET {set_clause} WHERE {where} пачками по первичному ключу.
+
+    where должен отбирать только еще не заполненные строки (например
+    "rank IS NULL"), тогда повторный запуск продолжит с места остановки.
+    pause - пауза между пачками, чтобы не забивать WAL и реплики.
+    Возвращает число обновленных строк.
+    """
+    batch_size = batch_size or settings.migration_batch_size
+    total = 0
+    started = time.perf_counter()
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        last_key = None
+        while True:
+            bound = conn.execute(
+                text(
+                    f"SELECT max({key}) FROM (SELECT {key} FROM {table} "
+                    f"WHERE ({where}){f' AND {key} > :last_key' if last_key is not None else ''} "
+                    f"ORDER BY {key} LIMIT :batch_size) AS batch"
+                ),
+                {"last_key": last_key, "batch_size": batch_size}
+            ).scalar()
+            if bound is None:
+                break
+            result = conn.execute(
+                text(
+                    f"UPDATE {table} SET {set_clause} WHERE ({where}) AND {key} <= :bound"
+                    f"{f' AND {key} > :last_key' if last_key is not None else ''}"
+                ),
+                {"last_key": last_key, "bound": bound}
+            )
+            total += result.rowcount
+            last_key = bound
+            if pause:
+                time.sleep(pause)
+    logger.info(f"{table}: заполнено {total} строк за {time.perf_counter() - started:.1f} с")
+    return total
@@ -6,10 +6,14 @@ from .task_type import TaskTypeEnum, TaskType
 from .column import Column
 from .order import Order, OrderStatus, OrderPriority
 from .proposal import Proposal, ProposalStatus
-from .message import Message
+from .message import Message, MessageArchive
+from .tag import Tag, user_skills, order_tags, task_tags
+from .broadcast import Broadcast, BroadcastRecipient, BroadcastStatus, DeliveryStatus
 
 __all__ = [
     "User", "UserRole", "JuridicalType", "PaymentType", "NotificationType", 
     "Board", "Task", "TaskStatusEnum", "TaskTypeEnum", "TaskStatus", "TaskType", "Column",
-    "Order", "OrderStatus", "OrderPriority", "Proposal", "ProposalStatus", "Message"
+    "Order", "OrderStatus", "OrderPriority", "Proposal", "ProposalStatus", "Message", "MessageArchive",
+    "Tag", "user_skills", "order_tags", "task_tags",
+    "Broadcast", "BroadcastRecipient", "BroadcastStatus", "DeliveryStatus"
 ]
\ No newline at end of file
@@ -0,0 +1,63 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+import enum
+
+class BroadcastStatus(enum.Enum):
+    PENDING = "pending"       # Получатели сформированы, рассылка не запускалась
+    RUNNING = "running"       # Идет отправка
+    COMPLETED = "completed"   # Все получатели обработаны
+    FAILED = "failed"         # Рассылка прервана ошибкой, можно возобновить
+
+class DeliveryStatus(enum.Enum):
+    PENDING = "pending"   # Ожидает отправки
+    SENT = "sent"         # Доставлено
+    FAILED = "failed"     # Ошибка отправки
+    BLOCKED = "blocked"   # Пользователь заблокировал бота
+
+class Broadcast(Base):
+    __tablename__ = "broadcasts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    text = Column(Text, nullable=False)
+    status = Column(String(20), default=BroadcastStatus.PENDING.value)
+
+    # Фильтры сегмента
+    filter_role = Column(String(20), nullable=True)
+    filter_skills = Column(String, nullable=True)  # JSON строка со списком навыков
+    active_within_days = Column(Integer, nullable=True)
+
+    # Прогресс
+    total_recipients = Column(Integer, default=0)
+    sent_count = Column(Integer, default=0)
+    failed_count = Column(Integer, default=0)
+
+    creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    creator = relationship("User", foreign_keys=[creator_id])
+    recipients = relationship("BroadcastRecipient", back_populates="broadcast", cascade="all, delete-orphan")
+
+class BroadcastRecipient(Base):
+    __tablename__ = "broadcast_recipients"
+
+    id = Column(Integer, primary_key=True, index=True)
+    broadcast_id = Column(Integer, ForeignKey("broadcasts.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    telegram_id = Column(Integer, nullable=False)
+    status = Column(String(20), default=DeliveryStatus.PENDING.value)
+    error = Column(String(255), nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Один пользователь получает рассылку один раз; индекс по статусу
+    # позволяет возобновлять отправку с места остановки без полного скана
+    __table_args__ = (
+        UniqueConstraint('broadcast_id', 'user_id', name='uq_broadcast_recipient'),
+        Index('ix_broadcast_recipients_status', 'broadcast_id', 'status', 'id'),
+    )
+
+    broadcast = relationship("Broadcast", back_populates="recipients")
@@ -1,6 +1,20 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.rank import rank_column
+
+
+class DeferredUniqueConstraint(UniqueConstraint):
+    """UNIQUE с проверкой при commit; в SQLite (нет DEFERRABLE) - обычный UNIQUE"""
+    inherit_cache = True
+
+
+@compiles(DeferredUniqueConstraint, "sqlite")
+def _compile_deferred_unique_sqlite(constraint, compiler, **kw):
+    columns = ", ".join(compiler.preparer.quote(column.name) for column in constraint.columns)
+    return f"CONSTRAINT {compiler.preparer.format_constraint(constraint)} UNIQUE ({columns})"
+
 
 class Column(Base):
     __tablename__ = "columns"
@@ -8,12 +22,19 @@ class Column(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)  # Изменено с name на title
     order_index = Column(Integer, index=True)  # Изменено с order на order_index
+    position = rank_column()  # Порядок колонок на доске
 
     board_id = Column(Integer, ForeignKey("boards.id", ondelete="CASCADE"), nullable=False)
 
     # Составной уникальный индекс: имя колонки должно быть уникальным в рамках одной доски
     __table_args__ = (
         UniqueConstraint('title', 'board_id', name='uq_column_title_per_board'),  # Изменено с name на title
+        # Номер колонки уникален на доске; проверка отложена до commit, чтобы
+        # перестановка одним UPDATE могла обменять номера колонок
+        DeferredUniqueConstraint('board_id', 'order_index', name='uq_column_order_per_board',
+                                 deferrable=True, initially='DEFERRED'),
+        # Колонки доски по порядку
+        Index('ix_columns_board_position', 'board_id', 'position'),
     )
 
     board = relationship("Board", back_populates="columns")
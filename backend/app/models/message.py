@@ -1,10 +1,22 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.database import Base
+from app.models.search import search_vector_column
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_search_vector", "search_vector", postgresql_using="gin"),
+        # История чата заказа
+        Index("ix_messages_order_created_at", "order_id", "created_at"),
+        # Сообщения пользователя (OR по отправителю и получателю) и общий список
+        Index("ix_messages_sender_created_at", "sender_id", "created_at"),
+        Index("ix_messages_receiver_created_at", "receiver_id", "created_at"),
+        Index("ix_messages_created_at", "created_at"),
+        # Счетчики непрочитанных: в индексе только непрочитанные сообщения
+        Index("ix_messages_receiver_unread", "receiver_id", "order_id", postgresql_where=text("NOT is_read")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     order_id = Column(Integer, nullable=False)  # Внешний ключ определен в базе данных
@@ -12,10 +24,37 @@ class Message(Base):
     receiver_id = Column(Integer, nullable=True)  # Внешний ключ определен в базе данных
     content = Column(Text, nullable=False)
     is_read = Column(Boolean, default=False)
+    search_vector = search_vector_column("content")  # Полнотекстовый поиск
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Отношения (добавляются после загрузки всех моделей)
     # order = relationship("Order", back_populates="messages")
     # sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_messages")
-    # receiver = relationship("User", foreign_keys=[receiver_id], back_populates="received_messages") 
\ No newline at end of file
+    # receiver = relationship("User", foreign_keys=[receiver_id], back_populates="received_messages")
+
+
+class MessageArchive(Base):
+    """
+    Архив сообщений закрытых (завершенных и отмененных) заказов.
+
+    Сообщения переносит фоновая задача MessageCRUD.archive_old, id сохраняются.
+    Архив читается только при прокрутке истории дальше горячей таблицы, поэтому
+    в нем нет полнотекстового индекса и индексов непрочитанных.
+    """
+    __tablename__ = "messages_archive"
+    __table_args__ = (
+        Index("ix_messages_archive_order_created_at", "order_id", "created_at"),
+        Index("ix_messages_archive_sender_created_at", "sender_id", "created_at"),
+        Index("ix_messages_archive_receiver_created_at", "receiver_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # id из messages
+    order_id = Column(Integer, nullable=False)
+    sender_id = Column(Integer, nullable=False)
+    receiver_id = Column(Integer, nullable=True)
+    content = Column(Text, nullable=False)
+    is_read = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
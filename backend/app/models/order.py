@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from app.models.search import search_vector_column
 import enum
 
 class OrderStatus(enum.Enum):
@@ -18,6 +19,14 @@ class OrderPriority(enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_search_vector", "search_vector", postgresql_using="gin"),
+        # Списки заказов: фильтр + сортировка по created_at (индекс читается в обратном порядке для DESC)
+        Index("ix_orders_status_created_at", "status", "created_at"),
+        Index("ix_orders_creator_created_at", "creator_id", "created_at"),
+        Index("ix_orders_executor_created_at", "assigned_executor_id", "created_at"),
+        Index("ix_orders_created_at", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -27,6 +36,10 @@ class Order(Base):
     priority = Column(String(20), default=OrderPriority.MEDIUM.value)
     status = Column(String(20), default=OrderStatus.OPEN.value)
     tags = Column(String, nullable=True)  # JSON строка с тегами
+    # Счетчик правок: ORM пишет UPDATE ... WHERE id = ? AND version = ? (app/crud/versioning.py)
+    version = Column(Integer, nullable=False, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
+    search_vector = search_vector_column("title", "description")  # Полнотекстовый поиск
     
     # Foreign Keys
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -36,6 +49,7 @@ class Order(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    matched_at = Column(DateTime(timezone=True), nullable=True)  # Когда подобранные исполнители были уведомлены
     
     # Relationships
     creator = relationship("User", foreign_keys=[creator_id], back_populates="created_orders")
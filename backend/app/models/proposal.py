@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text, Enum, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.database import Base
 import enum
 
@@ -12,6 +12,13 @@ class ProposalStatus(enum.Enum):
 
 class Proposal(Base):
     __tablename__ = "proposals"
+    __table_args__ = (
+        # Списки предложений: фильтр + сортировка по created_at
+        Index("ix_proposals_order_created_at", "order_id", "created_at"),
+        Index("ix_proposals_user_created_at", "user_id", "created_at"),
+        Index("ix_proposals_created_at", "created_at"),
+        Index("ix_proposals_pending_created_at", "created_at", postgresql_where=text("status = 'pending'")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     description = Column(Text, nullable=False)  # Изменено с message на description
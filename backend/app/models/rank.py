@@ -0,0 +1,9 @@
+from sqlalchemy import Column, String
+
+def rank_column():
+    """
+    Колонка дробного ранга (см. app/crud/rank.py).
+    В PostgreSQL сравнение побайтное (COLLATE "C"), чтобы порядок строк
+    не зависел от локали базы.
+    """
+    return Column(String().with_variant(String(collation="C"), "postgresql"), nullable=True)
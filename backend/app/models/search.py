@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Computed, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import deferred
+
+# Конфигурация полнотекстового поиска PostgreSQL.
+# russian стеммит кириллицу, латиницу обрабатывает english_stem.
+SEARCH_CONFIG = "russian"
+
+
+class _SearchVectorComputed(Computed):
+    """Выражение tsvector: генерируемая колонка только в PostgreSQL"""
+    inherit_cache = True
+
+
+@compiles(_SearchVectorComputed)
+def _compile_search_vector_plain(element, compiler, **kw):
+    # В других базах (SQLite в тестах) колонка обычная и остается пустой
+    return ""
+
+
+@compiles(_SearchVectorComputed, "postgresql")
+def _compile_search_vector_postgresql(element, compiler, **kw):
+    return compiler.visit_computed_column(element, **kw)
+
+
+def search_vector_column(title: str, body: str = None):
+    """
+    Генерируемая колонка tsvector: заголовок с весом A, текст с весом B.
+    Колонка отложенная, чтобы не загружаться вместе с обычными запросами.
+    """
+    expression = f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({title}, '')), 'A')"
+    if body:
+        expression += f" || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({body}, '')), 'B')"
+    return deferred(Column(TSVECTOR().with_variant(Text(), "sqlite"), _SearchVectorComputed(expression, persisted=True)))
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, Table
+from app.database import Base
+
+class Tag(Base):
+    """Общий словарь тегов: навыки исполнителей и теги заказов"""
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(50), unique=True, nullable=False)  # нормализованное имя (нижний регистр)
+
+    # Предрасчитанная частота использования (поддерживается TagCRUD)
+    task_count = Column(Integer, default=0, server_default="0", nullable=False)
+    order_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+# Инвертированный индекс навыков: тег -> исполнители
+user_skills = Table(
+    "user_skills",
+    Base.metadata,
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_user_skills_tag_id", "tag_id", "user_id"),
+)
+
+# Теги заказа в нормализованном виде
+order_tags = Table(
+    "order_tags",
+    Base.metadata,
+    Column("order_id", Integer, ForeignKey("orders.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_order_tags_tag_id", "tag_id", "order_id"),
+)
+
+# Теги задачи в нормализованном виде
+task_tags = Table(
+    "task_tags",
+    Base.metadata,
+    Column("task_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_task_tags_tag_id", "tag_id", "task_id"),
+)
@@ -1,12 +1,21 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text, Enum, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 from app.models.task_status import TaskStatusEnum
 from app.models.task_type import TaskTypeEnum
+from app.models.search import search_vector_column
+from app.models.rank import rank_column
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # Снимок доски и задачи колонки в порядке рангов
+        Index("ix_tasks_board_column_position", "board_id", "column_id", "position"),
+        # Шаг рекурсивного обхода дерева подзадач (TaskCRUD.get_tree)
+        Index("ix_tasks_parent_id", "parent_id", postgresql_where=text("parent_id IS NOT NULL")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -17,13 +26,18 @@ class Task(Base):
     budget = Column(Float, nullable=True)
     due_date = Column(DateTime(timezone=True), nullable=True)
     tags = Column(String, nullable=True)
+    position = rank_column()  # Порядок внутри колонки
+    # Счетчик правок: ORM пишет UPDATE ... WHERE id = ? AND version = ? (app/crud/versioning.py)
+    version = Column(Integer, nullable=False, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
+    search_vector = search_vector_column("title", "description")  # Полнотекстовый поиск
     
     # Foreign Keys
     board_id = Column(Integer, ForeignKey("boards.id"), nullable=False)
-    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    creator_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     parent_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True)
-    column_id = Column(Integer, ForeignKey("columns.id", ondelete="CASCADE"))
+    column_id = Column(Integer, ForeignKey("columns.id", ondelete="CASCADE"), index=True)
 
     # Связь со статусом через колонку `column_id`
     column = relationship("Column", back_populates="tasks")
@@ -0,0 +1,246 @@
+"""
+Профилирование SQL в рамках одного HTTP-запроса или обновления бота.
+
+Профиль запроса включается настройкой SQL_PROFILING. Хуки SQLAlchemy считают
+запросы, время в базе и повторы одинаковых запросов (отпечаток - текст SQL без
+параметров). Повтор отпечатка больше SQL_REPEAT_WARN_THRESHOLD раз - признак N+1.
+
+Журнал медленных запросов (SLOW_QUERY_MS) работает на тех же хуках: запросы
+дольше порога попадают в кольцевой буфер вместе с маршрутом/обработчиком,
+а для части SELECT в фоне снимается план EXPLAIN (ANALYZE, BUFFERS).
+"""
+import itertools
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Раскрытые списки IN (...) и литералы сворачиваются, чтобы IN на 3 и на 5 id совпадали
+_IN_LIST_RE = re.compile(r"\((?:%\(\w+\)s|\?|\$\d+)(?:,\s*(?:%\(\w+\)s|\?|\$\d+))*\)")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Нормализованный текст запроса для поиска повторов"""
+    statement = _IN_LIST_RE.sub("(?)", statement)
+    return _SPACES_RE.sub(" ", statement).strip()
+
+
+class QueryStats:
+    """
+    Статистика запросов одного запроса/обновления
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def add(self, statement: str, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Отпечатки, повторившиеся больше threshold раз"""
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count > threshold]
+
+    def server_timing(self) -> str:
+        """Значение заголовка Server-Timing"""
+        return f'db;dur={self.total * 1000:.2f};desc="{self.count} queries"'
+
+    def warn_repeats(self, where: str, threshold: Optional[int] = None):
+        """Предупредить о вероятных N+1"""
+        threshold = settings.sql_repeat_warn_threshold if threshold is None else threshold
+        for sql, count in self.repeated(threshold):
+            logger.warning(f"Возможный N+1 в {where}: запрос выполнен {count} раз: {sql[:300]}")
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+
+
+@contextmanager
+def profile_scope():
+    """Собирать статистику запросов внутри блока"""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+_operation: ContextVar[Optional[str]] = ContextVar("sql_operation", default=None)
+
+
+@contextmanager
+def operation_scope(name: str):
+    """Пометить запросы внутри блока маршрутом, обработчиком бота или задачей планировщика"""
+    token = _operation.set(name)
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+
+
+# Имена параметров, значения которых не сохраняются даже частично
+_SECRET_PARAM_RE = re.compile(r"password|token|secret|hash|code", re.IGNORECASE)
+_SAFE_TYPES = (int, float, bool, Decimal, date, datetime)
+
+
+def _redact_value(name: str, value: Any) -> Any:
+    if value is None or (isinstance(value, _SAFE_TYPES) and not _SECRET_PARAM_RE.search(name)):
+        return value if not isinstance(value, (Decimal, date, datetime)) else str(value)
+    return f"<{type(value).__name__}>"
+
+
+# EXPLAIN ANALYZE выполняет запрос: CTE с INSERT/UPDATE/DELETE не объясняются
+_MODIFYING_RE = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+
+def explainable(statement: str) -> bool:
+    """Запрос только читает данные: SELECT или WITH без изменяющих подзапросов"""
+    words = statement.lstrip().split(None, 1)
+    if not words:
+        return False
+    keyword = words[0].upper()
+    if keyword == "SELECT":
+        return True
+    return keyword == "WITH" and not _MODIFYING_RE.search(statement)
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Параметры запроса без значений строк и секретов: числа и даты оставляем для разбора плана"""
+    if isinstance(parameters, dict):
+        return {name: _redact_value(name, value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return [redact_parameters(item) for item in parameters[:3]] + (["..."] if len(parameters) > 3 else [])
+        return [_redact_value("", value) for value in parameters]
+    return None
+
+
+class SlowQueryLog:
+    """
+    Кольцевой буфер медленных запросов процесса
+    """
+
+    def __init__(self):
+        self._entries = deque(maxlen=max(settings.slow_query_log_size, 1))
+        self._lock = threading.Lock()
+        self._explainer: Optional[ThreadPoolExecutor] = None
+        self._ids = itertools.count(1)
+
+    @property
+    def enabled(self) -> bool:
+        return settings.slow_query_ms > 0
+
+    def record(self, conn, statement: str, parameters: Any, seconds: float, executemany: bool):
+        entry = {
+            "id": next(self._ids),
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(seconds * 1000, 2),
+            "operation": _operation.get(),
+            "database": conn.engine.url.database,
+            "fingerprint": fingerprint(statement),
+            "parameters": redact_parameters(parameters),
+            "executemany": executemany,
+            "plan": None
+        }
+        with self._lock:
+            self._entries.append(entry)
+        logger.warning(
+            f"Медленный запрос {entry['duration_ms']} мс в {entry['operation'] or 'вне запроса'}: "
+            f"{entry['fingerprint'][:300]}"
+        )
+        if (
+            not executemany
+            and conn.engine.dialect.name == "postgresql"
+            and explainable(statement)
+            and random.random() < settings.slow_query_explain_sample
+        ):
+            self._submit_explain(conn.engine, statement, parameters, entry)
+
+    def _submit_explain(self, engine: Engine, statement: str, parameters: Any, entry: Dict):
+        if self._explainer is None:
+            self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._explainer.submit(self._explain, engine, statement, parameters, entry)
+
+    def _explain(self, engine: Engine, statement: str, parameters: Any, entry: Dict):
+        """Снять план в отдельном соединении; транзакция всегда откатывается"""
+        try:
+            with engine.connect() as conn:
+                with conn.begin() as transaction:
+                    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.slow_query_explain_timeout_ms)}")
+                    rows = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters or {}).all()
+                    transaction.rollback()
+            entry["plan"] = "\n".join(row[0] for row in rows)
+        except Exception as e:
+            entry["plan"] = f"EXPLAIN не удался: {e}"
+
+    def entries(self, limit: int = 50) -> List[Dict]:
+        """Последние медленные запросы, новые первыми"""
+        with self._lock:
+            return list(reversed(self._entries))[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    seconds = time.perf_counter() - started.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.add(statement, seconds)
+    if (
+        slow_query_log.enabled
+        and seconds * 1000 >= settings.slow_query_ms
+        and not statement.startswith("EXPLAIN")
+    ):
+        slow_query_log.record(conn, statement, parameters, seconds, executemany)
+
+
+def _handle_error(exception_context):
+    started = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+_installed = False
+
+
+def install_sql_profiler():
+    """Подключить хуки ко всем движкам (повторный вызов ничего не делает)"""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _installed = True
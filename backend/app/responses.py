@@ -0,0 +1,10 @@
+from fastapi.responses import ORJSONResponse
+
+
+class UTF8JSONResponse(ORJSONResponse):
+    """
+    JSON ответ, сериализуемый через orjson.
+    Кодировка указана в media_type, поэтому заголовок формируется один раз
+    при создании ответа, без переписывания в middleware.
+    """
+    media_type = "application/json; charset=utf-8"
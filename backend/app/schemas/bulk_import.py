@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+
+class ImportRowError(BaseModel):
+    row: int  # Номер строки данных в файле (без заголовка CSV), с 1
+    detail: str
+
+class ImportResult(BaseModel):
+    imported: int  # При dry_run - сколько строк было бы загружено
+    failed: int
+    errors: List[ImportRowError]  # Первые IMPORT_MAX_ERRORS ошибок
+    dry_run: bool = False
@@ -5,6 +5,7 @@ class ColumnResponse(BaseModel):
     id: int
     title: str  # Изменено с name на title
     order_index: int  # Изменено с order на order_index
+    position: Optional[str] = None
 
     model_config = {
         "from_attributes": True
@@ -26,6 +27,11 @@ class ColumnReorder(BaseModel):
         "from_attributes": True
     }
 
+class ColumnMove(BaseModel):
+    """Перестановка колонки: после after_id и/или перед before_id (без соседей - в конец)"""
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+
 class ColumnCreate(BaseModel):
     title: str  # Изменено с name на title
     order_index: Optional[int] = 0  # Изменено с order на order_index
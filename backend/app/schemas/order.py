@@ -1,7 +1,8 @@
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, field_validator
 from typing import Optional, List, Any, ForwardRef
 from datetime import datetime, timezone
 from enum import Enum
+from .user import UserResponse
 
 # Forward references для избежания циклических импортов
 ProposalResponse = ForwardRef("ProposalResponse")
@@ -26,13 +27,15 @@ class OrderBase(BaseModel):
     priority: OrderPriority = OrderPriority.MEDIUM
     tags: Optional[str] = None
 
-    @validator('budget')
+    @field_validator('budget')
+    @classmethod
     def validate_budget(cls, v):
         if v <= 0:
             raise ValueError('Budget must be positive')
         return v
 
-    @validator('deadline')
+    @field_validator('deadline')
+    @classmethod
     def validate_deadline(cls, v):
         if v <= datetime.now(timezone.utc):
             raise ValueError('Deadline must be in the future')
@@ -50,14 +53,17 @@ class OrderUpdate(BaseModel):
     status: Optional[OrderStatus] = None
     tags: Optional[str] = None
     assigned_executor_id: Optional[int] = None
+    version: Optional[int] = None  # Версия, которую видел клиент; при расхождении - 409
 
-    @validator('budget')
+    @field_validator('budget')
+    @classmethod
     def validate_budget(cls, v):
         if v is not None and v <= 0:
             raise ValueError('Budget must be positive')
         return v
 
-    @validator('deadline')
+    @field_validator('deadline')
+    @classmethod
     def validate_deadline(cls, v):
         if v is not None and v <= datetime.now(timezone.utc):
             raise ValueError('Deadline must be in the future')
@@ -71,9 +77,11 @@ class OrderResponse(OrderBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    version: int = 1
 
     # Убираем валидацию дедлайна для ответа, так как в БД могут быть старые заказы
-    @validator('deadline')
+    @field_validator('deadline')
+    @classmethod
     def validate_deadline(cls, v):
         # Для ответа не проверяем, что дедлайн в будущем
         return v
@@ -88,6 +96,11 @@ class OrderWithCustomer(OrderResponse):
 class OrderWithProposals(OrderResponse):
     proposals: List["ProposalResponse"] = []
 
+class ExecutorMatch(BaseModel):
+    executor: UserResponse
+    overlap: int  # Количество совпавших навыков
+    score: float
+
 class OrderStats(BaseModel):
     total_orders: int
     open_orders: int
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, field_validator
 from typing import Optional, Any
 from datetime import datetime
 from enum import Enum
@@ -14,13 +14,15 @@ class ProposalBase(BaseModel):
     price: float
     estimated_duration: Optional[int] = None
 
-    @validator('price')
+    @field_validator('price')
+    @classmethod
     def validate_price(cls, v):
         if v <= 0:
             raise ValueError('Price must be positive')
         return v
 
-    @validator('estimated_duration')
+    @field_validator('estimated_duration')
+    @classmethod
     def validate_duration(cls, v):
         if v is not None and v <= 0:
             raise ValueError('Estimated duration must be positive')
@@ -35,13 +37,15 @@ class ProposalUpdate(BaseModel):
     estimated_duration: Optional[int] = None
     status: Optional[ProposalStatus] = None
 
-    @validator('price')
+    @field_validator('price')
+    @classmethod
     def validate_price(cls, v):
         if v is not None and v <= 0:
             raise ValueError('Price must be positive')
         return v
 
-    @validator('estimated_duration')
+    @field_validator('estimated_duration')
+    @classmethod
     def validate_duration(cls, v):
         if v is not None and v <= 0:
             raise ValueError('Estimated duration must be positive')
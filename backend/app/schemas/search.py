@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+class SearchHit(BaseModel):
+    id: int
+    rank: float
+    snippet: str
+    title: Optional[str] = None
+    status: Optional[str] = None
+    board_id: Optional[int] = None
+    order_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None  # передать в следующий запрос для получения следующей страницы
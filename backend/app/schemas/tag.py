@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+class TagFrequency(BaseModel):
+    name: str
+    count: int
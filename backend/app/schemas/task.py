@@ -1,8 +1,27 @@
-from pydantic import BaseModel, validator
-from typing import Optional, List
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List, Literal
 from datetime import datetime
+import json
 from .user import UserResponse
 
+PRIORITY_VALUES = {"low": 1, "medium": 2, "high": 3, "urgent": 4}
+PRIORITY_NAMES = {value: name for name, value in PRIORITY_VALUES.items()}
+
+def tags_to_list(v):
+    """Теги из строки через запятую (или устаревшей JSON строки) в список"""
+    if v is None:
+        return []
+    if isinstance(v, str):
+        if v == '' or v == '{}':
+            return []
+        if v.startswith('['):
+            try:
+                return json.loads(v)
+            except ValueError:
+                pass
+        return [tag.strip() for tag in v.split(',') if tag.strip()]
+    return v
+
 class TaskBase(BaseModel):
     column_id: Optional[int] = None
     title: str
@@ -12,37 +31,22 @@ class TaskBase(BaseModel):
     due_date: Optional[datetime] = None
     tags: List[str] = []
 
-    @validator('priority', pre=True)
+    @field_validator('priority', mode='before')
+    @classmethod
     def convert_priority_to_int(cls, v):
         if v is None:
             return 2  # default to medium
         if isinstance(v, str):
-            priority_map = {
-                "low": 1,
-                "medium": 2,
-                "high": 3,
-                "urgent": 4
-            }
-            return priority_map.get(v.lower(), 2)  # default to medium
+            return PRIORITY_VALUES.get(v.lower(), 2)  # default to medium
         return v
 
-    @validator('tags', pre=True)
+    @field_validator('tags', mode='before')
+    @classmethod
     def convert_tags_to_list(cls, v):
-        if v is None:
-            return []
-        if isinstance(v, str):
-            if v == '' or v == '{}':
-                return []
-            # Пытаемся парсить как JSON
-            try:
-                import json
-                return json.loads(v)
-            except:
-                # Если не JSON, разделяем по запятой
-                return [tag.strip() for tag in v.split(',') if tag.strip()]
-        return v
+        return tags_to_list(v)
 
-    @validator('due_date', pre=True)
+    @field_validator('due_date', mode='before')
+    @classmethod
     def parse_due_date(cls, v):
         if v is None or v == '' or v == 'null':
             return None
@@ -77,6 +81,19 @@ class TaskCreate(TaskBase):
     assigned_to_id: Optional[int] = None
     parent_id: Optional[int] = None
 
+class TaskImportRow(TaskBase):
+    """Строка импорта задач (app/bulk_import.py): колонка по названию или по id"""
+    column: Optional[str] = None
+    assigned_to_id: Optional[int] = None
+
+    @field_validator('title')
+    @classmethod
+    def validate_title(cls, v):
+        # Пустой заголовок - ошибка строки, а не сбой всей пачки на NOT NULL
+        if not v.strip():
+            raise ValueError('Title must not be empty')
+        return v
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -87,22 +104,19 @@ class TaskUpdate(BaseModel):
     tags: Optional[List[str]] = None
     assigned_to_id: Optional[int] = None
     parent_id: Optional[int] = None
+    version: Optional[int] = None  # Версия, которую видел клиент; при расхождении - 409
 
-    @validator('priority', pre=True)
+    @field_validator('priority', mode='before')
+    @classmethod
     def convert_priority_to_int(cls, v):
         if v is None:
             return None
         if isinstance(v, str):
-            priority_map = {
-                "low": 1,
-                "medium": 2,
-                "high": 3,
-                "urgent": 4
-            }
-            return priority_map.get(v.lower(), 2)  # default to medium
+            return PRIORITY_VALUES.get(v.lower(), 2)  # default to medium
         return v
 
-    @validator('due_date', pre=True)
+    @field_validator('due_date', mode='before')
+    @classmethod
     def parse_due_date(cls, v):
         if v is None or v == '':
             return None
@@ -119,6 +133,53 @@ class TaskUpdate(BaseModel):
 class TaskStatusUpdate(BaseModel):
     column_id: Optional[int] = None
 
+class TaskMove(BaseModel):
+    """Перенос карточки: в column_id после after_id и/или перед before_id (без соседей - в конец)"""
+    column_id: Optional[int] = None
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+
+# Задач в одном массовом запросе (сумма по всем операциям)
+MAX_BULK_TASKS = 1000
+
+class TaskBulkOperation(BaseModel):
+    """
+    Одна массовая операция над списком задач:
+    move - перенести в column_id, assign - назначить assigned_to_id (None - снять),
+    add_tags/remove_tags - добавить/снять теги, delete - удалить.
+    """
+    action: Literal["move", "assign", "add_tags", "remove_tags", "delete"]
+    task_ids: List[int] = Field(min_length=1, max_length=MAX_BULK_TASKS)
+    column_id: Optional[int] = None
+    assigned_to_id: Optional[int] = None
+    tags: List[str] = []
+
+    @field_validator('tags', mode='before')
+    @classmethod
+    def convert_tags_to_list(cls, v):
+        return tags_to_list(v)
+
+class TaskBulkRequest(BaseModel):
+    operations: List[TaskBulkOperation] = Field(min_length=1)
+
+    @field_validator('operations')
+    @classmethod
+    def limit_total_tasks(cls, v):
+        if sum(len(operation.task_ids) for operation in v) > MAX_BULK_TASKS:
+            raise ValueError(f'Too many tasks in one request (max {MAX_BULK_TASKS})')
+        return v
+
+class TaskBulkItemResult(BaseModel):
+    operation: int  # Номер операции в запросе
+    task_id: int
+    status: Literal["ok", "not_found", "forbidden", "invalid"]
+    detail: Optional[str] = None
+
+class TaskBulkResponse(BaseModel):
+    results: List[TaskBulkItemResult]
+    succeeded: int
+    failed: int
+
 class TaskResponse(BaseModel):
     id: int
     title: str
@@ -127,6 +188,8 @@ class TaskResponse(BaseModel):
     assigned_to_id: Optional[int] = None
     creator_id: int
     parent_id: Optional[int] = None
+    position: Optional[str] = None
+    version: int = 1
     rating: Optional[float] = None
     tags: List[str]
     budget: Optional[float]
@@ -140,36 +203,43 @@ class TaskResponse(BaseModel):
         "from_attributes": True
     }
 
-    @validator('priority', pre=True)
+    @field_validator('priority', mode='before')
+    @classmethod
     def convert_int_to_priority_string(cls, v):
         if isinstance(v, int):
-            priority_map = {
-                1: "low",
-                2: "medium", 
-                3: "high",
-                4: "urgent"
-            }
-            return priority_map.get(v, "medium")
+            return PRIORITY_NAMES.get(v, "medium")
         return v
 
-    @validator('tags', pre=True)
+    @field_validator('tags', mode='before')
+    @classmethod
     def convert_tags_to_list(cls, v):
-        if v is None:
-            return []
-        if isinstance(v, str):
-            if v == '' or v == '{}':
-                return []
-            # Пытаемся парсить как JSON
-            try:
-                import json
-                return json.loads(v)
-            except:
-                # Если не JSON, разделяем по запятой
-                return [tag.strip() for tag in v.split(',') if tag.strip()]
-        return v
+        return tags_to_list(v)
 
 class TaskWithRelations(TaskResponse):
     assigned_to: Optional[UserResponse] = None
     created_by: UserResponse
     parent: Optional["TaskWithRelations"] = None
-    subtasks: List["TaskWithRelations"] = [] 
\ No newline at end of file
+    subtasks: List["TaskWithRelations"] = [] 
+
+class TaskTreeNode(BaseModel):
+    """Узел дерева подзадач; агрегаты считаются по всему поддереву узла"""
+    id: int
+    title: str
+    status: Optional[str] = None
+    priority: str
+    column_id: Optional[int] = None
+    assigned_to_id: Optional[int] = None
+    budget: Optional[float] = None
+    due_date: Optional[datetime] = None
+    position: Optional[str] = None
+    subtask_count: int = 0  # Все подзадачи поддерева, не только прямые
+    done_count: int = 0  # Из них в статусе done
+    total_budget: float = 0  # Бюджет задачи вместе с подзадачами
+    children: List["TaskTreeNode"] = []
+
+    @field_validator('priority', mode='before')
+    @classmethod
+    def convert_int_to_priority_string(cls, v):
+        if isinstance(v, int):
+            return PRIORITY_NAMES.get(v, "medium")
+        return v
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк сериализации списка задач доски (путь ответа API без базы данных).
+
+Сравнивает рендеринг одного и того же ответа через стандартный json
+(starlette JSONResponse) и через orjson (UTF8JSONResponse).
+Результат выводится в микросекундах на задачу.
+
+Пример: python scripts/benchmark_serialization.py --tasks 1000 --repeat 50
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+# Добавляем путь к приложению в sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse
+
+from app.models.task import Task
+from app.responses import UTF8JSONResponse
+from app.schemas.task import TaskResponse
+
+
+def make_tasks(count: int) -> List[Task]:
+    """Задачи доски в том виде, в каком их возвращает CRUD"""
+    now = datetime.now(timezone.utc)
+    return [
+        Task(
+            id=i,
+            title=f"Задача {i}: исправить отображение дедлайнов",
+            description="Описание задачи с кириллицей и деталями реализации " * 3,
+            priority=i % 4 + 1,
+            budget=1000.0 + i,
+            due_date=now + timedelta(days=i % 30),
+            tags="backend,api,срочно",
+            board_id=1,
+            creator_id=1,
+            column_id=i % 5 + 1,
+            created_at=now,
+            updated_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def measure(func, repeat: int) -> float:
+    """Лучшее время одного прогона в секундах"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк сериализации задач")
+    parser.add_argument("--tasks", type=int, default=1000, help="Количество задач на доске")
+    parser.add_argument("--repeat", type=int, default=50, help="Количество прогонов")
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks)
+    # Тот же адаптер, что FastAPI строит для response_model=List[TaskResponse]
+    adapter = TypeAdapter(List[TaskResponse])
+
+    validated = adapter.validate_python(tasks, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+
+    stages = [
+        ("validate (from_attributes)", lambda: adapter.validate_python(tasks, from_attributes=True)),
+        ("serialize (dump_python json)", lambda: adapter.dump_python(validated, mode="json")),
+        ("render stdlib json", lambda: JSONResponse(content)),
+        ("render orjson", lambda: UTF8JSONResponse(content)),
+    ]
+
+    print(f"📊 Сериализация {args.tasks} задач, лучший из {args.repeat} прогонов\n")
+    results = {}
+    for name, func in stages:
+        seconds = measure(func, args.repeat)
+        results[name] = seconds
+        print(f"  {name:<30} {seconds * 1000:8.2f} ms  {seconds * 1e6 / args.tasks:7.2f} µs/задача")
+
+    common = results["validate (from_attributes)"] + results["serialize (dump_python json)"]
+    for label, render in (("stdlib json", "render stdlib json"), ("orjson", "render orjson")):
+        total = common + results[render]
+        print(f"\n  Итого с {label:<12} {total * 1000:8.2f} ms  {total * 1e6 / args.tasks:7.2f} µs/задача", end="")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Проверка планов запросов CRUD на большом наборе данных.
+
+Скрипт в одной транзакции заполняет таблицы синтетическими данными, собирает
+статистику (ANALYZE), вызывает методы CRUD и перехватывает их SQL, а затем
+выполняет EXPLAIN для каждого запроса. Если хотя бы один запрос читает большую
+таблицу последовательным сканированием (Seq Scan), скрипт завершается с кодом 1.
+В конце транзакция откатывается, данные в базе не меняются.
+
+Запускать на тестовой базе с актуальной схемой (python scripts/migrate.py).
+
+Пример: python scripts/check_query_plans.py --scale 0.5 --verbose
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, Tuple
+
+# Добавляем путь к приложению в sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.crud.board import board_crud
+from app.crud.column import column_crud
+from app.crud.message import message_crud
+from app.crud.order import order_crud
+from app.crud.proposal import proposal_crud
+from app.crud.task import task_crud
+from app.crud.user import user_crud
+import app.models  # noqa: F401 - регистрируем все модели
+
+# Таблицы, которые заполняются и для которых Seq Scan считается ошибкой
+SEEDED_TABLES = ("users", "boards", "columns", "tasks", "orders", "proposals", "messages")
+
+# Размеры таблиц при --scale 1
+BASE_ROWS = {
+    "users": 20000,
+    "boards": 5000,
+    "tasks": 200000,
+    "orders": 100000,
+    "proposals": 200000,
+    "messages": 300000,
+}
+
+SEED_SQL = [
+    # Пользователи: половина заказчики, половина исполнители
+    """
+    INSERT INTO users (id, username, email, hashed_password, telegram_id, role, rating, completed_tasks,
+                       is_active, is_registered, is_superuser, is_verified, is_banned, created_at)
+    SELECT :user_base + g, 'plan_user_' || g, 'plan_user_' || g || '@example.com', 'x', 900000000 + g,
+           CASE WHEN g % 2 = 0 THEN 'customer' ELSE 'executor' END, g % 50 / 10.0, g % 20,
+           true, true, false, false, false, now() - g * interval '1 minute'
+    FROM generate_series(1, :users) AS g
+    """,
+    # Доски: 10% публичных, 90% активных
+    """
+    INSERT INTO boards (id, title, is_public, is_active, creator_id, created_at)
+    SELECT :board_base + g, 'Board ' || g, g % 10 = 0, g % 10 <> 1, :user_base + 1 + g % :users, now()
+    FROM generate_series(1, :boards) AS g
+    """,
+    # По четыре колонки на доску
+    """
+    INSERT INTO columns (id, title, order_index, position, board_id)
+    SELECT :column_base + (b - 1) * 4 + c, 'Column ' || c, c, to_hex(c) || 'i', :board_base + b
+    FROM generate_series(1, :boards) AS b, generate_series(1, 4) AS c
+    """,
+    """
+    INSERT INTO tasks (id, title, status, type, priority, position, board_id, column_id, creator_id, assignee_id, created_at)
+    SELECT :task_base + g, 'Task ' || g, 'todo', 'task', 1 + g % 4, lpad(to_hex(g), 8, '0') || 'i',
+           :board_base + 1 + g % :boards, :column_base + (g % :boards) * 4 + 1 + g % 4,
+           :user_base + 1 + g % :users, :user_base + 1 + (g * 7) % :users, now() - g * interval '1 second'
+    FROM generate_series(1, :tasks) AS g
+    """,
+    # Заказы: 10% открытых
+    """
+    INSERT INTO orders (id, title, description, budget, deadline, priority, status, creator_id,
+                        assigned_executor_id, created_at)
+    SELECT :order_base + g, 'Order ' || g, 'Description ' || g, 1000 + g % 100, now() + interval '7 days', 'medium',
+           CASE WHEN g % 10 = 0 THEN 'open' WHEN g % 10 < 5 THEN 'completed' ELSE 'in_progress' END,
+           :user_base + 2 * (1 + g % (:users / 2)), :user_base + 2 * (g % (:users / 2)) + 1,
+           now() - g * interval '1 second'
+    FROM generate_series(1, :orders) AS g
+    """,
+    # Предложения: 10% ожидают рассмотрения
+    """
+    INSERT INTO proposals (id, description, price, status, order_id, user_id, created_at)
+    SELECT :proposal_base + g, 'Proposal ' || g, 500 + g % 100,
+           CASE WHEN g % 10 = 0 THEN 'pending' ELSE 'rejected' END,
+           :order_base + 1 + g % :orders, :user_base + 1 + (g * 13) % :users, now() - g * interval '1 second'
+    FROM generate_series(1, :proposals) AS g
+    """,
+    # Сообщения: 5% непрочитанных
+    """
+    INSERT INTO messages (id, order_id, sender_id, receiver_id, content, is_read, created_at)
+    SELECT :message_base + g, :order_base + 1 + g % :orders, :user_base + 1 + g % :users,
+           :user_base + 1 + (g * 3) % :users, 'Message ' || g, g % 20 <> 0, now() - g * interval '1 second'
+    FROM generate_series(1, :messages) AS g
+    """,
+]
+
+
+def seed(db: Session, scale: float) -> dict:
+    """Заполнить таблицы поверх существующих данных (идентификаторы после текущего максимума)"""
+    params = {name: max(int(rows * scale), 10) for name, rows in BASE_ROWS.items()}
+    for table, key in (("users", "user_base"), ("boards", "board_base"), ("columns", "column_base"),
+                       ("tasks", "task_base"), ("orders", "order_base"), ("proposals", "proposal_base"),
+                       ("messages", "message_base")):
+        params[key] = db.execute(text(f"SELECT COALESCE(max(id), 0) FROM {table}")).scalar()
+    for statement in SEED_SQL:
+        db.execute(text(statement), params)
+    for table in SEEDED_TABLES:
+        db.execute(text(f"ANALYZE {table}"))
+    return params
+
+
+def crud_queries(params: dict) -> List[Tuple[str, Callable[[Session], object]]]:
+    """Методы CRUD, которые вызываются на горячих путях API и бота"""
+    user_id = params["user_base"] + 2
+    executor_id = params["user_base"] + 3
+    board_id = params["board_base"] + 2
+    column_id = params["column_base"] + 5
+    order_id = params["order_base"] + 10
+    return [
+        ("user_crud.get_by_username", lambda db: user_crud.get_by_username(db, "plan_user_2")),
+        ("user_crud.get_by_telegram_id", lambda db: user_crud.get_by_telegram_id(db, 900000002)),
+        ("board_crud.get_by_owner", lambda db: board_crud.get_by_owner(db, owner_id=user_id)),
+        ("board_crud.get_public_boards", lambda db: board_crud.get_public_boards(db)),
+        ("column_crud.get_by_board", lambda db: column_crud.get_by_board(db, board_id=board_id)),
+        ("task_crud.get_by_board", lambda db: task_crud.get_by_board(db, board_id=board_id)),
+        ("task_crud.get_by_status", lambda db: task_crud.get_by_status(db, board_id, column_id)),
+        ("task_crud.get_by_assigned_user", lambda db: task_crud.get_by_assigned_user(db, user_id=user_id)),
+        ("task_crud.get_by_creator", lambda db: task_crud.get_by_creator(db, user_id=user_id)),
+        ("task_crud.get_tree", lambda db: task_crud.get_tree(db, board_id=board_id)),
+        ("order_crud.get_open_orders", lambda db: order_crud.get_open_orders(db)),
+        ("order_crud.get_by_creator", lambda db: order_crud.get_by_creator(db, creator_id=user_id)),
+        ("order_crud.get_by_executor", lambda db: order_crud.get_by_executor(db, executor_id=executor_id)),
+        ("order_crud.get_all", lambda db: order_crud.get_all(db)),
+        ("proposal_crud.get_by_order", lambda db: proposal_crud.get_by_order(db, order_id=order_id)),
+        ("proposal_crud.get_by_user", lambda db: proposal_crud.get_by_user(db, user_id=executor_id)),
+        ("proposal_crud.get_pending", lambda db: proposal_crud.get_pending(db)),
+        ("proposal_crud.get_all", lambda db: proposal_crud.get_all(db)),
+        ("message_crud.get_by_order", lambda db: message_crud.get_by_order(db, order_id=order_id)),
+        ("message_crud.get_by_user", lambda db: message_crud.get_by_user(db, user_id=user_id)),
+        ("message_crud.get_unread_count", lambda db: message_crud.get_unread_count(db, user_id=user_id)),
+        ("message_crud.get_order_unread_count", lambda db: message_crud.get_order_unread_count(db, order_id, user_id)),
+        ("message_crud.get_all", lambda db: message_crud.get_all(db)),
+    ]
+
+
+def seq_scans(plan: dict) -> List[str]:
+    """Таблицы из SEEDED_TABLES, которые читаются Seq Scan в узлах плана"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in SEEDED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def check_plans(scale: float, verbose: bool) -> int:
+    db = SessionLocal()
+    failures = 0
+    try:
+        print(f"🌱 Заполнение тестовых данных (scale={scale})...")
+        started = time.perf_counter()
+        params = seed(db, scale)
+        print(f"✅ Данные готовы за {time.perf_counter() - started:.1f} с\n")
+
+        connection = db.connection()
+        for name, call in crud_queries(params):
+            captured = []
+
+            def capture(conn, cursor, statement, parameters, context, executemany):
+                if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                    captured.append((statement, parameters))
+
+            event.listen(connection, "before_cursor_execute", capture)
+            try:
+                call(db)
+            finally:
+                event.remove(connection, "before_cursor_execute", capture)
+
+            for statement, parameters in captured:
+                plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()[0]["Plan"]
+                scans = seq_scans(plan)
+                if scans:
+                    failures += 1
+                    print(f"❌ {name}: Seq Scan по {', '.join(sorted(set(scans)))}")
+                else:
+                    print(f"✅ {name}: {plan['Node Type']}, стоимость {plan['Total Cost']}")
+                if verbose or scans:
+                    rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+                    print("\n".join(f"     {row[0]}" for row in rows))
+    finally:
+        db.rollback()
+        db.close()
+
+    print()
+    if failures:
+        print(f"❌ Запросов с Seq Scan: {failures}")
+        return 1
+    print("✅ Все запросы используют индексы")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка планов запросов CRUD")
+    parser.add_argument("--scale", type=float, default=1.0, help="Множитель размера тестовых данных")
+    parser.add_argument("--verbose", action="store_true", help="Печатать планы всех запросов")
+    args = parser.parse_args()
+    sys.exit(check_plans(args.scale, args.verbose))
+
+
+if __name__ == "__main__":
+    main()
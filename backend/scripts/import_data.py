@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Массовый импорт задач или заказов из CSV/NDJSON (то же, что POST /tasks/import
+и POST /orders/import, но без загрузки файла через API).
+
+Задачи импортируются в доску --board от имени --user (по умолчанию - владелец
+доски), заказы - от имени --user. Формат определяется по расширению файла.
+Ошибочные строки пропускаются и печатаются с номером строки; код выхода 1,
+если ошибки были.
+
+Пример: python scripts/import_data.py tasks backlog.csv --board 12
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Добавляем путь к приложению в sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.database import SessionLocal
+from app.bulk_import import import_orders, import_tasks
+from app.crud.board import board_crud
+import app.models  # noqa: F401 - регистрируем все модели
+
+
+def import_file(entity: str, path: str, board_id: int = None, user_id: int = None, dry_run: bool = False) -> int:
+    fmt = "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        with open(path, "rb") as stream:
+            if entity == "tasks":
+                board = board_crud.get_by_id(db, board_id)
+                if board is None:
+                    print(f"❌ Доска {board_id} не найдена")
+                    return 1
+                result = import_tasks(db, stream, fmt, board_id=board_id, creator_id=user_id or board.creator_id, dry_run=dry_run)
+            else:
+                result = import_orders(db, stream, fmt, creator_id=user_id, dry_run=dry_run)
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Ошибка импорта: {e}")
+        return 1
+    finally:
+        db.close()
+
+    for error in result["errors"]:
+        print(f"⚠️ Строка {error['row']}: {error['detail']}")
+    action = "Проверено" if dry_run else "Импортировано"
+    print(f"✅ {action} строк: {result['imported']}, с ошибками: {result['failed']} ({time.perf_counter() - started:.1f} с)")
+    return 1 if result["failed"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Массовый импорт задач и заказов")
+    parser.add_argument("entity", choices=["tasks", "orders"], help="Что импортировать")
+    parser.add_argument("path", help="Файл .csv или .ndjson")
+    parser.add_argument("--board", type=int, help="Доска для задач")
+    parser.add_argument("--user", type=int, help="Автор задач/заказов (для задач по умолчанию - владелец доски)")
+    parser.add_argument("--dry-run", action="store_true", help="Только проверить строки, без записи")
+    args = parser.parse_args()
+    if args.entity == "tasks" and args.board is None:
+        parser.error("--board is required for tasks")
+    if args.entity == "orders" and args.user is None:
+        parser.error("--user is required for orders")
+    sys.exit(import_file(args.entity, args.path, args.board, args.user, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Применение миграций Alembic при старте контейнера.
+
+Быстрый путь: ревизии из alembic/versions читаются как текст (без импорта Alembic
+и моделей), версия базы - одним запросом к alembic_version. Если база уже на
+последней ревизии, скрипт завершается за миллисекунды.
+
+Иначе под advisory-блокировкой (несколько контейнеров могут стартовать разом)
+запускается alembic upgrade head. База, созданная до перехода на Alembic
+(create_all или init_db.sql), сначала помечается базовой ревизией.
+
+Пример: python scripts/migrate.py [--check]
+"""
+
+import argparse
+import ast
+import os
+import re
+import sys
+import time
+
+import psycopg2
+from dotenv import load_dotenv
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+VERSIONS_DIR = os.path.join(BACKEND_DIR, 'alembic', 'versions')
+
+# Ревизия, которой помечаются базы, созданные до перехода на Alembic
+BASELINE_REVISION = "0001"
+
+# Ключ pg_advisory_lock, чтобы миграции не применялись параллельно
+MIGRATION_LOCK_ID = 7_403_112_001
+
+_ASSIGNMENT_RE = re.compile(r"^(revision|down_revision)\s*=\s*(.+)$", re.MULTILINE)
+
+
+def read_heads() -> set:
+    """Последние ревизии цепочки: те, на которые не ссылается ни одна другая"""
+    revisions, parents = set(), set()
+    for filename in os.listdir(VERSIONS_DIR):
+        if not filename.endswith(".py"):
+            continue
+        with open(os.path.join(VERSIONS_DIR, filename), encoding="utf-8") as f:
+            values = {name: ast.literal_eval(value) for name, value in _ASSIGNMENT_RE.findall(f.read())}
+        if "revision" not in values:
+            continue
+        revisions.add(values["revision"])
+        down = values.get("down_revision")
+        if isinstance(down, str):
+            parents.add(down)
+        elif down:
+            parents.update(down)
+    return revisions - parents
+
+
+def database_url() -> str:
+    # Тот же источник, что и settings.database_url, но без импорта app.config
+    load_dotenv()
+    url = os.getenv("DATABASE_URL", "")
+    # psycopg2 понимает только postgresql://, без указания драйвера
+    return re.sub(r"^postgresql\+\w+://", "postgresql://", url)
+
+
+def current_revisions(cursor):
+    """Ревизии в alembic_version или None, если Alembic еще не применялся"""
+    cursor.execute("SELECT to_regclass('public.alembic_version') IS NOT NULL")
+    if not cursor.fetchone()[0]:
+        return None
+    cursor.execute("SELECT version_num FROM alembic_version")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def run_alembic(legacy: bool):
+    # Импорт Alembic и моделей нужен только когда есть что применять
+    sys.path.append(BACKEND_DIR)
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, 'alembic.ini'))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, 'alembic'))
+    if legacy:
+        print(f"🏷️ База создана до миграций, помечаем ревизией {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+
+def migrate(check: bool) -> int:
+    started = time.perf_counter()
+    heads = read_heads()
+    connection = psycopg2.connect(database_url())
+    connection.autocommit = True
+    try:
+        cursor = connection.cursor()
+        current = current_revisions(cursor)
+        if current == heads:
+            print(f"✅ Схема актуальна ({', '.join(sorted(heads))}), {(time.perf_counter() - started) * 1000:.0f} мс")
+            return 0
+        if check:
+            print(f"❌ Есть непримененные миграции: база {sorted(current or [])}, код {sorted(heads)}")
+            return 1
+
+        cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+        try:
+            # Пока ждали блокировку, миграции мог применить другой контейнер
+            current = current_revisions(cursor)
+            if current != heads:
+                cursor.execute("SELECT to_regclass('public.users') IS NOT NULL")
+                legacy = current is None and cursor.fetchone()[0]
+                print(f"🔄 Применение миграций: {sorted(current or [])} -> {sorted(heads)}")
+                run_alembic(legacy)
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+    except Exception as e:
+        print(f"❌ Ошибка при применении миграций: {e}")
+        return 1
+    finally:
+        connection.close()
+
+    print(f"✅ Миграции применены за {time.perf_counter() - started:.1f} с")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Применение миграций Alembic")
+    parser.add_argument("--check", action="store_true", help="Только проверить, что схема актуальна (код 1, если нет)")
+    args = parser.parse_args()
+    sys.exit(migrate(args.check))
+
+
+if __name__ == "__main__":
+    main()
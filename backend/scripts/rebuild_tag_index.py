@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Скрипт для перестроения нормализованных тегов (навыки пользователей, теги заказов и задач).
+Заполняет task_tags/order_tags для существующих данных и пересчитывает частоты тегов.
+"""
+
+import sys
+import os
+
+# Добавляем путь к приложению в sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.database import SessionLocal
+from app.crud.tag import tag_crud
+import app.models  # noqa: F401 - регистрируем все модели
+
+
+def rebuild_tag_index():
+    """Перестроить user_skills, order_tags и task_tags из JSON/строковых полей"""
+    db = SessionLocal()
+    try:
+        print("🔄 Перестроение индекса тегов...")
+        counts = tag_crud.rebuild_index(db)
+        db.commit()
+        print(f"✅ Обработано пользователей: {counts['users']}, заказов: {counts['orders']}, задач: {counts['tasks']}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Ошибка при перестроении индекса тегов: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_tag_index()
@@ -0,0 +1,31 @@
+"""
+Общие фикстуры тестов.
+
+База - TEST_DATABASE_URL (PostgreSQL) или, если он не задан, временный файл
+SQLite. Переменные окружения задаются до импорта приложения: движок и бот
+создаются при импорте app.database и app.bot.bot_instance.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Добавляем путь к приложению в sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+_tmp_dir = tempfile.mkdtemp(prefix="deadline-tests-")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{_tmp_dir}/test.db"
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "42:TEST")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+
+@pytest.fixture(scope="session")
+def engine():
+    import app.models  # noqa: F401 - регистрируем все модели
+    from app.database import Base, engine
+
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
@@ -0,0 +1,114 @@
+"""Снимки досок: запись из бота сбрасывает снимок, веб сразу видит изменение"""
+import asyncio
+
+import pytest
+
+from app.cache import board_snapshots
+
+
+@pytest.fixture
+def task(engine):
+    from app.database import SessionLocal
+    from app.models import Board, Task, User
+
+    db = SessionLocal()
+    db.expire_on_commit = False
+    user = User(username="cache", email="cache@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    board = Board(title="cache", creator_id=user.id)
+    db.add(board)
+    db.flush()
+    task = Task(title="cached", board_id=board.id, creator_id=user.id, position="i")
+    db.add(task)
+    db.commit()
+    yield task
+    db.query(Task).filter(Task.id == task.id).delete()
+    db.delete(board)
+    db.delete(user)
+    db.commit()
+    db.close()
+
+
+def _snapshot(board_id):
+    """Снимок, как его собирает GET /boards/{id}: здесь - статус и исполнитель задачи"""
+    from app.database import SessionLocal
+    from app.models import Task
+
+    def load():
+        db = SessionLocal()
+        try:
+            return [(task.status, task.assignee_id) for task in db.query(Task).filter(Task.board_id == board_id)]
+        finally:
+            db.close()
+
+    return board_snapshots.get_or_load(board_id, load)
+
+
+@pytest.mark.parametrize("write", ["update_task_status", "assign_task"])
+def test_bot_task_writes_invalidate_snapshot(task, write):
+    from app.bot.services.task_service import TaskService
+    from app.models.task_status import TaskStatusEnum
+
+    before = _snapshot(task.board_id)
+    assert _snapshot(task.board_id) is before  # второе чтение - из кэша
+
+    service = TaskService()
+    if write == "update_task_status":
+        assert asyncio.run(service.update_task_status(task.id, TaskStatusEnum.DONE.value))
+        assert _snapshot(task.board_id) == [(TaskStatusEnum.DONE.value, None)]
+    else:
+        assert asyncio.run(service.assign_task(task.id, task.creator_id))
+        assert _snapshot(task.board_id) == [(TaskStatusEnum.IN_PROGRESS.value, task.creator_id)]
+
+
+def test_bot_default_columns_invalidate_snapshot(task):
+    from app.bot.services.task_service import TaskService
+    from app.database import SessionLocal
+    from app.models import Column
+
+    def columns():
+        db = SessionLocal()
+        try:
+            return [column.title for column in db.query(Column).filter(Column.board_id == task.board_id)]
+        finally:
+            db.close()
+
+    assert board_snapshots.get_or_load(task.board_id, columns, variant="columns") == []
+    asyncio.run(TaskService()._create_default_columns(task.board_id))
+    try:
+        assert len(board_snapshots.get_or_load(task.board_id, columns, variant="columns")) == 3
+    finally:
+        db = SessionLocal()
+        db.query(Column).filter(Column.board_id == task.board_id).delete()
+        db.commit()
+        db.close()
+
+
+def test_late_store_under_old_generation_is_not_served():
+    import time
+    from app.cache import MemoryBackend, SnapshotCache
+
+    cache = SnapshotCache("generations", MemoryBackend(100), ttl=0.1)
+    old_key = cache._key(1, "")
+    cache.invalidate(1)
+    time.sleep(0.15)
+    # Запрос, собравший снимок до инвалидации, сохранил его уже после нее
+    cache.backend.set(old_key, "stale", cache.ttl)
+    assert cache.get_or_load(1, lambda: "fresh") == "fresh"
+
+
+def test_load_releases_only_its_own_lock():
+    from app.cache import MemoryBackend, SnapshotCache
+
+    cache = SnapshotCache("locks", MemoryBackend(100), ttl=10)
+    lock_key = f"{cache._key(1, '')}:lock"
+
+    def slow_loader():
+        # Блокировка истекла, и снимок начал собирать другой процесс
+        cache.backend.delete(lock_key)
+        assert cache.backend.add(lock_key, "other-worker", 10)
+        return "snapshot"
+
+    assert cache.get_or_load(1, slow_loader) == "snapshot"
+    assert cache.backend.get(lock_key) == "other-worker"
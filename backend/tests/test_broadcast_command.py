@@ -0,0 +1,23 @@
+"""Разбор фильтров команды /broadcast"""
+import pytest
+
+
+def test_filters_are_parsed():
+    from app.bot.routers.admin_router import _parse_broadcast_command
+
+    role, skills, active, text = _parse_broadcast_command("/broadcast role=Executor skills=python,django active=30\nПривет")
+    assert (role, skills, active, text) == ("executor", ["python", "django"], 30, "Привет")
+
+
+@pytest.mark.parametrize("header, error", [
+    ("active=abc", "active"),
+    ("active=0", "active"),
+    ("active=-5", "active"),
+    ("role=boss", "Неизвестная роль: boss"),
+    ("region=eu", "Неизвестные фильтры: region"),
+])
+def test_invalid_filters_are_reported(header, error):
+    from app.bot.routers.admin_router import _parse_broadcast_command
+
+    with pytest.raises(ValueError, match=error):
+        _parse_broadcast_command(f"/broadcast {header}\nПривет")
@@ -0,0 +1,101 @@
+"""
+Массовый импорт задач и заказов: ошибочные строки попадают в отчет с номером,
+остальные загружаются (COPY в PostgreSQL, INSERT в остальных базах).
+"""
+import io
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.bulk_import import import_orders, import_tasks
+
+
+@pytest.fixture
+def db(engine):
+    from app.database import SessionLocal
+    from app.models import Board, Column, Order, Task, User, order_tags, task_tags
+
+    session = SessionLocal()
+    user = User(username="importer", email="importer@example.com", hashed_password="x")
+    session.add(user)
+    session.flush()
+    board = Board(title="import", creator_id=user.id)
+    session.add(board)
+    session.flush()
+    session.add(Column(title="To Do", board_id=board.id, order_index=1, position="i"))
+    session.commit()
+    session.info.update(user_id=user.id, board_id=board.id)
+    yield session
+    session.rollback()
+    task_ids = select(Task.id).where(Task.board_id == board.id)
+    order_ids = select(Order.id).where(Order.creator_id == user.id)
+    session.execute(task_tags.delete().where(task_tags.c.task_id.in_(task_ids)))
+    session.execute(order_tags.delete().where(order_tags.c.order_id.in_(order_ids)))
+    session.query(Task).filter(Task.board_id == board.id).delete()
+    session.query(Order).filter(Order.creator_id == user.id).delete()
+    session.query(Column).filter(Column.board_id == board.id).delete()
+    session.query(Board).filter(Board.id == board.id).delete()
+    session.query(User).filter(User.id == user.id).delete()
+    session.commit()
+    session.close()
+
+
+def _ndjson(*rows) -> io.BytesIO:
+    return io.BytesIO("\n".join(json.dumps(row) for row in rows).encode())
+
+
+def _tasks(db):
+    from app.models import Task
+
+    return {task.title: task for task in db.query(Task).filter(Task.board_id == db.info["board_id"])}
+
+
+def test_tasks_from_csv(db):
+    from app.models import Tag, task_tags
+
+    data = "title,column,tags,priority\nfirst,to do,\"web, api\",high\nsecond,,,\nbad,Nope,,\n"
+    result = import_tasks(db, io.BytesIO(data.encode()), "csv", db.info["board_id"], db.info["user_id"])
+
+    assert (result["imported"], result["failed"]) == (2, 1)
+    assert result["errors"] == [{"row": 3, "detail": "Column 'Nope' not found on the board"}]
+    tasks = _tasks(db)
+    assert tasks["first"].column_id is not None and tasks["second"].column_id is None
+    assert sorted(db.execute(
+        select(Tag.name).join(task_tags, task_tags.c.tag_id == Tag.id).where(task_tags.c.task_id == tasks["first"].id)
+    ).scalars()) == ["api", "web"]
+
+
+def test_empty_strings_stay_empty_and_empty_title_is_a_row_error(db):
+    result = import_tasks(db, _ndjson(
+        {"title": "", "description": "no title"},
+        {"title": "empty description", "description": ""},
+        {"title": "no description"}
+    ), "ndjson", db.info["board_id"], db.info["user_id"])
+
+    assert (result["imported"], result["failed"]) == (2, 1)
+    assert result["errors"][0]["row"] == 1 and "Title must not be empty" in result["errors"][0]["detail"]
+    tasks = _tasks(db)
+    assert tasks["empty description"].description == ""
+    assert tasks["no description"].description is None
+
+
+def test_dry_run_writes_nothing(db):
+    result = import_tasks(db, _ndjson({"title": "dry"}), "ndjson", db.info["board_id"], db.info["user_id"], dry_run=True)
+
+    assert result["imported"] == 1 and result["dry_run"]
+    assert _tasks(db) == {}
+
+
+def test_orders_from_ndjson(db):
+    from app.models import Order
+
+    result = import_orders(db, _ndjson(
+        {"title": "order", "description": "", "budget": 10, "deadline": "2030-01-01T00:00:00Z", "tags": "python, web"},
+        {"title": "negative", "description": "d", "budget": -1, "deadline": "2030-01-01T00:00:00Z"}
+    ), "ndjson", db.info["user_id"])
+
+    assert (result["imported"], result["failed"]) == (1, 1)
+    assert result["errors"][0]["row"] == 2
+    order = db.query(Order).filter(Order.creator_id == db.info["user_id"]).one()
+    assert order.description == "" and order.tags == "python,web"
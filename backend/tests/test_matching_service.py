@@ -0,0 +1,86 @@
+"""Рассылка новых заказов: заказ помечается matched_at, только если подбор выполнен"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.crud.matching import matching_crud
+
+
+@pytest.fixture
+def order_ids(engine):
+    from app.database import SessionLocal
+    from app.models import Order, User
+
+    db = SessionLocal()
+    user = User(username="matching", email="matching@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    orders = [
+        Order(title=title, description="d", budget=100, deadline=datetime.utcnow() + timedelta(days=7), creator_id=user.id)
+        for title in ("slow", "fast")
+    ]
+    db.add_all(orders)
+    db.commit()
+    yield [order.id for order in orders]
+    # Версию заказов изменила рассылка - удаляем по id, а не загруженные объекты
+    db.query(Order).filter(Order.creator_id == user.id).delete()
+    db.delete(user)
+    db.commit()
+    db.close()
+
+
+def _matched_at(order_id):
+    from app.database import SessionLocal
+    from app.models import Order
+
+    db = SessionLocal()
+    try:
+        return db.get(Order, order_id).matched_at
+    finally:
+        db.close()
+
+
+def test_timed_out_matching_is_retried(order_ids, monkeypatch):
+    from app.bot.services.matching_service import MatchingService
+
+    slow_id, fast_id = order_ids
+    # Подбор для первого заказа не уложился в таймаут, для второго исполнителей нет
+    monkeypatch.setattr(matching_crud, "top_executors", lambda db, order: None if order.id == slow_id else [])
+    asyncio.run(MatchingService().notify_new_orders())
+    assert _matched_at(slow_id) is None
+    assert _matched_at(fast_id) is not None
+
+    monkeypatch.setattr(matching_crud, "top_executors", lambda db, order: [])
+    asyncio.run(MatchingService().notify_new_orders())
+    assert _matched_at(slow_id) is not None
+
+
+def test_timeout_keeps_callers_pending_changes(order_ids, monkeypatch):
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.sql import Select
+
+    from app.crud.tag import tag_crud
+    from app.database import SessionLocal
+    from app.models import Order
+
+    slow_id, fast_id = order_ids
+    monkeypatch.setattr(tag_crud, "get_order_tag_ids", lambda db, order_id: [1])
+    db = SessionLocal()
+    execute = db.execute
+
+    def timed_out(statement, *args, **kwargs):
+        if isinstance(statement, Select):
+            raise OperationalError(str(statement), {}, Exception("canceling statement due to statement timeout"))
+        return execute(statement, *args, **kwargs)
+
+    try:
+        # Отметка о рассылке для другого заказа еще не закоммичена, когда подбор упирается в таймаут
+        db.get(Order, fast_id).matched_at = datetime.utcnow()
+        slow = db.get(Order, slow_id)
+        monkeypatch.setattr(db, "execute", timed_out)
+        assert matching_crud.top_executors(db, slow) is None
+        db.commit()
+    finally:
+        db.close()
+    assert _matched_at(fast_id) is not None
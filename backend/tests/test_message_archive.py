@@ -0,0 +1,104 @@
+"""Архив сообщений: страницы истории читают горячую таблицу и архив как одну"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.crud.message import message_crud
+
+NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(engine):
+    from app.database import SessionLocal
+    from app.models import Message, MessageArchive
+
+    session = SessionLocal()
+    yield session
+    session.rollback()
+    session.query(Message).delete()
+    session.query(MessageArchive).delete()
+    session.commit()
+    session.close()
+
+
+def _messages(db, model, order_id, days_ago, first_id=None):
+    rows = [
+        {
+            "order_id": order_id, "sender_id": 1, "receiver_id": 2,
+            "content": f"order {order_id}, {days} days ago", "is_read": False,
+            "created_at": NOW - timedelta(days=days)
+        }
+        for days in days_ago
+    ]
+    if first_id is not None:
+        for offset, row in enumerate(rows):
+            row["id"] = first_id + offset
+    db.execute(insert(model), rows)
+    db.commit()
+
+
+def _created(messages):
+    return [message.created_at for message in messages]
+
+
+def test_user_pages_are_ordered_across_orders(db):
+    from app.models import Message, MessageArchive
+
+    # Давно открытый заказ 1 в горячей таблице, закрытый заказ 2 - в архиве
+    _messages(db, Message, 1, [300, 250, 200, 5, 1])
+    _messages(db, MessageArchive, 2, [150, 120, 100], first_id=1000)
+
+    everything = message_crud.get_by_user(db, 1, 0, 100)
+    assert len(everything) == 8
+    assert _created(everything) == sorted(_created(everything), reverse=True)
+
+    pages = [message_crud.get_by_user(db, 1, skip, 3) for skip in (0, 3, 6)]
+    assert [message.id for page in pages for message in page] == [message.id for message in everything]
+
+
+def test_conversation_reads_archive_only_past_hot_rows(db):
+    from app.models import Message, MessageArchive
+
+    _messages(db, MessageArchive, 3, [200, 190, 180], first_id=2000)
+    _messages(db, Message, 3, [3, 2, 1])
+
+    newest = message_crud.get_conversation(db, 3, 1, 0, 2)
+    assert [message["content"] for message in newest] == ["order 3, 2 days ago", "order 3, 1 days ago"]
+
+    boundary = message_crud.get_conversation(db, 3, 1, 2, 3)
+    assert [message["content"] for message in boundary] == [
+        "order 3, 190 days ago", "order 3, 180 days ago", "order 3, 3 days ago"
+    ]
+    assert message_crud.get_conversation(db, 3, 1, 10, 5) == []
+
+
+def test_archive_moves_only_old_messages_of_closed_orders(db, engine):
+    if engine.dialect.name != "postgresql":
+        pytest.skip("перенос использует DELETE ... RETURNING внутри INSERT (PostgreSQL)")
+    from app.models import Message, MessageArchive, Order, User
+
+    user = User(username="archive", email="archive@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    closed, open_order = [
+        Order(title=status, description="d", budget=1, deadline=NOW, status=status, creator_id=user.id)
+        for status in ("completed", "open")
+    ]
+    db.add_all([closed, open_order])
+    db.commit()
+    try:
+        _messages(db, Message, closed.id, [200, 150, 100, 1])
+        _messages(db, Message, open_order.id, [200])
+
+        assert message_crud.archive_old(db, NOW - timedelta(days=90), batch_size=2) == 3
+        assert db.query(MessageArchive).count() == 3
+        assert {message.order_id for message in db.query(Message)} == {closed.id, open_order.id}
+        assert db.query(Message).count() == 2
+    finally:
+        db.query(Message).delete()
+        db.query(MessageArchive).delete()
+        db.query(Order).filter(Order.creator_id == user.id).delete()
+        db.delete(user)
+        db.commit()
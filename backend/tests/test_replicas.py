@@ -0,0 +1,31 @@
+"""Замер отставания реплик не блокирует выбор реплики в других потоках"""
+import threading
+
+
+def test_pick_does_not_wait_for_lag_check(tmp_path, monkeypatch):
+    from app.database import ReplicaSet
+
+    replicas = ReplicaSet([f"sqlite:///{tmp_path / 'replica.db'}"])
+    started, release = threading.Event(), threading.Event()
+
+    def slow_measure(replica):
+        # Недоступная реплика: подключение висит до connect_timeout
+        started.set()
+        release.wait(5)
+        return 0.0
+
+    monkeypatch.setattr(replicas, "_measure_lag", slow_measure)
+    checker = threading.Thread(target=replicas.refresh_lag, kwargs={"force": True})
+    checker.start()
+    try:
+        assert started.wait(5)
+        picked = []
+        reader = threading.Thread(target=lambda: picked.append(replicas.pick()))
+        reader.start()
+        reader.join(1)
+        assert not reader.is_alive()
+        assert picked == [replicas.engines[0]]
+    finally:
+        release.set()
+        checker.join()
+    assert replicas.lags == [0.0]
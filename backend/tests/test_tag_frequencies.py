@@ -0,0 +1,87 @@
+"""Частоты тегов считаются только по задачам и заказам, которые видит пользователь"""
+import pytest
+from fastapi.testclient import TestClient
+
+TAGS = ("shared", "secret", "mine", "customer", "other")
+
+
+@pytest.fixture
+def setup(engine):
+    from app.crud.tag import tag_crud
+    from app.database import SessionLocal
+    from app.models import Board, Order, Tag, Task, User, UserRole, order_tags, task_tags
+    from datetime import datetime, timedelta
+
+    db = SessionLocal()
+    db.expire_on_commit = False
+    users = {
+        role: User(username=f"tags_{role.value}", email=f"tags_{role.value}@example.com", hashed_password="x", role=role)
+        for role in (UserRole.CUSTOMER, UserRole.EXECUTOR, UserRole.ADMIN)
+    }
+    db.add_all(users.values())
+    db.flush()
+    owner = users[UserRole.CUSTOMER]
+    public = Board(title="public", creator_id=users[UserRole.ADMIN].id, is_public=True)
+    private = Board(title="private", creator_id=users[UserRole.ADMIN].id, is_public=False)
+    own = Board(title="own", creator_id=owner.id, is_public=False)
+    db.add_all([public, private, own])
+    db.flush()
+    tasks = {
+        board.title: Task(title=board.title, board_id=board.id, creator_id=board.creator_id, position="i")
+        for board in (public, private, own)
+    }
+    db.add_all(tasks.values())
+    orders = [
+        Order(title=title, description="d", budget=1, deadline=datetime.utcnow() + timedelta(days=1), creator_id=creator.id)
+        for title, creator in (("mine", owner), ("theirs", users[UserRole.ADMIN]))
+    ]
+    db.add_all(orders)
+    db.flush()
+    tag_crud.set_task_tags_bulk(db, {
+        tasks["public"].id: ["shared"], tasks["private"].id: ["secret", "shared"], tasks["own"].id: ["mine"]
+    }, new_tasks=True)
+    tag_crud.set_order_tags_bulk(db, {orders[0].id: "customer", orders[1].id: "other"}, new_orders=True)
+    db.commit()
+    yield users
+    tag_ids = db.query(Tag.id).filter(Tag.name.in_(TAGS))
+    db.execute(task_tags.delete().where(task_tags.c.tag_id.in_(tag_ids)))
+    db.execute(order_tags.delete().where(order_tags.c.tag_id.in_(tag_ids)))
+    db.query(Tag).filter(Tag.id.in_(tag_ids)).delete(synchronize_session=False)
+    for task in tasks.values():
+        db.query(Task).filter(Task.id == task.id).delete()
+    for order in orders:
+        db.query(Order).filter(Order.id == order.id).delete()
+    for board in (public, private, own):
+        db.delete(board)
+    for user in users.values():
+        db.delete(user)
+    db.commit()
+    db.close()
+
+
+def _frequencies(user, kind):
+    from app.auth.dependencies import get_current_active_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    try:
+        response = TestClient(app).get(f"/api/v1/tags/frequencies?kind={kind}")
+    finally:
+        app.dependency_overrides.pop(get_current_active_user)
+    assert response.status_code == 200, response.text
+    # Счетчики тегов общие для всей базы - сравниваем только теги этого теста
+    return {item["name"]: item["count"] for item in response.json() if item["name"] in TAGS}
+
+
+def test_task_tags_of_private_boards_are_hidden(setup):
+    from app.models import UserRole
+
+    assert _frequencies(setup[UserRole.CUSTOMER], "tasks") == {"shared": 1, "mine": 1}
+    assert _frequencies(setup[UserRole.ADMIN], "tasks") == {"shared": 2, "secret": 1, "mine": 1}
+
+
+def test_order_tags_follow_order_visibility(setup):
+    from app.models import UserRole
+
+    assert _frequencies(setup[UserRole.CUSTOMER], "orders") == {"customer": 1}
+    assert _frequencies(setup[UserRole.EXECUTOR], "orders") == {"customer": 1, "other": 1}
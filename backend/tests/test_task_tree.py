@@ -0,0 +1,54 @@
+"""Дерево задачи не отдает подзадачи с досок, к которым у пользователя нет доступа"""
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def setup(engine):
+    from app.database import SessionLocal
+    from app.models import Board, Task, User
+
+    db = SessionLocal()
+    db.expire_on_commit = False
+    owner = User(username="tree_owner", email="tree_owner@example.com", hashed_password="x")
+    viewer = User(username="tree_viewer", email="tree_viewer@example.com", hashed_password="x")
+    db.add_all([owner, viewer])
+    db.flush()
+    public = Board(title="tree public", creator_id=owner.id, is_public=True)
+    private = Board(title="tree private", creator_id=owner.id, is_public=False)
+    db.add_all([public, private])
+    db.flush()
+    root = Task(title="root", board_id=public.id, creator_id=owner.id, position="a", budget=10)
+    db.add(root)
+    db.flush()
+    db.add_all([
+        Task(title="visible", board_id=public.id, creator_id=owner.id, parent_id=root.id, position="b", budget=5),
+        Task(title="hidden", board_id=private.id, creator_id=owner.id, parent_id=root.id, position="c", budget=100),
+    ])
+    db.commit()
+    yield root, viewer
+    for board in (private, public):
+        db.query(Task).filter(Task.board_id == board.id).delete()
+    for board in (private, public):
+        db.delete(board)
+    db.delete(viewer)
+    db.delete(owner)
+    db.commit()
+    db.close()
+
+
+def test_tree_skips_subtasks_on_other_boards(setup):
+    from app.auth.dependencies import get_current_active_user
+    from app.main import app
+
+    root, viewer = setup
+    app.dependency_overrides[get_current_active_user] = lambda: viewer
+    try:
+        response = TestClient(app).get(f"/api/v1/tasks/{root.id}/tree")
+    finally:
+        app.dependency_overrides.pop(get_current_active_user)
+    assert response.status_code == 200, response.text
+    tree = response.json()
+    assert [child["title"] for child in tree["children"]] == ["visible"]
+    assert tree["subtask_count"] == 1
+    assert tree["total_budget"] == 15
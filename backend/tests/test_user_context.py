@@ -0,0 +1,130 @@
+"""
+Пользователь загружается из базы один раз на обновление бота: AuthMiddleware
+кладет его в data, обработчики start, profile и admin берут его оттуда, а
+UserService внутри обновления отвечает из контекста пользователя.
+"""
+import asyncio
+from typing import List
+
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.types import Update
+from sqlalchemy import event
+
+TELEGRAM_ID = 777000
+
+
+class _OfflineSession(BaseSession):
+    """Сессия бота без сети: запросы к Telegram запоминаются и не выполняются"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    async def make_request(self, bot, method, timeout=None):
+        self.requests.append(method)
+        return None
+
+    async def stream_content(self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True):
+        yield b""
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture(scope="module")
+def dispatcher(engine):
+    from app.bot.middlewares import register_middlewares
+    from app.bot.routers import register_routers
+
+    # Диспетчер собирается так же, как в app/bot/main.py
+    dp = Dispatcher()
+    register_routers(dp)
+    register_middlewares(dp)
+    return dp
+
+
+@pytest.fixture
+def user_selects(engine) -> List[str]:
+    """SELECT ... FROM users, выполненные во время теста"""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(engine, "before_cursor_execute", count)
+
+
+def _sender(first_name: str = "Ivan") -> dict:
+    return {"id": TELEGRAM_ID, "is_bot": False, "first_name": first_name, "username": "tguser"}
+
+
+def _command(update_id: int, command: str, first_name: str = "Ivan") -> Update:
+    return Update.model_validate({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": TELEGRAM_ID, "type": "private"},
+            "from": _sender(first_name),
+            "text": command,
+            "entities": [{"type": "bot_command", "offset": 0, "length": len(command)}]
+        }
+    })
+
+
+def _callback(update_id: int, data: str) -> Update:
+    return Update.model_validate({
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "from": _sender(),
+            "chat_instance": "1",
+            "data": data,
+            "message": {
+                "message_id": update_id,
+                "date": 0,
+                "chat": {"id": TELEGRAM_ID, "type": "private"},
+                "from": {"id": 42, "is_bot": True, "first_name": "Bot"},
+                "text": "menu"
+            }
+        }
+    })
+
+
+@pytest.mark.parametrize("update", [
+    _command(1, "/start"),  # первый контакт: пользователь создается
+    _command(2, "/start"),
+    _command(3, "/start", first_name="Petr"),  # имя в Telegram изменилось
+    _command(4, "/help"),
+    _command(5, "/profile"),
+    _callback(6, "profile"),
+    _callback(7, "admin"),
+    _callback(8, "main_menu"),
+], ids=lambda update: update.message.text if update.message else update.callback_query.data)
+def test_one_user_select_per_update(dispatcher, user_selects, update):
+    session = _OfflineSession()
+    bot = Bot("42:TEST", session=session)
+
+    asyncio.run(dispatcher.feed_update(bot, update))
+
+    assert session.requests, "обработчик не ответил - обновление не дошло до роутера"
+    assert len(user_selects) <= 1, user_selects
+
+
+def test_name_change_is_persisted(dispatcher, engine):
+    from app.database import SessionLocal
+    from app.models.user import User
+
+    bot = Bot("42:TEST", session=_OfflineSession())
+    asyncio.run(dispatcher.feed_update(bot, _command(10, "/start", first_name="Oleg")))
+
+    db = SessionLocal()
+    try:
+        assert db.query(User).filter(User.telegram_id == TELEGRAM_ID).one().first_name == "Oleg"
+    finally:
+        db.close()
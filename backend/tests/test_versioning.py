@@ -0,0 +1,66 @@
+"""Оптимистичная блокировка: параллельная правка дает 409, параллельное удаление - 404"""
+import pytest
+
+from app.crud.versioning import RowDeletedError, VersionConflictError, commit_versioned
+
+
+@pytest.fixture
+def task_id(engine):
+    from app.database import SessionLocal
+    from app.models import Board, Task, User
+
+    db = SessionLocal()
+    user = User(username="versioning", email="versioning@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    board = Board(title="versioning", creator_id=user.id)
+    db.add(board)
+    db.flush()
+    task = Task(title="versioned", board_id=board.id, creator_id=user.id, position="i")
+    db.add(task)
+    db.commit()
+    yield task.id
+    db.query(Task).filter(Task.id == task.id).delete()
+    db.delete(board)
+    db.delete(user)
+    db.commit()
+    db.close()
+
+
+def _load(task_id):
+    from app.database import SessionLocal
+    from app.models.task import Task
+
+    db = SessionLocal()
+    return db, db.get(Task, task_id)
+
+
+def test_concurrent_update_raises_conflict(task_id):
+    db, task = _load(task_id)
+    other_db, other = _load(task_id)
+    try:
+        other.title = "other"
+        commit_versioned(other_db, other)
+
+        task.title = "mine"
+        with pytest.raises(VersionConflictError) as error:
+            commit_versioned(db, task)
+        assert error.value.current.title == "other"
+    finally:
+        db.close()
+        other_db.close()
+
+
+def test_concurrent_delete_raises_not_found(task_id):
+    db, task = _load(task_id)
+    other_db, other = _load(task_id)
+    try:
+        other_db.delete(other)
+        other_db.commit()
+
+        task.title = "mine"
+        with pytest.raises(RowDeletedError):
+            commit_versioned(db, task)
+    finally:
+        db.close()
+        other_db.close()